@@ -31,6 +31,51 @@ mapfile-big() {
   echo ${#MAPFILE[@]}  # verify length
 }
 
+# mapfile reads until EOF, so it reads in blocks even from a pipe
+mapfile-pipe-big() {
+  time { cat $BIG | mapfile; echo ${#MAPFILE[@]}; }
+}
+
+# 'read' from a regular file reads a block, and then seeks back to the byte
+# after the newline.  From a pipe, it has to read one byte at a time.
+read-loop-big() {
+  local i=0
+  time while read line; do
+    i=$((i + 1))
+  done < $BIG
+  echo $i
+}
+
+read-loop-pipe-big() {
+  local i=0
+  time cat $BIG | while read line; do
+    i=$((i + 1))
+  done
+}
+
+read-syscall() {
+  # A few read() and lseek() calls per line, not one read() per byte
+  seq 20 > _tmp/20_lines.txt
+  strace -e read,lseek -- bin/osh -c 'while read x; do :; done' < _tmp/20_lines.txt
+}
+
+# $(< file) reads the file in the shell process, while $(cat < file) forks.
+# Compare them on small and big files.
+command-sub-file() {
+  local sh=${1:-bin/osh}
+
+  echo '{"name": "value"}' > _tmp/small.json
+  time $sh -c 'for i in $(seq 1000); do x=$(< _tmp/small.json); done'
+  time $sh -c 'for i in $(seq 1000); do x=$(cat < _tmp/small.json); done'
+}
+
+command-sub-file-big() {
+  local sh=${1:-bin/osh}
+
+  time $sh -c "x=\$(< $BIG); echo \${#x}"
+  time $sh -c "x=\$(cat < $BIG); echo \${#x}"
+}
+
 # Hm this isn't that fast either, about 100 ms.
 python-big() {
   time python -S -c '
@@ -611,4 +611,69 @@ control-flow() {
   done
 }
 
+brace-expand() {
+  local osh=_bin/cxx-opt/osh
+
+  ninja $osh
+
+  for func in do_literal do_dynamic; do
+    echo "=== $func"
+    echo
+    for sh in bash $osh; do
+      echo "--- $sh"
+      time $sh benchmarks/compute/brace_expand.sh $func 1000
+      echo
+    done
+  done
+}
+
+string-index() {
+  local osh=_bin/cxx-opt/osh
+
+  ninja $osh
+
+  for func in do_ascii do_unicode; do
+    echo "=== $func"
+    echo
+    for sh in bash $osh; do
+      echo "--- $sh"
+      time $sh benchmarks/compute/string_index.sh $func 2000
+      echo
+    done
+  done
+}
+
+json-write() {
+  local ysh=_bin/cxx-opt/ysh
+
+  ninja $ysh
+
+  for func in do_compact do_pretty do_to_json do_pp; do
+    echo "=== $func"
+    echo
+    for sh in bin/ysh $ysh; do
+      echo "--- $sh"
+      time $sh benchmarks/compute/json_write.ysh $func 100000
+      echo
+    done
+  done
+}
+
+recursive() {
+  local ysh=_bin/cxx-opt/ysh
+
+  ninja $ysh
+
+  # Each proc gets its own N
+  for args in 'do_fib 18' 'do_bubble_sort 150'; do
+    echo "=== $args"
+    echo
+    for sh in bin/ysh $ysh; do
+      echo "--- $sh"
+      time $sh benchmarks/compute/recursive.ysh $args
+      echo
+    done
+  done
+}
+
 "$@"
@@ -0,0 +1,40 @@
+#!/usr/bin/env bash
+#
+# Usage:
+#   benchmarks/compute/brace_expand.sh <function name> N
+
+# Each of these functions runs a command with brace words N times, so the same
+# words are expanded over and over.
+
+do_literal() {
+  local n=$1
+  local i=0
+  local count=0
+
+  while test $i -lt $n; do
+    for f in {a,b,c}/{1..50}.txt; do
+      count=$((count + 1))
+    done
+    i=$(( i + 1 ))
+  done
+
+  echo "    count=$count"
+}
+
+do_dynamic() {
+  local n=$1
+  local i=0
+  local count=0
+  local dir=dst
+
+  while test $i -lt $n; do
+    # $dir is evaluated each time, but the expansion has the same structure
+    set -- $dir/file.{h,cc} $dir/{x,y}{1..20}
+    count=$((count + $#))
+    i=$(( i + 1 ))
+  done
+
+  echo "    count=$count"
+}
+
+"$@"
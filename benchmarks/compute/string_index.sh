@@ -0,0 +1,39 @@
+#!/usr/bin/env bash
+#
+# Loop over the characters of a long string with ${#s} and ${s:i:1}.
+#
+# Usage:
+#   benchmarks/compute/string_index.sh do_ascii 2000
+#   benchmarks/compute/string_index.sh do_unicode 2000
+
+make_string() {
+  local unit=$1
+  local n=$2
+
+  s=''
+  for (( i = 0; i < n; ++i )); do
+    s+=$unit
+  done
+}
+
+count_dashes() {
+  local count=0
+  for (( i = 0; i < ${#s}; ++i )); do
+    if test "${s:i:1}" = '-'; then
+      count=$(( count + 1 ))
+    fi
+  done
+  echo "$count"
+}
+
+do_ascii() {
+  make_string 'ab-' $1
+  count_dashes
+}
+
+do_unicode() {
+  make_string 'αβ-' $1
+  count_dashes
+}
+
+"$@"
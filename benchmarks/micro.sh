@@ -42,4 +42,163 @@ printf-loop-complex() {
   done | wc -l
 }
 
+# Common word shapes that can't be split or globbed.  The word evaluator
+# handles these without building part_value lists and word frames.
+
+word-eval-loop() {
+  local sh=${1:-bin/osh}
+  local n=${2:-20000}
+
+  time $sh -c '
+  f() { :; }
+  x=foo dir=/tmp
+  for i in $(seq '$n'); do
+    f "$x" "${dir}/suffix" --out="$x" $x pre${x}post
+    y="$dir/$x"
+  done
+  '
+}
+
+# A sourced file with one long function that uses an alias on every line.
+# The whole function is one "logical line", so the arena keeps all its lines
+# until it's parsed.  Each alias expansion should only look at its own line.
+#
+# Usage:
+#   benchmarks/micro.sh alias-in-function bin/osh 5000
+
+alias-in-function() {
+  local sh=${1:-bin/osh}
+  local n=${2:-5000}
+
+  local file=_tmp/alias-in-function.sh
+  mkdir -p _tmp
+  {
+    echo 'shopt -s expand_aliases 2>/dev/null'
+    echo "alias e='echo'"
+    echo 'f() {'
+    for i in $(seq $n); do
+      echo "  e $i"
+    done
+    echo '}'
+    echo 'f | wc -l'
+  } > $file
+
+  time $sh -c ". $file"
+}
+
+# Globs that a build script repeats in the same dirs.  Each dir is listed once
+# and then matched from the cache, until its mtime changes.
+#
+# Usage:
+#   benchmarks/micro.sh glob-loop bin/osh 2000
+
+glob-loop() {
+  local sh=${1:-bin/osh}
+  local n=${2:-2000}
+
+  local dir=_tmp/glob-loop
+  rm -r -f $dir
+  mkdir -p $dir/src $dir/obj
+  for i in $(seq 500); do
+    touch $dir/src/f$i.c $dir/src/f$i.h $dir/obj/f$i.o
+  done
+  # The cache skips dirs modified in the current second
+  sleep 1
+
+  time $sh -c '
+  cd '$dir'
+  for i in $(seq '$n'); do
+    set -- src/*.c obj/*.o src/f1?.[ch]
+  done
+  echo $#
+  '
+}
+
+# Strip prefixes and suffixes from paths, as in ${f##*/} and ${f%.*}.  The
+# common patterns are found without calling fnmatch() on each slice.
+#
+# Usage:
+#   benchmarks/micro.sh strip-loop bin/osh 20000
+
+strip-loop() {
+  local sh=${1:-bin/osh}
+  local n=${2:-20000}
+
+  time $sh -c '
+  f=/home/andy/src/oil/osh/string_ops_test.py
+  for (( i = 0; i < '$n'; ++i )); do
+    base=${f##*/}
+    dir=${f%/*}
+    stem=${base%.*}
+    ext=${f##*.}
+    rest=${f#*/}
+  done
+  echo $base $dir $stem $ext $rest
+  '
+}
+
+# Here docs in a loop, like a script that generates config files.  A small
+# body is written to a pipe without starting a process.
+#
+# Usage:
+#   benchmarks/micro.sh heredoc-loop bin/osh 2000
+
+heredoc-loop() {
+  local sh=${1:-bin/osh}
+  local n=${2:-2000}
+
+  time $sh -c '
+  for (( i = 0; i < '$n'; ++i )); do
+    read -r line <<EOF
+name=host$i
+port=$(( 8000 + i ))
+EOF
+  done
+  echo $line
+  '
+}
+
+# A YSH loop with number literals.  Their values are cached the first time
+# they're evaluated, and -1 is folded to a constant.
+#
+# Usage:
+#   benchmarks/micro.sh ysh-literal-loop bin/ysh 20000
+
+ysh-literal-loop() {
+  local sh=${1:-bin/ysh}
+  local n=${2:-20000}
+
+  time $sh -c '
+  var total = 0
+  for i in (0 .. '$n') {
+    var weights = [1, 2, 3, 5, 8, 13, -1, -2, 0.5, -0.5]
+    setvar total += weights[i % 10] * 1_000 - 1
+  }
+  echo $total
+  '
+}
+
+# A YSH loop with method calls.  A call like words->append() doesn't make a
+# bound method.
+#
+# Usage:
+#   benchmarks/micro.sh ysh-method-loop bin/ysh 20000
+
+ysh-method-loop() {
+  local sh=${1:-bin/ysh}
+  local n=${2:-20000}
+
+  time $sh -c '
+  var words = []
+  for i in (0 .. '$n') {
+    var s = "w$i"
+    call words->append(s => upper())
+    if (s => startsWith("w1")) {
+      call words->pop()
+    }
+  }
+  echo $[len(words)]
+  '
+}
+
 "$@"
@@ -173,6 +173,23 @@ cachegrind-parse-configure-coreutils() {
   cat $out
 }
 
+brace-words() {
+  ### Parse a file with many brace words
+
+  local bin=${1:-_bin/cxx-opt/oils-for-unix}
+  local n=${2:-10000}
+
+  ninja $bin
+
+  local file=$BASE_DIR/tmp/brace-words.sh
+  mkdir -p $(dirname $file)
+  for (( i = 0; i < n; ++i )); do
+    echo "cp file$i.{h,cc} \$dir/{a,b}-{1..9}/"
+  done > $file
+
+  time $bin --ast-format none -n $file
+}
+
 cachegrind-demo() {
   #local sh=bash
   local sh=zsh
@@ -95,6 +95,14 @@ run-tasks() {
         argv=( testdata/osh-runtime/abuild -h )
         ;;
 
+      spawn-loop)
+        argv=( testdata/osh-runtime/spawn_loop.sh 2000 )
+        ;;
+
+      spawn-big-heap)
+        argv=( testdata/osh-runtime/spawn_big_heap.sh 2000 )
+        ;;
+
       configure.cpython)
         argv=( $PY27_DIR/configure )
         working_dir=$files_out_dir
@@ -181,6 +189,9 @@ print-tasks() {
     hello-world
     abuild-print-help
 
+    spawn-loop
+    spawn-big-heap
+
     configure.cpython
     configure.ocaml
     configure.tcc
@@ -376,6 +387,22 @@ soil-run() {
 # Debugging
 #
 
+# Time the process startup workloads without the rest of the harness.
+#
+# Usage:
+#   benchmarks/osh-runtime.sh compare-spawn bin/osh _bin/cxx-opt/osh
+
+compare-spawn() {
+  local n=${N:-2000}
+
+  for sh in bash dash "$@"; do
+    for script in spawn_loop spawn_big_heap; do
+      echo "--- $sh $script $n"
+      time $sh testdata/osh-runtime/$script.sh $n
+    done
+  done
+}
+
 compare-cpython() {
   local -a a=( ../benchmark-data/osh-runtime/*.broome.2023* )
   #local -a b=( ../benchmark-data/osh-runtime/*.lenny.2023* )
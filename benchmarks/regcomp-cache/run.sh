@@ -51,6 +51,11 @@ match-many() {
   echo
   echo "num_yes = $num_yes"
   echo "num_tried = $num_tried"
+
+  if test -n "${OILS_VERSION:-}"; then
+    echo
+    pp cache-stats
+  fi
 }
 
 compare() {
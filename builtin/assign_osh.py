@@ -11,6 +11,7 @@ from _devbuild.gen.runtime_asdl import (
 from _devbuild.gen.value_asdl import (value, value_e, value_t, LeftName)
 from _devbuild.gen.syntax_asdl import loc, loc_t, word_t
 
+from core import bash_impl
 from core import error
 from core.error import e_usage
 from core import state
@@ -164,31 +165,24 @@ def _PrintVariables(mem, cmd_val, attrs, print_flags, builtin=_OTHER):
         elif val.tag() == value_e.BashArray:
             array_val = cast(value.BashArray, val)
 
-            # mycpp rewrite: None in array_val.strs
-            has_holes = False
-            for s in array_val.strs:
-                if s is None:
-                    has_holes = True
-                    break
-
-            if has_holes:
+            if bash_impl.BashArray_HasHoles(array_val):
                 # Note: Arrays with unset elements are printed in the form:
                 #   declare -p arr=(); arr[3]='' arr[4]='foo' ...
                 decl.append("=()")
                 first = True
-                for i, element in enumerate(array_val.strs):
-                    if element is not None:
-                        if first:
-                            decl.append(";")
-                            first = False
-                        decl.extend([
-                            " ", name, "[",
-                            str(i), "]=",
-                            qsn.maybe_shell_encode(element)
-                        ])
+                for i in bash_impl.BashArray_GetKeys(array_val):
+                    if first:
+                        decl.append(";")
+                        first = False
+                    element = bash_impl.BashArray_GetItem(array_val, i)
+                    decl.extend([
+                        " ", name, "[",
+                        str(i), "]=",
+                        qsn.maybe_shell_encode(element)
+                    ])
             else:
                 body = []  # type: List[str]
-                for element in array_val.strs:
+                for element in bash_impl.BashArray_GetValues(array_val):
                     if len(body) > 0:
                         body.append(" ")
                     body.append(qsn.maybe_shell_encode(element))
@@ -303,7 +297,7 @@ def _ReconcileTypes(rval, flag_a, flag_A, blame_word):
         # associative array.
         if rval.tag() == value_e.BashArray:
             array_val = cast(value.BashArray, rval)
-            if len(array_val.strs) == 0:
+            if bash_impl.BashArray_Length(array_val) == 0:
                 return value.BashAssoc({})
                 #return value.BashArray([])
 
@@ -338,7 +332,7 @@ class Readonly(vm._AssignBuiltin):
         for pair in cmd_val.pairs:
             if pair.rval is None:
                 if arg.a:
-                    rval = value.BashArray([])  # type: value_t
+                    rval = bash_impl.BashArray_FromList([])  # type: value_t
                 elif arg.A:
                     rval = value.BashAssoc({})
                 else:
@@ -447,7 +441,7 @@ class NewVar(vm._AssignBuiltin):
                 old_val = self.mem.GetValue(pair.var_name)
                 if arg.a:
                     if old_val.tag() != value_e.BashArray:
-                        rval = value.BashArray([])
+                        rval = bash_impl.BashArray_FromList([])
                 elif arg.A:
                     if old_val.tag() != value_e.BashAssoc:
                         rval = value.BashAssoc({})
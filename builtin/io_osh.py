@@ -129,28 +129,27 @@ class MapFile(vm._Builtin):
             if var_name.startswith(':'):
                 var_name = var_name[1:]
 
-        lines = []  # type: List[str]
-        while True:
-            # bash uses this slow algorithm; YSH could provide read --all-lines
-            try:
-                line = read_osh.ReadLineSlowly(self.cmd_ev)
-            except pyos.ReadError as e:
-                self.errfmt.PrintMessage("mapfile: read() error: %s" %
-                                         posix.strerror(e.err_num))
-                return 1
-            if len(line) == 0:
-                break
-            # note: at least on Linux, bash doesn't strip \r\n
-            if arg.t and line.endswith('\n'):
-                line = line[:-1]
-            lines.append(line)
+        # bash reads one byte at a time, but we read until EOF anyway, so we
+        # can read in blocks
+        try:
+            lines = read_osh.ReadAllLines(self.cmd_ev)
+        except pyos.ReadError as e:
+            self.errfmt.PrintMessage("mapfile: read() error: %s" %
+                                     posix.strerror(e.err_num))
+            return 1
+
+        if arg.t:
+            for i, line in enumerate(lines):
+                # note: at least on Linux, bash doesn't strip \r\n
+                if line.endswith('\n'):
+                    lines[i] = line[:-1]
 
         state.BuiltinSetArray(self.mem, var_name, lines)
         return 0
 
 
 class Cat(vm._Builtin):
-    """Internal implementation detail for $(< file).
+    """Internal cat, formerly used for $(< file).
 
     Maybe expose this as 'builtin cat' ?
     """
@@ -163,8 +162,11 @@ class Cat(vm._Builtin):
     def Run(self, cmd_val):
         # type: (cmd_value.Argv) -> int
         chunks = []  # type: List[str]
+        # Stream the output instead of using pyos.ReadAll(), but make the
+        # reads bigger in the same way
+        block_size = pyos.READ_ALL_MIN
         while True:
-            n, err_num = pyos.Read(0, 4096, chunks)
+            n, err_num = pyos.Read(0, block_size, chunks)
 
             if n < 0:
                 if err_num == EINTR:
@@ -183,5 +185,7 @@ class Cat(vm._Builtin):
                 assert len(chunks) == 1
                 mylib.Stdout().write(chunks[0])
                 chunks.pop()
+                if block_size < pyos.READ_ALL_MAX:
+                    block_size *= 2
 
         return 0
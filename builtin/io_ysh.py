@@ -13,6 +13,7 @@ from core import error
 from core.error import e_usage
 from core import state
 from core import ui
+from core import util
 from core import vm
 from data_lang import qsn
 from data_lang import j8
@@ -22,7 +23,9 @@ from frontend import typed_args
 from mycpp import mylib
 from mycpp.mylib import log
 
-from typing import TYPE_CHECKING, cast, Dict
+import libc
+
+from typing import TYPE_CHECKING, cast, Dict, List
 if TYPE_CHECKING:
     from core.alloc import Arena
     from core.ui import ErrorFormatter
@@ -45,11 +48,16 @@ class Pp(_Builtin):
     'pp cell a' is a lot easier to type than 'argv.py "${a[@]}"'.
     """
 
-    def __init__(self, mem, errfmt, procs, arena):
-        # type: (state.Mem, ErrorFormatter, Dict[str, value.Proc], Arena) -> None
+    def __init__(self, mem, errfmt, procs, arena, caches):
+        # type: (state.Mem, ErrorFormatter, Dict[str, value.Proc], Arena, List[util.Lru]) -> None
+        """
+        Args:
+          caches: for pp cache-stats
+        """
         _Builtin.__init__(self, mem, errfmt)
         self.procs = procs
         self.arena = arena
+        self.caches = caches
         self.stdout_ = mylib.Stdout()
         self.j8print = j8.Printer()
 
@@ -127,6 +135,20 @@ class Pp(_Builtin):
             print('TODO')
             status = 0
 
+        elif action == 'cache-stats':
+            # QTSV header
+            print('cache_name\tsize\thits\tmisses\tevictions')
+
+            stats = libc.regex_cache_stats()
+            print('regex\t%d\t%d\t%d\t%d' %
+                  (stats[0], stats[1], stats[2], stats[3]))
+
+            for lru in self.caches:
+                print('%s\t%d\t%d\t%d\t%d' % (lru.name, lru.Size(), lru.hits,
+                                              lru.misses, lru.evictions))
+
+            status = 0
+
         elif action == 'proc':
             names, locs = arg_r.Rest2()
             if len(names):
@@ -2,8 +2,8 @@ from __future__ import print_function
 
 from _devbuild.gen import arg_types
 from _devbuild.gen.runtime_asdl import cmd_value
-from _devbuild.gen.syntax_asdl import loc, loc_t
-from _devbuild.gen.value_asdl import value, LeftName
+from _devbuild.gen.syntax_asdl import loc, loc_t, command_t
+from _devbuild.gen.value_asdl import value, value_e, value_t, LeftName
 from builtin import read_osh
 from core import error
 from core.error import e_usage
@@ -19,9 +19,10 @@ from mycpp.mylib import log
 
 import posix_ as posix
 
-from typing import TYPE_CHECKING
+from typing import List, Optional, TYPE_CHECKING
 if TYPE_CHECKING:
     from core.ui import ErrorFormatter
+    from osh.cmd_eval import CommandEvaluator
 
 _ = log
 
@@ -33,12 +34,14 @@ class Json(vm._Builtin):
 
     --pretty=0 writes it on a single line
     --indent=2 controls multiline indentation
+    --lines reads one value per line, and runs the block for each
     """
 
-    def __init__(self, mem, errfmt, is_j8):
-        # type: (state.Mem, ErrorFormatter, bool) -> None
+    def __init__(self, mem, errfmt, is_j8, cmd_ev):
+        # type: (state.Mem, ErrorFormatter, bool, CommandEvaluator) -> None
         self.mem = mem
         self.errfmt = errfmt
+        self.cmd_ev = cmd_ev  # To run blocks
 
         self.is_j8 = is_j8
         self.name = 'j8' if is_j8 else 'json'  # for error messages
@@ -103,9 +106,24 @@ class Json(vm._Builtin):
             # TODO:
             # Respect -validate=F
 
-            if cmd_val.typed_args:  # json read (&x)
+            block = None  # type: Optional[command_t]
+            if cmd_val.typed_args:
+                # json read --lines { echo $[_reply] } has a block, but no
+                # place
+                has_place = True
+                if arg_jr.lines and len(cmd_val.pos_args) == 1:
+                    first_arg = cmd_val.pos_args[0]
+                    has_place = first_arg.tag() == value_e.Place
+
                 rd = typed_args.ReaderForProc(cmd_val)
-                place = rd.PosPlace()
+                if has_place:  # json read (&x)
+                    place = rd.PosPlace()
+                else:
+                    place = value.Place(
+                        LeftName('_reply', cmd_val.arg_locs[0]),
+                        self.mem.TopNamespace())
+                if arg_jr.lines:
+                    block = rd.OptionalCommand()
                 rd.Done()
 
                 blame_loc = cmd_val.typed_args.left  # type: loc_t
@@ -121,17 +139,20 @@ class Json(vm._Builtin):
             if not arg_r.AtEnd():
                 e_usage('read got too many args', arg_r.Location())
 
+            if arg_jr.lines:
+                return self._ReadLines(place, block, blame_loc, action_loc)
+
+            # Parse from a buffer that's refilled from stdin, rather than
+            # reading all of it into a string first
+            p = j8.Parser('', self.is_j8)
+            p.ReadFromFd(0)
             try:
-                contents = read_osh.ReadAll()
+                val = p.ParseValue()
             except pyos.ReadError as e:  # different paths for read -d, etc.
                 # don't quote code since YSH errexit will likely quote
                 self.errfmt.PrintMessage("read error: %s" %
                                          posix.strerror(e.err_num))
                 return 1
-
-            p = j8.Parser(contents, self.is_j8)
-            try:
-                val = p.ParseValue()
             except error.Decode as err:
                 # TODO: Need to show position info
                 self.errfmt.Print_('%s read: %s' % (self.name, err.Message()),
@@ -144,3 +165,48 @@ class Json(vm._Builtin):
             raise error.Usage(_JSON_ACTION_ERROR, action_loc)
 
         return 0
+
+    def _ReadLines(self, place, block, blame_loc, action_loc):
+        # type: (value.Place, Optional[command_t], loc_t, loc_t) -> int
+        """json read --lines: decode one value per line of stdin.
+
+        With a block, bind each value to the place and run the block, so the
+        whole stream is never in memory.  Without one, bind a List of the
+        values.  Blank lines are skipped.
+        """
+        items = []  # type: List[value_t]
+        stdin_lines = read_osh.StdinLines(self.cmd_ev)
+        line_num = 0
+        while True:
+            try:
+                line = stdin_lines.Next()
+            except pyos.ReadError as e:
+                self.errfmt.PrintMessage("read error: %s" %
+                                         posix.strerror(e.err_num))
+                return 1
+            if len(line) == 0:  # EOF
+                break
+            line_num += 1
+
+            if len(line.strip()) == 0:
+                continue
+
+            p = j8.Parser(line, self.is_j8)
+            try:
+                val = p.ParseValue()
+                p.CheckEof()
+            except error.Decode as err:
+                self.errfmt.Print_('%s read: line %d: %s' %
+                                   (self.name, line_num, err.Message()),
+                                   blame_loc=action_loc)
+                return 1
+
+            if block:
+                self.mem.SetPlace(place, val, blame_loc)
+                unused = self.cmd_ev.EvalCommand(block)
+            else:
+                items.append(val)
+
+        if not block:
+            self.mem.SetPlace(place, value.List(items), blame_loc)
+        return 0
@@ -41,6 +41,11 @@ if TYPE_CHECKING:
     from osh.cmd_parse import CommandParser
 
 
+# Longer code strings aren't cached.  Generated code is often long and never
+# run again, and each entry keeps the code and its commands alive.
+EVAL_CACHE_MAX_LEN = 4096
+
+
 class Eval(vm._Builtin):
 
     def __init__(
@@ -50,6 +55,7 @@ class Eval(vm._Builtin):
             cmd_ev,  # type: CommandEvaluator
             tracer,  # type: dev.Tracer
             errfmt,  # type: ui.ErrorFormatter
+            eval_cache,  # type: Optional[main_loop.BatchCache]
     ):
         # type: (...) -> None
         self.parse_ctx = parse_ctx
@@ -58,6 +64,7 @@ class Eval(vm._Builtin):
         self.cmd_ev = cmd_ev
         self.tracer = tracer
         self.errfmt = errfmt
+        self.eval_cache = eval_cache  # None means disabled
 
     def Run(self, cmd_val):
         # type: (cmd_value.Argv) -> int
@@ -86,6 +93,12 @@ class Eval(vm._Builtin):
         src = source.ArgvWord('eval', eval_loc)
         with dev.ctx_Tracer(self.tracer, 'eval', None):
             with alloc.ctx_SourceCode(self.arena, src):
+                if self.eval_cache and len(code_str) <= EVAL_CACHE_MAX_LEN:
+                    # The code is the key, so there's no version
+                    return self.eval_cache.Run(self.cmd_ev, c_parser,
+                                               line_reader, self.errfmt,
+                                               cmd_eval.RaiseControlFlow,
+                                               code_str, '', src)
                 return main_loop.Batch(self.cmd_ev,
                                        c_parser,
                                        self.errfmt,
@@ -103,6 +116,7 @@ class Source(vm._Builtin):
             tracer,  # type: dev.Tracer
             errfmt,  # type: ui.ErrorFormatter
             loader,  # type: pyutil._ResourceLoader
+            source_cache,  # type: Optional[main_loop.BatchCache]
     ):
         # type: (...) -> None
         self.parse_ctx = parse_ctx
@@ -113,6 +127,7 @@ class Source(vm._Builtin):
         self.tracer = tracer
         self.errfmt = errfmt
         self.loader = loader
+        self.source_cache = source_cache  # None means disabled
 
         self.mem = cmd_ev.mem
 
@@ -138,7 +153,8 @@ class Source(vm._Builtin):
 
             line_reader = reader.StringLineReader(contents, self.arena)
             c_parser = self.parse_ctx.MakeOshParser(line_reader)
-            return self._Exec(cmd_val, arg_r, path, c_parser)
+            return self._Exec(cmd_val, arg_r, path, c_parser, line_reader,
+                              None)
 
         else:
             # 'source' respects $PATH
@@ -159,10 +175,15 @@ class Source(vm._Builtin):
             c_parser = self.parse_ctx.MakeOshParser(line_reader)
 
             with process.ctx_FileCloser(f):
-                return self._Exec(cmd_val, arg_r, path, c_parser)
-
-    def _Exec(self, cmd_val, arg_r, path, c_parser):
-        # type: (cmd_value.Argv, args.Reader, str, CommandParser) -> int
+                return self._Exec(cmd_val, arg_r, path, c_parser, line_reader,
+                                  resolved)
+
+    def _Exec(self, cmd_val, arg_r, path, c_parser, line_reader, resolved):
+        # type: (cmd_value.Argv, args.Reader, str, CommandParser, reader.FileLineReader, Optional[str]) -> int
+        """
+        Args:
+          resolved: path of the file on disk, or None for source --builtin
+        """
         call_loc = cmd_val.arg_locs[0]
 
         # A sourced module CAN have a new arguments array, but it always shares
@@ -178,11 +199,17 @@ class Source(vm._Builtin):
                     src = source.SourcedFile(path, call_loc)
                     with alloc.ctx_SourceCode(self.arena, src):
                         try:
-                            status = main_loop.Batch(
-                                self.cmd_ev,
-                                c_parser,
-                                self.errfmt,
-                                cmd_flags=cmd_eval.RaiseControlFlow)
+                            if self.source_cache and resolved is not None:
+                                status = self.source_cache.RunFile(
+                                    self.cmd_ev, c_parser, line_reader,
+                                    self.errfmt, cmd_eval.RaiseControlFlow,
+                                    resolved, src)
+                            else:
+                                status = main_loop.Batch(
+                                    self.cmd_ev,
+                                    c_parser,
+                                    self.errfmt,
+                                    cmd_flags=cmd_eval.RaiseControlFlow)
                         except vm.IntControlFlow as e:
                             if e.IsReturn():
                                 status = e.StatusCode()
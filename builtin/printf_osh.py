@@ -25,6 +25,7 @@ from core import alloc
 from core import error
 from core.error import e_die, p_die
 from core import state
+from core import util
 from core import vm
 from frontend import flag_spec
 from frontend import consts
@@ -171,6 +172,7 @@ class Printf(vm._Builtin):
         self.unsafe_arith = unsafe_arith
         self.errfmt = errfmt
         self.parse_cache = {}  # type: Dict[str, List[printf_part_t]]
+        self.parse_lru = util.Lru('printf', 1000)
 
         self.shell_start_time = time_.time(
         )  # this object initialized in main()
@@ -470,7 +472,7 @@ class Printf(vm._Builtin):
         #log('vals %s', vals)
 
         arena = self.parse_ctx.arena
-        if fmt in self.parse_cache:
+        if self.parse_lru.Lookup(fmt):
             parts = self.parse_cache[fmt]
         else:
             line_reader = reader.StringLineReader(fmt, arena)
@@ -486,6 +488,9 @@ class Printf(vm._Builtin):
                     self.errfmt.PrettyPrintError(e)
                     return 2  # parse error
 
+            evicted = self.parse_lru.Insert(fmt)
+            if evicted is not None:
+                mylib.dict_erase(self.parse_cache, evicted)
             self.parse_cache[fmt] = parts
 
         if 0:
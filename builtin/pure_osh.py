@@ -31,6 +31,7 @@ from typing import List, Dict, Tuple, Optional, TYPE_CHECKING
 if TYPE_CHECKING:
     from _devbuild.gen.runtime_asdl import cmd_value
     from core.state import MutableOpts, Mem, SearchPath
+    from frontend.parse_lib import ParseCache
     from osh.cmd_eval import CommandEvaluator
 
 _ = log
@@ -53,10 +54,11 @@ class Boolean(vm._Builtin):
 
 class Alias(vm._Builtin):
 
-    def __init__(self, aliases, errfmt):
-        # type: (Dict[str, str], ui.ErrorFormatter) -> None
+    def __init__(self, aliases, errfmt, parse_cache):
+        # type: (Dict[str, str], ui.ErrorFormatter, Optional[ParseCache]) -> None
         self.aliases = aliases
         self.errfmt = errfmt
+        self.parse_cache = parse_cache  # invalidated on changes
 
     def Run(self, cmd_val):
         # type: (cmd_value.Argv) -> int
@@ -83,6 +85,8 @@ class Alias(vm._Builtin):
                     print('alias %s=%r' % (name, alias_exp))
             else:
                 self.aliases[name] = alias_exp
+                if self.parse_cache:
+                    self.parse_cache.AliasesChanged()
 
         #print(argv)
         #log('AFTER ALIAS %s', aliases)
@@ -91,10 +95,11 @@ class Alias(vm._Builtin):
 
 class UnAlias(vm._Builtin):
 
-    def __init__(self, aliases, errfmt):
-        # type: (Dict[str, str], ui.ErrorFormatter) -> None
+    def __init__(self, aliases, errfmt, parse_cache):
+        # type: (Dict[str, str], ui.ErrorFormatter, Optional[ParseCache]) -> None
         self.aliases = aliases
         self.errfmt = errfmt
+        self.parse_cache = parse_cache  # invalidated on changes
 
     def Run(self, cmd_val):
         # type: (cmd_value.Argv) -> int
@@ -108,6 +113,8 @@ class UnAlias(vm._Builtin):
         for i, name in enumerate(argv):
             if name in self.aliases:
                 mylib.dict_erase(self.aliases, name)
+                if self.parse_cache:
+                    self.parse_cache.AliasesChanged()
             else:
                 self.errfmt.Print_('No alias named %r' % name,
                                    blame_loc=cmd_val.arg_locs[i])
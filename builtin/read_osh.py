@@ -1,6 +1,6 @@
 from __future__ import print_function
 
-from errno import EINTR
+from errno import EINTR, ESPIPE
 
 from _devbuild.gen import arg_types
 from _devbuild.gen.runtime_asdl import (span_e, cmd_value)
@@ -118,8 +118,8 @@ def _AppendParts(
 
 
 #
-# Three read() wrappers for 'read' builtin that RunPendingTraps: _ReadN,
-# _ReadPortion, and ReadLineSlowly
+# read() wrappers for 'read' builtin that RunPendingTraps: _ReadN,
+# _ReadPortion, and ReadAllLines
 #
 
 
@@ -156,6 +156,37 @@ def _ReadPortion(delim_byte, max_chars, cmd_ev):
 
     The delimiter is not included in the result.
     """
+    chunks = []  # type: List[str]
+    max_bytes = max_chars
+    while True:
+        status, err_num = pyos.ReadUntilDelim(STDIN_FILENO, delim_byte,
+                                              max_bytes, chunks)
+        if status >= 0:
+            break
+
+        if err_num == ESPIPE:  # pipe or terminal; nothing was read
+            return _ReadPortionSlowly(delim_byte, max_chars, cmd_ev)
+
+        if err_num == EINTR:
+            cmd_ev.RunPendingTraps()
+            # retry after running traps, reading what's left
+            if max_chars >= 0:
+                n = 0
+                for chunk in chunks:
+                    n += len(chunk)
+                max_bytes = max_chars - n
+        else:
+            raise pyos.ReadError(err_num)
+
+    return ''.join(chunks), status == pyos.EOF_SENTINEL
+
+
+def _ReadPortionSlowly(delim_byte, max_chars, cmd_ev):
+    # type: (int, int, CommandEvaluator) -> Tuple[str, bool]
+    """Like _ReadPortion, but reads one byte at a time.
+
+    Used when stdin isn't seekable.
+    """
     eof = False
     ch_array = []  # type: List[int]
     bytes_read = 0
@@ -188,38 +219,80 @@ def _ReadPortion(delim_byte, max_chars, cmd_ev):
 
 # sys.stdin.readline() in Python has its own buffering which is incompatible
 # with shell semantics.  dash, mksh, and zsh all read a single byte at a
-# time with read(0, 1).
+# time with read(0, 1).  We do that too, unless stdin is seekable, or we're
+# reading until EOF.
 
-# TODO:
-# - ReadLineSlowly should have keep_newline (mapfile -t)
-#   - this halves memory usage!
 
+class StdinLines(object):
+    """Read lines from stdin, one at a time.
 
-def ReadLineSlowly(cmd_ev):
-    # type: (CommandEvaluator) -> str
-    """Read a line from stdin."""
-    ch_array = []  # type: List[int]
-    while True:
-        ch, err_num = pyos.ReadByte(0)
+    Like ReadAllLines(), this reads stdin in blocks, so it's only for callers
+    that read until EOF, like json read --lines.  Only one line and one block
+    are in memory at a time.
+    """
+
+    def __init__(self, cmd_ev):
+        # type: (CommandEvaluator) -> None
+        self.cmd_ev = cmd_ev
+        self.chunk = ''  # the last block read
+        self.pos = 0  # position of the next line in the block
+        self.eof = False
+
+    def Next(self):
+        # type: () -> str
+        """Return the next line with its newline, or '' at EOF."""
+        partial = []  # type: List[str]  # pieces of a line split across blocks
+        chunks = []  # type: List[str]
+        while True:
+            i = self.chunk.find('\n', self.pos)
+            if i != -1:
+                line = self.chunk[self.pos:i + 1]
+                self.pos = i + 1
+                if len(partial):
+                    partial.append(line)
+                    return ''.join(partial)
+                return line
+
+            if self.pos < len(self.chunk):
+                partial.append(self.chunk[self.pos:])
+            self.chunk = ''
+            self.pos = 0
+            if self.eof:
+                break
+
+            n, err_num = pyos.Read(STDIN_FILENO, 4096, chunks)
+
+            if n < 0:
+                if err_num == EINTR:
+                    self.cmd_ev.RunPendingTraps()
+                    # retry after running traps
+                else:
+                    raise pyos.ReadError(err_num)
+
+            elif n == 0:  # EOF
+                self.eof = True
 
-        if ch < 0:
-            if err_num == EINTR:
-                cmd_ev.RunPendingTraps()
-                # retry after running traps
             else:
-                raise pyos.ReadError(err_num)
+                self.chunk = chunks.pop()
 
-        elif ch == pyos.EOF_SENTINEL:
-            break
+        return ''.join(partial)
 
-        else:
-            ch_array.append(ch)
 
-        # TODO: Add option to omit newline
-        if ch == pyos.NEWLINE_CH:
-            break
+def ReadAllLines(cmd_ev):
+    # type: (CommandEvaluator) -> List[str]
+    """Read all of stdin, and split it into lines that keep their newline.
 
-    return pyutil.ChArrayToString(ch_array)
+    This reads stdin in blocks, even if it's a pipe.  That's OK because we
+    read until EOF, so no bytes are left for the next command.
+    """
+    lines = []  # type: List[str]
+    stdin_lines = StdinLines(cmd_ev)
+    while True:
+        line = stdin_lines.Next()
+        if len(line) == 0:
+            break
+        lines.append(line)
+    return lines
 
 
 def ReadAll():
@@ -228,22 +301,12 @@ def ReadAll():
 
     Similar to command sub in core/executor.py.
     """
-    chunks = []  # type: List[str]
-    while True:
-        n, err_num = pyos.Read(0, 4096, chunks)
-
-        if n < 0:
-            if err_num == EINTR:
-                # Retry only.  Like read --line (and command sub), read --all doesn't
-                # run traps.  It would be a bit weird to run every 4096 bytes.
-                pass
-            else:
-                raise pyos.ReadError(err_num)
-
-        elif n == 0:  # EOF
-            break
-
-    return ''.join(chunks)
+    # Like read --line (and command sub), read --all doesn't run traps when a
+    # read is interrupted.  It would be a bit weird to run them between reads.
+    contents, err_num = pyos.ReadAll(0, False)
+    if err_num != 0:
+        raise pyos.ReadError(err_num)
+    return contents
 
 
 class ctx_TermAttrs(object):
@@ -364,7 +427,7 @@ class Read(vm._Builtin):
 
         # Don't respect any of the other options here?  This is buffered I/O.
         if arg.line:  # read --line
-            # Use an optimized C implementation rather than ReadLineSlowly,
+            # Use an optimized C implementation rather than _ReadPortionSlowly,
             # which calls ReadByte() over and over.
             line = pyos.ReadLineBuffered()
             if len(line) == 0:  # EOF
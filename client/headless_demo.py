@@ -58,6 +58,19 @@ COMMANDS = [
 ]
 
 
+# PARSE x -- parse without executing
+PARSE_COMMANDS = [
+  b'echo hi | wc -l; ls',
+  b'for x in a b; do',   # syntax error with location
+]
+
+# EVAL_MANY -- one round trip, with a status for each item
+EVAL_MANY = [b'echo one', b'false', b'echo two']
+
+# COMPLETE x -- matches for the end of the line
+COMPLETE_COMMANDS = [b'ech', b'echo $PW']
+
+
 def ShowDescriptorState(label):
   if 1:
     pid = os.getpid()
@@ -171,12 +184,20 @@ def main(argv):
 
   # The normal path
 
-  commands = [b'GETPID']
+  fds = [stdin_fd, stdout_fd, stderr_fd]
+
+  # (command, file descriptors to pass)
+  commands = [(b'GETPID', fds)]
   #commands = [b'EVAL echo prompt ${PS1@P}']
-  commands.extend(b'EVAL ' + c for c in COMMANDS)
+  commands.extend((b'PARSE ' + c, []) for c in PARSE_COMMANDS)
+  commands.append((b'EVAL_MANY ' + py_fanos.encode_list(EVAL_MANY), fds))
+  # Invalid netstrings get an ERROR reply, but the session goes on
+  commands.append((b'EVAL_MANY 3:fo', fds))
+  commands.extend((b'COMPLETE ' + c, fds) for c in COMPLETE_COMMANDS)
+  commands.extend((b'EVAL ' + c, fds) for c in COMMANDS)
 
-  for cmd in commands:
-    py_fanos.send(left, cmd, [stdin_fd, stdout_fd, stderr_fd])
+  for cmd, cmd_fds in commands:
+    py_fanos.send(left, cmd, cmd_fds)
 
     try:
       reply = py_fanos.recv(left)
@@ -188,6 +209,9 @@ def main(argv):
     if reply is None:
       break
 
+    if cmd.startswith(b'COMPLETE ') and reply.startswith(b'OK '):
+      log('matches %s', py_fanos.decode_list(reply[3:]))
+
   left.close()
 
   if master_fd != -1:
@@ -100,3 +100,24 @@ def recv(sock, fd_out=None):
     raise ValueError('Expected ,')
 
   return msg
+
+
+def encode_list(items):
+  """Encode a list of blobs as netstrings, for EVAL_MANY."""
+  return b''.join(b'%d:%s,' % (len(item), item) for item in items)
+
+
+def decode_list(blob):
+  """Decode netstrings, like the reply to COMPLETE."""
+  items = []
+  pos = 0
+  while pos < len(blob):
+    colon = blob.index(b':', pos)
+    length = int(blob[pos:colon])
+    start = colon + 1
+    end = start + length
+    if blob[end:end+1] != b',':
+      raise ValueError('Expected ,')
+    items.append(blob[start:end])
+    pos = end + 1
+  return items
@@ -34,6 +34,15 @@ class FanosTest(unittest.TestCase):
 
     right.close()
 
+  def testEncodeDecodeList(self):
+    items = [b'echo hi', b'', b'a,b:c']
+    blob = py_fanos.encode_list(items)
+    self.assertEqual(b'7:echo hi,0:,5:a,b:c,', blob)
+    self.assertEqual(items, py_fanos.decode_list(blob))
+
+    self.assertEqual([], py_fanos.decode_list(b''))
+    self.assertRaises(ValueError, py_fanos.decode_list, b'3:foo')
+
 
 class InvalidMessageTests(unittest.TestCase):
   """COPIED to native/fanos_test.py."""
@@ -11,11 +11,12 @@ Arena, and the entire Arena can be discarded at once.
 Also, we don't want to save comment lines.
 """
 
+from _devbuild.gen.id_kind_asdl import Id_t
 from _devbuild.gen.syntax_asdl import source_t, Token, SourceLine
 from asdl import runtime
 from mycpp.mylib import log
 
-from typing import List, Any
+from typing import List, Optional, Any
 
 _ = log
 
@@ -105,12 +106,20 @@ class Arena(object):
 
         self.save_tokens = save_tokens
 
-        # indexed by span_id
-        self.tokens = []  # type: List[Token]
+        # Saved tokens are stored as parallel arrays indexed by span_id, not
+        # as Token objects.  Tools like --tool tokens and ysh-ify need every
+        # token, but the LST doesn't keep whitespace, comments, etc.  The
+        # text isn't stored either; it's sliced from the line on demand.
+        self.tok_ids = []  # type: List[Id_t]
+        self.tok_cols = []  # type: List[int]
+        self.tok_lengths = []  # type: List[int]
+        self.tok_lines = []  # type: List[Optional[SourceLine]]
         self.num_tokens = 0
 
         # All lines that haven't been discarded.  For LST formatting.
         self.lines_list = []  # type: List[SourceLine]
+        # The arena_index of lines_list[0]
+        self.first_index = 0
 
         # reuse these instances in many line_span instances
         self.source_instances = []  # type: List[source_t]
@@ -133,7 +142,9 @@ class Arena(object):
 
         The line number is 1-based.
         """
-        src_line = SourceLine(line_num, line, self.source_instances[-1])
+        arena_index = self.first_index + len(self.lines_list)
+        src_line = SourceLine(line_num, line, self.source_instances[-1],
+                              arena_index)
         self.lines_list.append(src_line)
         return src_line
 
@@ -141,13 +152,24 @@ class Arena(object):
         # type: () -> None
         """Remove references ot lines we've accumulated.
 
-        - This makes the linear search in SnipCodeString() shorter.
-        - It removes the ARENA's references to all lines.  The TOKENS still
-          reference some lines.
+        It removes the ARENA's references to all lines.  The TOKENS still
+        reference some lines.
         """
         #log("discarding %d lines", len(self.lines_list))
+        self.first_index += len(self.lines_list)
         del self.lines_list[:]
 
+    def _LineIndex(self, src_line):
+        # type: (SourceLine) -> int
+        """Return the index of a line in lines_list, or -1 if it's not there.
+
+        e.g. it was discarded, or another Arena added it.
+        """
+        i = src_line.arena_index - self.first_index
+        if 0 <= i and i < len(self.lines_list) and self.lines_list[i] == src_line:
+            return i
+        return -1
+
     def SaveLinesAndDiscard(self, left, right):
         # type: (Token, Token) -> List[SourceLine]
         """Save the lines between two tokens, e.g. for { and }
@@ -167,31 +189,26 @@ class Arena(object):
         #log('*** Saving lines between %r and %r', left, right)
 
         saved = []  # type: List[SourceLine]
-        saving = False
-        for li in self.lines_list:
-            if li == left.line:
-                saving = True
 
-            # These lines are PERMANENT, and never deleted.  What if you overwrite a
-            # function name?  You might want to save those in a the function record
-            # ITSELF.
-            #
-            # This is for INLINE hay blocks that can be evaluated at any point.  In
-            # contrast, parse_hay(other_file) uses ParseWholeFile, and we could save
-            # all lines.
+        # These lines are PERMANENT, and never deleted.  What if you overwrite a
+        # function name?  You might want to save those in a the function record
+        # ITSELF.
+        #
+        # This is for INLINE hay blocks that can be evaluated at any point.  In
+        # contrast, parse_hay(other_file) uses ParseWholeFile, and we could save
+        # all lines.
 
-            # TODO: consider creating a new Arena for each CommandParser?  Or rename itj
-            # to 'BackingLines' or something.
+        # TODO: consider creating a new Arena for each CommandParser?  Or rename itj
+        # to 'BackingLines' or something.
 
-            # TODO: We should mutate li.line_id here so it's the index into
-            # saved_lines?
-            if saving:
-                saved.append(li)
-                #log('   %r', li.val)
+        left_index = self._LineIndex(left.line)
+        if left_index != -1:
+            right_index = self._LineIndex(right.line)
+            if right_index < left_index:  # not found; save until the end
+                right_index = len(self.lines_list) - 1
 
-            if li == right.line:
-                saving = False
-                break
+            for i in xrange(left_index, right_index + 1):
+                saved.append(self.lines_list[i])
 
         #log('*** SAVED %d lines', len(saved))
 
@@ -210,43 +227,24 @@ class Arena(object):
 
         $ myalias '1     2     3'
         """
-        if left.line == right.line:
-            for li in self.lines_list:
-                if li == left.line:
-                    piece = li.content[left.col:right.col + right.length]
-                    return piece
+        left_index = self._LineIndex(left.line)
+        right_index = self._LineIndex(right.line)
+        assert left_index != -1, "Couldn't find left token"
+        assert right_index != -1, "Couldn't find right token"
 
-        pieces = []  # type: List[str]
-        saving = False
-        found_left = False
-        found_right = False
-        for li in self.lines_list:
-            if li == left.line:
-                found_left = True
-                saving = True
+        if left_index == right_index:
+            return left.line.content[left.col:right.col + right.length]
 
-                # Save everything after the left token
-                piece = li.content[left.col:]
-                pieces.append(piece)
-                #log('   %r', piece)
-                continue
+        pieces = []  # type: List[str]
 
-            if li == right.line:
-                found_right = True
+        # Save everything after the left token
+        pieces.append(left.line.content[left.col:])
 
-                piece = li.content[:right.col + right.length]
-                pieces.append(piece)
-                #log('   %r', piece)
+        for i in xrange(left_index + 1, right_index):
+            pieces.append(self.lines_list[i].content)
 
-                saving = False
-                break
+        pieces.append(right.line.content[:right.col + right.length])
 
-            if saving:
-                pieces.append(li.content)
-                #log('   %r', li.content)
-
-        assert found_left, "Couldn't find left token"
-        assert found_right, "Couldn't find right token"
         return ''.join(pieces)
 
     def NewToken(self, id_, col, length, src_line, val):
@@ -256,24 +254,63 @@ class Arena(object):
 
         tok = Token(id_, col, length, span_id, src_line, val)
         if self.save_tokens:
-            self.tokens.append(tok)
+            self.tok_ids.append(id_)
+            self.tok_cols.append(col)
+            self.tok_lengths.append(length)
+            self.tok_lines.append(src_line)
         return tok
 
     def UnreadOne(self):
         # type: () -> None
         """Reuse the last span ID."""
         if self.save_tokens:
-            self.tokens.pop()
+            self.tok_ids.pop()
+            self.tok_cols.pop()
+            self.tok_lengths.pop()
+            self.tok_lines.pop()
         self.num_tokens -= 1
 
+    def SetTokenId(self, tok, id_):
+        # type: (Token, Id_t) -> None
+        """Change the Id of a token, e.g. when the parser learns that ) ends
+        a subshell.  The saved copy has to be updated too."""
+        tok.id = id_
+        if self.save_tokens:
+            self.tok_ids[tok.span_id] = id_
+
+    def _CheckSpanId(self, span_id):
+        # type: (int) -> None
+        assert span_id != runtime.NO_SPID, span_id
+        assert span_id < len(self.tok_ids), \
+          'Span ID out of range: %d is greater than %d' % (span_id, len(self.tok_ids))
+
     def GetToken(self, span_id):
         # type: (int) -> Token
-        assert span_id != runtime.NO_SPID, span_id
-        assert span_id < len(self.tokens), \
-          'Span ID out of range: %d is greater than %d' % (span_id, len(self.tokens))
-        return self.tokens[span_id]
+        """Return a new Token for a saved span ID.
+
+        Prefer the accessors below, which don't allocate.
+        """
+        self._CheckSpanId(span_id)
+        return Token(self.tok_ids[span_id], self.tok_cols[span_id],
+                     self.tok_lengths[span_id], span_id,
+                     self.tok_lines[span_id], self.TokenText(span_id))
+
+    def TokenId(self, span_id):
+        # type: (int) -> Id_t
+        self._CheckSpanId(span_id)
+        return self.tok_ids[span_id]
+
+    def TokenText(self, span_id):
+        # type: (int) -> str
+        """Return the source text of a saved token, like lexer.TokenVal()."""
+        self._CheckSpanId(span_id)
+        src_line = self.tok_lines[span_id]
+        if src_line is None:  # e.g. Eof in an empty file
+            return ''
+        col = self.tok_cols[span_id]
+        return src_line.content[col:col + self.tok_lengths[span_id]]
 
     def LastSpanId(self):
         # type: () -> int
         """Return one past the last span ID."""
-        return len(self.tokens)
+        return len(self.tok_ids)
@@ -27,6 +27,56 @@ class AllocTest(unittest.TestCase):
 
         arena.PopSource()
 
+    def testSaveTokens(self):
+        arena = alloc.Arena(save_tokens=True)
+        arena.PushSource(source.MainFile('one.oil'))
+
+        line = arena.AddLine('echo (x)', 1)
+        arena.NewToken(Id.Lit_Chars, 0, 4, line, 'echo')
+        arena.NewToken(Id.WS_Space, 4, 1, line, None)
+        arena.NewToken(Id.Op_LParen, 5, 1, line, None)
+        arena.UnreadOne()
+        left = arena.NewToken(Id.Op_LParen, 5, 1, line, None)
+        self.assertEqual(2, left.span_id)
+        self.assertEqual(3, arena.LastSpanId())
+
+        self.assertEqual('echo', arena.TokenText(0))
+        self.assertEqual(' ', arena.TokenText(1))
+        self.assertEqual(Id.WS_Space, arena.TokenId(1))
+
+        arena.SetTokenId(left, Id.Left_DollarParen)
+        self.assertEqual(Id.Left_DollarParen, left.id)
+        self.assertEqual(Id.Left_DollarParen, arena.TokenId(2))
+
+        tok = arena.GetToken(2)
+        self.assertEqual(5, tok.col)
+        self.assertEqual('(', tok.tval)
+
+        arena.PopSource()
+
+    def testDiscardLines(self):
+        arena = self.arena
+        arena.PushSource(source.MainFile('one.oil'))
+
+        line1 = arena.AddLine('echo 1', 1)
+        line2 = arena.AddLine('echo 2', 2)
+        self.assertEqual(0, line1.arena_index)
+        self.assertEqual(1, line2.arena_index)
+
+        arena.DiscardLines()
+
+        # Indices keep increasing after lines are discarded
+        line3 = arena.AddLine('echo 3 \\', 3)
+        line4 = arena.AddLine('  4', 4)
+        self.assertEqual(2, line3.arena_index)
+        self.assertEqual(3, line4.arena_index)
+
+        left = arena.NewToken(Id.Lit_Chars, 5, 1, line3, '3')
+        right = arena.NewToken(Id.Lit_Chars, 2, 1, line4, '4')
+        self.assertEqual('3 \\  4', arena.SnipCodeString(left, right))
+
+        arena.PopSource()
+
     def testPushSource(self):
         arena = self.arena
 
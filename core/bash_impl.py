@@ -0,0 +1,269 @@
+"""bash_impl.py - Operations on value.BashArray
+
+A BashArray has two representations:
+
+- Dense: 'strs' is a list, where "holes" are None.  Arrays created from
+  literals like a=(1 2 3), and arrays that are only appended to, stay dense.
+- Sparse: 'd' maps index -> item, and 'strs' is None.  An array becomes sparse
+  when an item is assigned far past its end, like a[1000000]=x, or when most of
+  its items are unset.
+
+In both, 'max_index' is the largest index, and 'count' is the number of items
+that are set.  Only use the functions here to read and write them.
+"""
+from __future__ import print_function
+
+from _devbuild.gen.value_asdl import value
+from mycpp import mylib
+from mycpp.mylib import iteritems
+
+from typing import Dict, List, Optional
+
+# Assigning an item more than this far past the end makes the array sparse
+SPARSE_GAP = 64
+
+# A dense array with this many holes per item becomes sparse
+SPARSE_RATIO = 4
+
+
+def BashArray_FromList(strs):
+    # type: (List[str]) -> value.BashArray
+    """Returns a dense array.  The list may have holes."""
+    count = 0
+    for s in strs:
+        if s is not None:
+            count += 1
+    return value.BashArray(strs, None, len(strs) - 1, count)
+
+
+def BashArray_Copy(val):
+    # type: (value.BashArray) -> value.BashArray
+    if val.strs is None:
+        assert val.d is not None  # for MyPy, so it's not Optional[]
+        d = {}  # type: Dict[int, str]
+        for i, s in iteritems(val.d):
+            d[i] = s
+        return value.BashArray(None, d, val.max_index, val.count)
+
+    strs = []  # type: List[str]
+    strs.extend(val.strs)
+    return value.BashArray(strs, None, val.max_index, val.count)
+
+
+def _ToSparse(val):
+    # type: (value.BashArray) -> None
+    assert val.strs is not None  # for MyPy, so it's not Optional[]
+    d = {}  # type: Dict[int, str]
+    for i, s in enumerate(val.strs):
+        if s is not None:
+            d[i] = s
+    val.d = d
+    val.strs = None
+
+
+def BashArray_IsSparse(val):
+    # type: (value.BashArray) -> bool
+    return val.strs is None
+
+
+def BashArray_Count(val):
+    # type: (value.BashArray) -> int
+    """The number of items, for ${#a[@]}."""
+    return val.count
+
+
+def BashArray_Length(val):
+    # type: (value.BashArray) -> int
+    """One more than the largest index, including holes."""
+    return val.max_index + 1
+
+
+def BashArray_HasHoles(val):
+    # type: (value.BashArray) -> bool
+    return val.count != val.max_index + 1
+
+
+def BashArray_GetKeys(val):
+    # type: (value.BashArray) -> List[int]
+    """The indices of the items, in order."""
+    if val.strs is None:
+        sparse_keys = val.d.keys()
+        sparse_keys.sort()
+        return sparse_keys
+
+    keys = []  # type: List[int]
+    for i, s in enumerate(val.strs):
+        if s is not None:
+            keys.append(i)
+    return keys
+
+
+def BashArray_GetValues(val):
+    # type: (value.BashArray) -> List[str]
+    """The items in index order, without holes.
+
+    Don't mutate the result; it may be the array's own list.
+    """
+    if val.strs is None:
+        values = []  # type: List[str]
+        for i in BashArray_GetKeys(val):
+            values.append(val.d[i])
+        return values
+
+    if val.count == len(val.strs):
+        return val.strs  # fast path: no holes
+
+    values = []
+    for s in val.strs:
+        if s is not None:
+            values.append(s)
+    return values
+
+
+def BashArray_SliceValues(val, begin, limit):
+    # type: (value.BashArray, int, int) -> List[str]
+    """Items at index >= begin, skipping holes.
+
+    If limit is non-negative, return at most that many items.
+    """
+    values = []  # type: List[str]
+    if limit == 0:
+        return values
+
+    if val.strs is None:
+        for i in BashArray_GetKeys(val):
+            if i >= begin:
+                values.append(val.d[i])
+                if len(values) == limit:
+                    break
+        return values
+
+    n = len(val.strs)
+    i = begin
+    while i < n:
+        s = val.strs[i]
+        if s is not None:  # Unset elements don't count towards the length
+            values.append(s)
+            if len(values) == limit:
+                break
+        i += 1
+    return values
+
+
+def BashArray_GetItem(val, index):
+    # type: (value.BashArray, int) -> Optional[str]
+    """Returns None for holes.  A negative index counts from the end."""
+    if index < 0:
+        index += val.max_index + 1
+        if index < 0:
+            return None
+
+    if val.strs is None:
+        return val.d.get(index)
+
+    if index < len(val.strs):
+        return val.strs[index]
+    return None
+
+
+def BashArray_SetItem(val, index, s):
+    # type: (value.BashArray, int, str) -> bool
+    """Returns False if a negative index is out of range."""
+    if index < 0:
+        index += val.max_index + 1
+        if index < 0:
+            return False
+
+    strs = val.strs
+    if strs is not None:
+        n = len(strs)
+        if index < n:
+            if strs[index] is None:
+                val.count += 1
+            strs[index] = s
+            return True
+
+        gap = index - n
+        if gap <= SPARSE_GAP or gap <= n:
+            # Fill it in with None.  It could look like this:
+            # ['1', 2, 3, None, None, '4', None]
+            for i in xrange(gap):
+                strs.append(None)
+            strs.append(s)
+            val.max_index = index
+            val.count += 1
+            return True
+
+        _ToSparse(val)
+
+    if index not in val.d:
+        val.count += 1
+    val.d[index] = s
+    if index > val.max_index:
+        val.max_index = index
+    return True
+
+
+def BashArray_UnsetItem(val, index):
+    # type: (value.BashArray, int) -> None
+    """Unsetting an item that doesn't exist isn't an error."""
+    if index < 0:
+        index += val.max_index + 1
+        if index < 0:
+            return
+
+    if index > val.max_index:
+        return
+
+    strs = val.strs
+    if strs is None:
+        if index in val.d:
+            mylib.dict_erase(val.d, index)
+            val.count -= 1
+    else:
+        if strs[index] is not None:
+            val.count -= 1
+        if index == val.max_index:
+            strs.pop()
+        else:
+            strs[index] = None
+
+    # Special case: The array SHORTENS if you unset from the end.  You can
+    # tell with a+=(3 4)
+    if index == val.max_index:
+        val.max_index -= 1
+
+    if (strs is not None and len(strs) > SPARSE_GAP and
+            val.count * SPARSE_RATIO < len(strs)):
+        _ToSparse(val)
+
+
+def BashArray_AppendValues(val, strs):
+    # type: (value.BashArray, List[str]) -> None
+    """Append items after the largest index, like a+=(x y)."""
+    if val.strs is None:
+        index = val.max_index + 1
+        for s in strs:
+            val.d[index] = s
+            index += 1
+    else:
+        val.strs.extend(strs)
+    val.max_index += len(strs)
+    val.count += len(strs)
+
+
+def BashArray_Equals(left, right):
+    # type: (value.BashArray, value.BashArray) -> bool
+    if left.max_index != right.max_index or left.count != right.count:
+        return False
+
+    if left.strs is not None and right.strs is not None:
+        for i in xrange(0, len(left.strs)):
+            if left.strs[i] != right.strs[i]:
+                return False
+        return True
+
+    for i in BashArray_GetKeys(left):
+        if BashArray_GetItem(right, i) != BashArray_GetItem(left, i):
+            return False
+    return True
@@ -0,0 +1,84 @@
+#!/usr/bin/env python2
+"""bash_impl_test.py: Tests for bash_impl.py."""
+
+import unittest
+
+from core import bash_impl  # module under test
+
+
+class BashArrayTest(unittest.TestCase):
+
+    def testDense(self):
+        a = bash_impl.BashArray_FromList(['a', None, 'c'])
+        self.assertEqual(2, bash_impl.BashArray_Count(a))
+        self.assertEqual(3, bash_impl.BashArray_Length(a))
+        self.assertEqual(True, bash_impl.BashArray_HasHoles(a))
+        self.assertEqual([0, 2], bash_impl.BashArray_GetKeys(a))
+        self.assertEqual(['a', 'c'], bash_impl.BashArray_GetValues(a))
+        self.assertEqual('c', bash_impl.BashArray_GetItem(a, -1))
+        self.assertEqual(None, bash_impl.BashArray_GetItem(a, 1))
+        self.assertEqual(None, bash_impl.BashArray_GetItem(a, -4))
+
+        # Appending and filling small gaps stays dense
+        self.assertEqual(True, bash_impl.BashArray_SetItem(a, 1, 'b'))
+        self.assertEqual(True, bash_impl.BashArray_SetItem(a, 10, 'k'))
+        self.assertEqual(False, bash_impl.BashArray_IsSparse(a))
+        self.assertEqual(4, bash_impl.BashArray_Count(a))
+        self.assertEqual(11, bash_impl.BashArray_Length(a))
+
+        self.assertEqual(False, bash_impl.BashArray_SetItem(a, -12, 'x'))
+
+    def testSparse(self):
+        a = bash_impl.BashArray_FromList(['a', 'b'])
+        bash_impl.BashArray_SetItem(a, 1000000, 'x')
+        self.assertEqual(True, bash_impl.BashArray_IsSparse(a))
+        self.assertEqual(3, bash_impl.BashArray_Count(a))
+        self.assertEqual(1000001, bash_impl.BashArray_Length(a))
+        self.assertEqual([0, 1, 1000000], bash_impl.BashArray_GetKeys(a))
+        self.assertEqual('x', bash_impl.BashArray_GetItem(a, -1))
+
+        self.assertEqual(['b', 'x'],
+                         bash_impl.BashArray_SliceValues(a, 1, -1))
+        self.assertEqual(['x'], bash_impl.BashArray_SliceValues(a, 2, 1))
+        self.assertEqual([], bash_impl.BashArray_SliceValues(a, 0, 0))
+
+        bash_impl.BashArray_AppendValues(a, ['y', 'z'])
+        self.assertEqual(1000003, bash_impl.BashArray_Length(a))
+        self.assertEqual('z', bash_impl.BashArray_GetItem(a, 1000002))
+
+        bash_impl.BashArray_UnsetItem(a, 0)
+        bash_impl.BashArray_UnsetItem(a, 0)  # idempotent
+        self.assertEqual(4, bash_impl.BashArray_Count(a))
+        self.assertEqual(['b', 'x', 'y', 'z'],
+                         bash_impl.BashArray_GetValues(a))
+
+    def testUnsetMakesSparse(self):
+        a = bash_impl.BashArray_FromList([str(i) for i in xrange(200)])
+        for i in xrange(190):
+            bash_impl.BashArray_UnsetItem(a, i)
+        self.assertEqual(True, bash_impl.BashArray_IsSparse(a))
+        self.assertEqual(10, bash_impl.BashArray_Count(a))
+        self.assertEqual(200, bash_impl.BashArray_Length(a))
+
+        # The array shortens when the last item is unset
+        bash_impl.BashArray_UnsetItem(a, -1)
+        self.assertEqual(199, bash_impl.BashArray_Length(a))
+
+    def testCopyAndEquals(self):
+        a = bash_impl.BashArray_FromList(['a'])
+        bash_impl.BashArray_SetItem(a, 500, 'b')
+        b = bash_impl.BashArray_Copy(a)
+        self.assertEqual(True, bash_impl.BashArray_Equals(a, b))
+
+        bash_impl.BashArray_SetItem(b, 1, 'c')
+        self.assertEqual(False, bash_impl.BashArray_Equals(a, b))
+        self.assertEqual(2, bash_impl.BashArray_Count(a))
+
+        # Same items in different representations
+        dense = bash_impl.BashArray_FromList(['a'] + [None] * 499 + ['b'])
+        self.assertEqual(True, bash_impl.BashArray_Equals(a, dense))
+        self.assertEqual(True, bash_impl.BashArray_Equals(dense, a))
+
+
+if __name__ == '__main__':
+    unittest.main()
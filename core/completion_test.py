@@ -9,11 +9,13 @@
 from __future__ import print_function
 
 import os
+import shutil
+import tempfile
 import unittest
 import sys
 
 from _devbuild.gen.option_asdl import option_i
-from _devbuild.gen.runtime_asdl import comp_action_e
+from _devbuild.gen.runtime_asdl import comp_action_e, scope_e
 from _devbuild.gen.syntax_asdl import proc_sig
 from _devbuild.gen.value_asdl import (value, value_e)
 from core import completion  # module under test
@@ -25,6 +27,7 @@ from mycpp.mylib import log
 from frontend import flag_def  # side effect: flags are defined!
 
 _ = flag_def
+from frontend import location
 from frontend import parse_lib
 from testdata.completion import bash_oracle
 
@@ -128,12 +131,22 @@ class CompletionTest(unittest.TestCase):
         parse_opts, exec_opts, mutable_opts = state.MakeOpts(mem, None)
         mem.exec_opts = exec_opts
 
-        a = completion.ExternalCommandAction(mem)
-        comp = self._CompApi([], 0, 'f')
-        print(list(a.Matches(comp)))
-
-        # TODO: This should set up the file system and $PATH and assert that only
-        # executable files are accessed!
+        d = tempfile.mkdtemp()
+        try:
+            for name, mode in [('foo', 0o755), ('foo.txt', 0o644),
+                               ('bar', 0o755)]:
+                path = os.path.join(d, name)
+                with open(path, 'w') as f:
+                    f.write('')
+                os.chmod(path, mode)
+            mem.SetValue(location.LName('PATH'), value.Str(d),
+                         scope_e.GlobalOnly)
+
+            a = completion.ExternalCommandAction(state.SearchPath(mem))
+            comp = self._CompApi([], 0, 'f')
+            self.assertEqual(['foo'], list(a.Matches(comp)))
+        finally:
+            shutil.rmtree(d)
 
     def testFileSystemAction(self):
         CASES = [
@@ -204,7 +217,7 @@ class CompletionTest(unittest.TestCase):
                                               arena=arena)
         node = c_parser.ParseLogicalLine()
         proc = value.Proc(node.name, node.name_tok, proc_sig.Open, node.body,
-                          [], True)
+                          [], True, None)
 
         cmd_ev = test_lib.InitCommandEvaluator(arena=arena)
 
@@ -10,10 +10,12 @@ from _devbuild.gen.syntax_asdl import assign_op_e, Token
 from _devbuild.gen.value_asdl import (value, value_e, value_t, sh_lvalue,
                                       sh_lvalue_e, LeftName)
 
+from core import bash_impl
 from core import error
 from core import optview
 from core import state
 from core import ui
+from core import util
 from data_lang import j8
 from mycpp.mylib import log
 from frontend import location
@@ -33,7 +35,6 @@ if TYPE_CHECKING:
     from core import alloc
     from core.error import _ErrorWithLocation
     from core import process
-    from core import util
     from frontend.parse_lib import ParseContext
     from osh.word_eval import NormalWordEvaluator
     from osh.cmd_eval import CommandEvaluator
@@ -207,7 +208,7 @@ def _PrintShValue(val, buf):
         elif case(value_e.BashArray):
             val = cast(value.BashArray, UP_val)
             parts = ['(']
-            for s in val.strs:
+            for s in bash_impl.BashArray_GetValues(val):
                 parts.append(qsn.maybe_shell_encode(s))
             parts.append(')')
             result = ' '.join(parts)
@@ -280,6 +281,7 @@ class Tracer(object):
 
         # PS4 value -> CompoundWord.  PS4 is scoped.
         self.parse_cache = {}  # type: Dict[str, CompoundWord]
+        self.parse_lru = util.Lru('ps4', 100)
 
         # Mutate objects to save allocations
         self.val_indent = value.Str('')
@@ -306,8 +308,9 @@ class Tracer(object):
 
         # NOTE: This cache is slightly broken because aliases are mutable!  I think
         # that is more or less harmless though.
-        ps4_word = self.parse_cache.get(ps4)
-        if ps4_word is None:
+        if self.parse_lru.Lookup(ps4):
+            ps4_word = self.parse_cache[ps4]
+        else:
             # We have to parse this at runtime.  PS4 should usually remain constant.
             w_parser = self.parse_ctx.MakeWordParserForPlugin(ps4)
 
@@ -317,6 +320,9 @@ class Tracer(object):
             except error.Parse as e:
                 ps4_word = word_.ErrorWord("<ERROR: Can't parse PS4: %s>" %
                                            e.UserErrorString())
+            evicted = self.parse_lru.Insert(ps4)
+            if evicted is not None:
+                mylib.dict_erase(self.parse_cache, evicted)
             self.parse_cache[ps4] = ps4_word
 
         # Mutate objects to save allocations
@@ -1,18 +1,18 @@
 """executor.py."""
 from __future__ import print_function
 
-from errno import EINTR
-
 from _devbuild.gen.id_kind_asdl import Id
 from _devbuild.gen.option_asdl import builtin_i
-from _devbuild.gen.runtime_asdl import RedirValue, trace
+from _devbuild.gen.runtime_asdl import RedirValue, redirect_arg, trace
 from _devbuild.gen.syntax_asdl import (
     command,
     command_e,
     CommandSub,
-    CompoundWord,
     loc,
     loc_t,
+    Redir,
+    redir_loc,
+    redir_loc_e,
 )
 from _devbuild.gen.value_asdl import value
 from builtin import hay_ysh
@@ -21,6 +21,7 @@ from core import error
 from core import process
 from core.error import e_die, e_die_status
 from core import pyos
+from core import pyutil
 from core import ui
 from core import vm
 from frontend import consts
@@ -28,8 +29,9 @@ from frontend import lexer
 from mycpp.mylib import log
 
 import posix_ as posix
+from posix_ import O_RDONLY
 
-from typing import cast, Dict, List, Optional, TYPE_CHECKING
+from typing import cast, Dict, List, Optional, Tuple, TYPE_CHECKING
 if TYPE_CHECKING:
     from _devbuild.gen.runtime_asdl import (cmd_value, CommandStatus,
                                             StatusArray)
@@ -87,6 +89,29 @@ class _ProcessSubFrame(object):
         status_array.locs = locs
 
 
+def _FileToRead(node):
+    # type: (command_t) -> Optional[Redir]
+    """If node is the '< file' of $(< file), return the redirect."""
+    if node.tag() != command_e.Simple:
+        return None
+
+    simple = cast(command.Simple, node)
+    if len(simple.words) != 0 or len(simple.redirects) != 1:
+        return None
+
+    redir = simple.redirects[0]
+    if redir.op.id != Id.Redir_Less:
+        return None
+
+    # Not $(3< file)
+    if redir.loc.tag() != redir_loc_e.Fd:
+        return None
+    if cast(redir_loc.Fd, redir.loc).fd != 0:
+        return None
+
+    return redir
+
+
 class ShellExecutor(vm._Executor):
     """An executor combined with the OSH language evaluators in osh/ to create
     a shell interpreter."""
@@ -441,50 +466,37 @@ class ShellExecutor(vm._Executor):
 
         node = cs_part.child
 
-        # Hack for weird $(<file) construct
-        if node.tag() == command_e.Simple:
-            simple = cast(command.Simple, node)
-            # Detect '< file'
-            if (len(simple.words) == 0 and len(simple.redirects) == 1 and
-                    simple.redirects[0].op.id == Id.Redir_Less):
-                # change it to __cat < file
-                # TODO: change to 'internal cat' (issue 1013)
-                tok = lexer.DummyToken(Id.Lit_Chars, '__cat')
-                cat_word = CompoundWord([tok])
-                # MUTATE the command.Simple node.  This will only be done the first
-                # time in the parent process.
-                simple.words.append(cat_word)
-
-        p = self._MakeProcess(node,
-                              inherit_errexit=self.exec_opts.inherit_errexit())
-        # Shell quirk: Command subs remain part of the shell's process group, so we
-        # don't use p.AddStateChange(process.SetPgid(...))
-
-        r, w = posix.pipe()
-        p.AddStateChange(process.StdoutToPipe(r, w))
-
-        p.StartProcess(trace.CommandSub)
-        #log('Command sub started %d', pid)
-
-        chunks = []  # type: List[str]
-        posix.close(w)  # not going to write
-        while True:
-            n, err_num = pyos.Read(r, 4096, chunks)
+        # Runtime errors test case: # $("echo foo > $@")
+        # Why strip trailing newlines?
+        # https://unix.stackexchange.com/questions/17747/why-does-shell-command-substitution-gobble-up-a-trailing-newline-char
 
-            if n < 0:
-                if err_num == EINTR:
-                    pass  # retry
-                else:
-                    # Like the top level IOError handler
-                    e_die_status(
-                        2,
-                        'osh I/O error (read): %s' % posix.strerror(err_num))
+        redir = _FileToRead(node)
+        if redir is not None:
+            # $(< file) is like $(cat < file), but we don't need another
+            # process
+            s, status = self._ReadFile(redir)
 
-            elif n == 0:  # EOF
-                break
-        posix.close(r)
+        else:
+            p = self._MakeProcess(
+                node, inherit_errexit=self.exec_opts.inherit_errexit())
+            # Shell quirk: Command subs remain part of the shell's process
+            # group, so we don't use p.AddStateChange(process.SetPgid(...))
+
+            r, w = posix.pipe()
+            p.AddStateChange(process.StdoutToPipe(r, w))
+
+            p.StartProcess(trace.CommandSub)
+            #log('Command sub started %d', pid)
+
+            posix.close(w)  # not going to write
+            s, err_num = pyos.ReadAll(r, True)
+            if err_num != 0:
+                # Like the top level IOError handler
+                e_die_status(
+                    2, 'osh I/O error (read): %s' % posix.strerror(err_num))
+            posix.close(r)
 
-        status = p.Wait(self.waiter)
+            status = p.Wait(self.waiter)
 
         # OSH has the concept of aborting in the middle of a WORD.  We're not
         # waiting until the command is over!
@@ -505,10 +517,45 @@ class ShellExecutor(vm._Executor):
             self.cmd_ev.check_command_sub_status = True
             self.mem.SetLastStatus(status)
 
-        # Runtime errors test case: # $("echo foo > $@")
-        # Why rstrip()?
-        # https://unix.stackexchange.com/questions/17747/why-does-shell-command-substitution-gobble-up-a-trailing-newline-char
-        return ''.join(chunks).rstrip('\n')
+        return s
+
+    def _ReadFile(self, redir):
+        # type: (Redir) -> Tuple[str, int]
+        """Read the file for $(< file), without trailing newlines.
+
+        Returns the contents and an exit status.  Errors are printed, like the
+        redirect and read errors of $(cat < file).
+        """
+        try:
+            r = self.cmd_ev.EvalRedirect(redir)
+        except error.RedirectEval as e:
+            self.errfmt.PrettyPrintError(e)
+            return '', 1
+        except error.FailGlob as e:  # e.g. $(< foo-*)
+            if not e.HasLocation():
+                e.location = self.mem.GetFallbackLocation()
+            self.errfmt.PrettyPrintError(e, prefix='failglob: ')
+            return '', 1
+
+        path = cast(redirect_arg.Path, r.arg).filename
+        try:
+            fd = posix.open(path, O_RDONLY, 0)
+        except (IOError, OSError) as e:
+            self.errfmt.Print_("Can't open %r: %s" %
+                               (path, pyutil.strerror(e)),
+                               blame_loc=r.op_loc)
+            return '', 1
+
+        with process.ctx_FdCloser(fd):  # e.g. on KeyboardInterrupt
+            s, err_num = pyos.ReadAll(fd, True)
+
+        status = 0
+        if err_num != 0:
+            self.errfmt.Print_(
+                'osh I/O error (read): %s' % posix.strerror(err_num),
+                blame_loc=r.op_loc)
+            status = 2
+        return s, status
 
     def RunProcessSub(self, cs_part):
         # type: (CommandSub) -> str
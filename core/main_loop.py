@@ -7,25 +7,34 @@ Variants:
                                    We want 'echo 1\necho 2\n' to work, so we
                                    don't bother with "the PS2 problem".
   main_loop.ParseWholeFile() calls ParseLogicalLine().  Used by osh -n.
+
+BatchCache.Run() is like Batch(), but it can skip parsing code that was
+already run by 'source' or 'eval'.
 """
 from __future__ import print_function
 
 from _devbuild.gen import arg_types
-from _devbuild.gen.syntax_asdl import (command, command_t, parse_result,
-                                       parse_result_e)
+from _devbuild.gen.syntax_asdl import (command, command_e, command_t,
+                                       command_str, parse_result,
+                                       parse_result_e, source, source_e,
+                                       source_t)
+from core import completion
 from core import error
 from core import process
+from core import pyos
 from core import ui
 from core import util
+from frontend import location
 from frontend import reader
 from osh import cmd_eval
+from pylib import os_path
 from mycpp import mylib
 from mycpp.mylib import log, print_stderr, tagswitch
 
 import fanos
 import posix_ as posix
 
-from typing import cast, Any, List, TYPE_CHECKING
+from typing import cast, Any, Dict, List, Optional, TYPE_CHECKING
 if TYPE_CHECKING:
     from core.comp_ui import _IDisplay
     from core.ui import ErrorFormatter
@@ -97,13 +106,74 @@ def ShowDescriptorState(label):
         time.sleep(0.01)  # prevent interleaving
 
 
+def DecodeNetstrings(s):
+    # type: (str) -> List[str]
+    """Split a blob like '3:foo,2:ab,' into ['foo', 'ab'].
+
+    Headless commands use netstrings for lists, like FANOS itself.
+    """
+    parts = []  # type: List[str]
+    pos = 0
+    n = len(s)
+    while pos < n:
+        colon = s.find(':', pos)
+        if colon == -1:
+            raise ValueError('Expected netstring length')
+        try:
+            length = int(s[pos:colon])
+        except ValueError:
+            raise ValueError('Invalid netstring length')
+        start = colon + 1
+        end = start + length
+        if length < 0 or end >= n or s[end] != ',':
+            raise ValueError('Expected , after netstring')
+        parts.append(s[start:end])
+        pos = end + 1
+    return parts
+
+
+def EncodeNetstrings(parts):
+    # type: (List[str]) -> str
+    """Inverse of DecodeNetstrings()."""
+    buf = mylib.BufWriter()
+    for part in parts:
+        buf.write('%d:' % len(part))
+        buf.write(part)
+        buf.write(',')
+    return buf.getvalue()
+
+
+def _CommandKind(node):
+    # type: (command_t) -> str
+    """Like 'Pipeline' for 'ls | wc -l;', without the Sentence."""
+    if node.tag() == command_e.Sentence:
+        node = cast(command.Sentence, node).child
+    return command_str(node.tag(), dot=False)
+
+
 class Headless(object):
-    """Main loop for headless mode."""
+    """Main loop for headless mode.
+
+    Commands, and the reply after 'OK ':
+
+      GETPID                  the PID of the shell
+      EVAL code               empty.  Needs 3 descriptors: stdin, stdout,
+                              stderr
+      EVAL_MANY 3:foo,2:ab,   the status of each item, like '0 1'.  Needs 3
+                              descriptors.  Invalid netstrings get an
+                              'ERROR ' reply, and the session goes on.
+      PARSE code              '0 Simple Pipeline', the kinds of the top-level
+                              commands.  Or '2 LINE:COL message' for a syntax
+                              error.  The column is 0-based.
+      COMPLETE line           netstrings of the matches.  Needs 3 descriptors,
+                              because completion functions may run.
+    """
 
-    def __init__(self, cmd_ev, parse_ctx, errfmt):
-        # type: (CommandEvaluator, parse_lib.ParseContext, ErrorFormatter) -> None
+    def __init__(self, cmd_ev, parse_ctx, root_comp, errfmt):
+        # type: (CommandEvaluator, parse_lib.ParseContext, completion.RootCompleter, ErrorFormatter) -> None
         self.cmd_ev = cmd_ev
         self.parse_ctx = parse_ctx
+        self.root_comp = root_comp
         self.errfmt = errfmt
 
     def Loop(self):
@@ -114,22 +184,80 @@ class Headless(object):
             fanos.send(1, 'ERROR %s' % e)
             return 1
 
-    def EVAL(self, arg):
-        # type: (str) -> str
+    def _Eval(self, code_str):
+        # type: (str) -> int
 
         # This logic is similar to the 'eval' builtin in osh/builtin_meta.
 
         # Note: we're not using the InteractiveLineReader, so there's no history
         # expansion.  It would be nice if there was a way for the client to use
         # that.
-        line_reader = reader.StringLineReader(arg, self.parse_ctx.arena)
+        line_reader = reader.StringLineReader(code_str, self.parse_ctx.arena)
         c_parser = self.parse_ctx.MakeOshParser(line_reader)
+        return Batch(self.cmd_ev, c_parser, self.errfmt, 0)
+
+    def EVAL(self, arg):
+        # type: (str) -> str
 
         # Status is unused; $_ can be queried by the headless client
-        unused_status = Batch(self.cmd_ev, c_parser, self.errfmt, 0)
+        unused_status = self._Eval(arg)
 
         return ''  # result is always 'OK ' since there was no protocol error
 
+    def EVAL_MANY(self, arg):
+        # type: (str) -> str
+        """Run each snippet, saving a round trip for each one."""
+        # Raises ValueError before anything is run
+        snippets = DecodeNetstrings(arg)
+
+        statuses = []  # type: List[str]
+        for code_str in snippets:
+            statuses.append(str(self._Eval(code_str)))
+        return ' '.join(statuses)
+
+    def PARSE(self, arg):
+        # type: (str) -> str
+        """Parse without executing."""
+        arena = self.parse_ctx.arena
+        line_reader = reader.StringLineReader(arg, arena)
+        c_parser = self.parse_ctx.MakeOshParser(line_reader)
+
+        kinds = ['0']  # type: List[str]
+        try:
+            while True:
+                node = c_parser.ParseLogicalLine()
+                if node is None:  # EOF
+                    c_parser.CheckForPendingHereDocs()
+                    break
+                if node.tag() == command_e.CommandList:
+                    # 'echo 1; echo 2' is one logical line
+                    c_list = cast(command.CommandList, node)
+                    for child in c_list.children:
+                        kinds.append(_CommandKind(child))
+                else:
+                    kinds.append(_CommandKind(node))
+        except error.Parse as e:
+            tok = location.TokenFor(e.location)
+            if tok:
+                pos = '%d:%d' % (tok.line.line_num, tok.col)
+            else:
+                pos = '0:0'
+            arena.DiscardLines()
+            return '2 %s %s' % (pos, e.UserErrorString())
+
+        arena.DiscardLines()
+        return ' '.join(kinds)
+
+    def COMPLETE(self, arg):
+        # type: (str) -> str
+        """Complete at the end of the line."""
+        # Like the compexport builtin
+        comp = completion.Api(line=arg, begin=0, end=len(arg))
+        it = self.root_comp.Matches(comp)
+        matches = list(it)
+        matches.reverse()
+        return EncodeNetstrings(matches)
+
     def _Loop(self):
         # type: () -> int
         fanos_log(
@@ -138,6 +266,7 @@ class Headless(object):
 
         fd_out = []  # type: List[int]
         while True:
+            error_str = None  # type: Optional[str]
             try:
                 blob = fanos.recv(0, fd_out)
             except ValueError as e:
@@ -160,7 +289,8 @@ class Headless(object):
             if command == 'GETPID':
                 reply = str(posix.getpid())
 
-            elif command == 'EVAL':
+            elif (command == 'EVAL' or command == 'EVAL_MANY' or
+                  command == 'COMPLETE'):
                 #fanos_log('arg %r', arg)
 
                 if len(fd_out) != 3:
@@ -170,21 +300,33 @@ class Headless(object):
                     fanos_log('received descriptor %d' % fd)
 
                 with ctx_Descriptors(fd_out):
-                    reply = self.EVAL(arg)
+                    if command == 'EVAL':
+                        reply = self.EVAL(arg)
+                    elif command == 'EVAL_MANY':
+                        try:
+                            reply = self.EVAL_MANY(arg)
+                        except ValueError as e:
+                            # Nothing was run, so the client can go on
+                            error_str = e.message
+                            reply = ''
+                    else:
+                        reply = self.COMPLETE(arg)
 
                 #ShowDescriptorState('RESTORED')
 
             # Note: lang == 'osh' or lang == 'ysh' puts this in different modes.
             # Do we also need 'complete --osh' and 'complete --ysh' ?
             elif command == 'PARSE':
-                # Just parse
-                reply = 'TODO:PARSE'
+                reply = self.PARSE(arg)
 
             else:
                 fanos_log('Invalid command %r' % command)
                 raise ValueError('Invalid command %r' % command)
 
-            fanos.send(1, b'OK %s' % reply)
+            if error_str is None:
+                fanos.send(1, b'OK %s' % reply)
+            else:
+                fanos.send(1, b'ERROR %s' % error_str)
             del fd_out[:]  # reset for next iteration
 
         return 0
@@ -393,3 +535,162 @@ def ParseWholeFile(c_parser):
         return children[0]
     else:
         return command.CommandList(children)
+
+
+def _SameSource(a, b):
+    # type: (source_t, source_t) -> bool
+    """Whether errors in code from a and b would be reported the same way.
+
+    Cached nodes point to the source_t of the code they were parsed from, and
+    functions defined by that code keep using it.  So a cache hit must be for
+    code that's described the same way in error messages.
+
+    A sourced file is described by the path it was sourced with, so it can be
+    replayed for any 'source' call with that path.  But 'eval' code is
+    described by the location of the 'eval', so it must be the same call.
+    """
+    if a.tag() != b.tag():
+        return False
+
+    UP_a = a
+    UP_b = b
+    with tagswitch(a) as case:
+        if case(source_e.SourcedFile):
+            a = cast(source.SourcedFile, UP_a)
+            b = cast(source.SourcedFile, UP_b)
+            return a.path == b.path
+
+        elif case(source_e.ArgvWord):
+            a = cast(source.ArgvWord, UP_a)
+            b = cast(source.ArgvWord, UP_b)
+            return a.what == b.what and a.location is b.location
+
+        else:
+            return False
+
+
+class _BatchEntry(object):
+    """Code that was parsed completely."""
+
+    def __init__(self, version, parse_key, src, nodes, line_nums):
+        # type: (str, str, source_t, List[command_t], List[int]) -> None
+        self.version = version
+        self.parse_key = parse_key
+        self.src = src  # shared by all lines of the code
+
+        self.nodes = nodes
+        # line_nums[i] is the number of the line after nodes[i]
+        self.line_nums = line_nums
+
+
+class BatchCache(object):
+    """Remembers the top-level commands of code run by 'source' or 'eval'.
+
+    When the same code is run again, the commands are executed again without
+    lexing and parsing it.  For files, the key is the absolute path, and the
+    version has the device, inode, mtime and size.  For 'eval', the key is
+    the code itself.
+
+    Batch() parses incrementally, so each command is parsed in the state left
+    by the previous one.  We only cache code if that state -- parse options
+    and aliases -- didn't change while it was parsed.  When replaying, if a
+    command changes the state, we parse the rest of the code in the new state.
+
+    For 'source', it's enabled with OILS_SOURCE_CACHE=1.  It lives only as
+    long as the process, since there's no way to save a command_t and load it
+    in a later one.
+    """
+
+    def __init__(self, name, max_size, parse_cache):
+        # type: (str, int, parse_lib.ParseCache) -> None
+        self.parse_cache = parse_cache
+        self.entries = {}  # type: Dict[str, _BatchEntry]
+        self.lru = util.Lru(name, max_size)
+
+    def RunFile(self, cmd_ev, c_parser, line_reader, errfmt, cmd_flags, path,
+                src):
+        # type: (CommandEvaluator, CommandParser, reader.FileLineReader, ErrorFormatter, int, str, source_t) -> int
+        """Like Batch(), but uses the cached commands for path if possible."""
+        try:
+            version = pyos.MakeFileCacheKey(path)
+        except (IOError, OSError) as e:
+            return Batch(cmd_ev, c_parser, errfmt, cmd_flags=cmd_flags)
+
+        # A relative path names a different file after 'cd'
+        return self.Run(cmd_ev, c_parser, line_reader, errfmt, cmd_flags,
+                        os_path.abspath(path), version, src)
+
+    def Run(self, cmd_ev, c_parser, line_reader, errfmt, cmd_flags, key,
+            version, src):
+        # type: (CommandEvaluator, CommandParser, reader.FileLineReader, ErrorFormatter, int, str, str, source_t) -> int
+        """Like Batch(), but uses the cached commands for key if possible."""
+        parse_key = self.parse_cache.StateKey()
+
+        if self.lru.Lookup(key):
+            entry = self.entries[key]
+            if (entry.version == version and entry.parse_key == parse_key and
+                    _SameSource(entry.src, src)):
+                return self._Replay(cmd_ev, c_parser, line_reader, errfmt,
+                                    cmd_flags, entry)
+            self.lru.CountStale()
+
+        nodes = []  # type: List[command_t]
+        line_nums = []  # type: List[int]
+        cacheable = True
+        status = 0
+        while True:
+            if self.parse_cache.StateKey() != parse_key:
+                cacheable = False
+
+            try:
+                node = c_parser.ParseLogicalLine()  # can raise ParseError
+                if node is None:  # EOF
+                    c_parser.CheckForPendingHereDocs()  # can raise ParseError
+                    break
+            except error.Parse as e:
+                errfmt.PrettyPrintError(e)
+                return 2
+
+            c_parser.arena.DiscardLines()
+            nodes.append(node)
+            line_nums.append(line_reader.line_num)
+
+            is_return, is_fatal = cmd_ev.ExecuteAndCatch(node,
+                                                         cmd_flags=cmd_flags)
+            status = cmd_ev.LastStatus()
+            if is_return or is_fatal:
+                return status  # the rest of the code wasn't parsed
+
+            mylib.MaybeCollect()  # manual GC point
+
+        if cacheable:
+            if key not in self.entries:
+                evicted = self.lru.Insert(key)
+                if evicted is not None:
+                    mylib.dict_erase(self.entries, evicted)
+            self.entries[key] = _BatchEntry(version, parse_key, src, nodes,
+                                            line_nums)
+        return status
+
+    def _Replay(self, cmd_ev, c_parser, line_reader, errfmt, cmd_flags, entry):
+        # type: (CommandEvaluator, CommandParser, reader.FileLineReader, ErrorFormatter, int, _BatchEntry) -> int
+        status = 0
+        n = len(entry.nodes)
+        i = 0
+        while i < n:
+            if i > 0 and self.parse_cache.StateKey() != entry.parse_key:
+                # The previous command changed the parse options or defined an
+                # alias, so the rest of the code has to be parsed again.
+                line_reader.SkipLines(entry.line_nums[i - 1])
+                return Batch(cmd_ev, c_parser, errfmt, cmd_flags=cmd_flags)
+
+            is_return, is_fatal = cmd_ev.ExecuteAndCatch(entry.nodes[i],
+                                                         cmd_flags=cmd_flags)
+            status = cmd_ev.LastStatus()
+            if is_return or is_fatal:
+                break
+
+            mylib.MaybeCollect()  # manual GC point
+            i += 1
+
+        return status
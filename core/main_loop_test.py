@@ -0,0 +1,99 @@
+#!/usr/bin/env python2
+"""main_loop_test.py: Tests for main_loop.py."""
+from __future__ import print_function
+
+import unittest
+
+from core import comp_ui
+from core import completion
+from core import main_loop  # module under test
+from core import test_lib
+from core import ui
+from core import util
+from frontend import parse_lib
+
+
+class NetstringsTest(unittest.TestCase):
+
+    def testDecode(self):
+        self.assertEqual([], main_loop.DecodeNetstrings(''))
+        self.assertEqual([''], main_loop.DecodeNetstrings('0:,'))
+        self.assertEqual(['foo', 'ab'],
+                         main_loop.DecodeNetstrings('3:foo,2:ab,'))
+        # Items can contain the delimiters
+        self.assertEqual(['a:b,', ''],
+                         main_loop.DecodeNetstrings('4:a:b,,0:,'))
+
+        parts = ['echo hi', '', 'x\ny\n']
+        self.assertEqual(
+            parts,
+            main_loop.DecodeNetstrings(main_loop.EncodeNetstrings(parts)))
+
+    def testDecodeErrors(self):
+        for s in [
+                '3',  # no colon
+                ':foo,',  # empty length
+                'x:foo,',  # bad length
+                '-1:,',  # negative length
+                '3:fooX',  # missing comma
+                '3:foo',  # missing comma at the end
+                '3:fo',  # truncated
+                '3:foo,2:a',  # truncated second item
+        ]:
+            try:
+                main_loop.DecodeNetstrings(s)
+            except ValueError:
+                pass
+            else:
+                self.fail('Expected ValueError for %r' % s)
+
+
+def _MakeHeadless():
+    parse_ctx = test_lib.InitParseContext()
+    parse_ctx.Init_Trail(parse_lib.Trail())
+    cmd_ev = test_lib.InitCommandEvaluator(parse_ctx=parse_ctx)
+
+    mem = cmd_ev.mem
+    comp_lookup = completion.Lookup()
+    ev = test_lib.InitWordEvaluator(exec_opts=cmd_ev.exec_opts)
+    root_comp = completion.RootCompleter(ev, mem, comp_lookup,
+                                         completion.OptionState(),
+                                         comp_ui.State(),
+                                         parse_ctx, util.NullDebugFile())
+    return main_loop.Headless(cmd_ev, parse_ctx, root_comp,
+                              ui.ErrorFormatter())
+
+
+class HeadlessTest(unittest.TestCase):
+
+    def testEvalMany(self):
+        h = _MakeHeadless()
+        code = main_loop.EncodeNetstrings(['(( 1 ))', '(( 0 ))', 'x=42'])
+        self.assertEqual('0 1 0', h.EVAL_MANY(code))
+        self.assertEqual('', h.EVAL_MANY(''))
+
+        # Nothing is run if the netstrings are invalid
+        self.assertRaises(ValueError, h.EVAL_MANY, '6:x=99,3:fo')
+        self.assertEqual('0', h.EVAL_MANY(main_loop.EncodeNetstrings(
+            ['[[ $x == 42 ]]'])))
+
+    def testParse(self):
+        h = _MakeHeadless()
+        self.assertEqual('0 Pipeline Simple', h.PARSE('echo hi | wc -l; ls'))
+        self.assertEqual('0 ForEach', h.PARSE('for x in a b; do\necho\ndone'))
+        self.assertEqual('0', h.PARSE(''))
+
+        reply = h.PARSE('for x in a b; do')
+        self.assertTrue(reply.startswith('2 '), reply)
+
+        reply = h.PARSE('echo )')
+        self.assertTrue(reply.startswith('2 1:5 '), reply)
+
+    def testComplete(self):
+        h = _MakeHeadless()
+        matches = main_loop.DecodeNetstrings(h.COMPLETE('echo $PW'))
+        self.assertEqual(['echo $PWD'], matches)
+
+
+if __name__ == '__main__':
+    unittest.main()
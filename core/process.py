@@ -84,6 +84,10 @@ NO_FD = -1
 # bookkeeping), and dash/zsh (10) and mksh (24)
 _SHELL_MIN_FD = 100
 
+# A here doc this size or smaller is written to a pipe without blocking.  It's
+# PIPE_BUF on Linux, and pipes hold at least this much everywhere.
+_PIPE_SIZE = 4096
+
 # Style for 'jobs' builtin
 STYLE_DEFAULT = 0
 STYLE_LONG = 1
@@ -108,6 +112,22 @@ class ctx_FileCloser(object):
         self.f.close()
 
 
+class ctx_FdCloser(object):
+    """Closes a descriptor, like ctx_FileCloser."""
+
+    def __init__(self, fd):
+        # type: (int) -> None
+        self.fd = fd
+
+    def __enter__(self):
+        # type: () -> None
+        pass
+
+    def __exit__(self, type, value, traceback):
+        # type: (Any, Any, Any) -> None
+        posix.close(self.fd)
+
+
 def InitInteractiveShell():
     # type: () -> None
     """Called when initializing an interactive shell."""
@@ -453,38 +473,55 @@ class FdState(object):
             elif case(redirect_arg_e.HereDoc):
                 arg = cast(redirect_arg.HereDoc, UP_arg)
 
-                # NOTE: Do these descriptors have to be moved out of the range 0-9?
-                read_fd, write_fd = posix.pipe()
-
-                self._PushDup(read_fd, r.loc)  # stdin is now the pipe
+                # Like dash, we write a body that fits in the pipe buffer
+                # ourselves, since that can't block.  A larger body goes in a
+                # temp file, or if that fails, a process writes it to a pipe.
+                small = len(arg.body) <= _PIPE_SIZE
+                tmp_fd = -1
+                if not small:
+                    tmp_fd = pyos.WriteTempFile(arg.body)
+
+                if tmp_fd != -1:
+                    # The temp file is close-on-exec, and it may already be
+                    # the target, e.g. cat /dev/fd/3 3<<EOF.  Move it out of
+                    # the way so that _PushDup() makes a copy without the flag.
+                    try:
+                        high_fd = fcntl_.fcntl(tmp_fd, F_DUPFD,
+                                               _SHELL_MIN_FD)  # type: int
+                    except (IOError, OSError) as e:
+                        posix.close(tmp_fd)
+                        raise
+                    posix.close(tmp_fd)
+
+                    self._PushDup(high_fd, r.loc)  # stdin is now the file
+                    posix.close(high_fd)
 
-                # We can't close like we do in the filename case above?  The writer can
-                # get a "broken pipe".
-                self._PushClose(read_fd)
-
-                thunk = _HereDocWriterThunk(write_fd, arg.body)
+                else:
+                    # NOTE: Do these descriptors have to be moved out of the range 0-9?
+                    read_fd, write_fd = posix.pipe()
 
-                # TODO: Use PIPE_SIZE to save a process in the case of small here docs,
-                # which are the common case.  (dash does this.)
-                start_process = True
-                #start_process = False
+                    self._PushDup(read_fd, r.loc)  # stdin is now the pipe
 
-                if start_process:
-                    here_proc = Process(thunk, self.job_control, self.job_list,
-                                        self.tracer)
+                    # We can't close like we do in the filename case above?  The writer can
+                    # get a "broken pipe".
+                    self._PushClose(read_fd)
 
-                    # NOTE: we could close the read pipe here, but it doesn't really
-                    # matter because we control the code.
-                    here_proc.StartProcess(trace.HereDoc)
-                    #log('Started %s as %d', here_proc, pid)
-                    self._PushWait(here_proc)
+                    if small:
+                        posix.write(write_fd, arg.body)
+                        posix.close(write_fd)
+                    else:
+                        thunk = _HereDocWriterThunk(write_fd, arg.body)
+                        here_proc = Process(thunk, self.job_control,
+                                            self.job_list, self.tracer)
 
-                    # Now that we've started the child, close it in the parent.
-                    posix.close(write_fd)
+                        # NOTE: we could close the read pipe here, but it doesn't really
+                        # matter because we control the code.
+                        here_proc.StartProcess(trace.HereDoc)
+                        #log('Started %s as %d', here_proc, pid)
+                        self._PushWait(here_proc)
 
-                else:
-                    posix.write(write_fd, arg.body)
-                    posix.close(write_fd)
+                        # Now that we've started the child, close it in the parent.
+                        posix.close(write_fd)
 
     def Push(self, redirects):
         # type: (List[RedirValue]) -> bool
@@ -572,6 +609,14 @@ class ChildStateChange(object):
         """Noop for all state changes other than SetPgid for mycpp."""
         pass
 
+    def ApplyToSpawn(self, attrs):
+        # type: (SpawnAttrs) -> bool
+        """Record this change for posix_spawn().
+
+        Returns False if it has to be applied in a forked child.
+        """
+        return False
+
 
 class StdinFromPipe(ChildStateChange):
 
@@ -618,6 +663,14 @@ INVALID_PGID = -1
 OWN_LEADER = 0
 
 
+class SpawnAttrs(object):
+    """Child state that posix_spawn() sets up, instead of a forked child."""
+
+    def __init__(self):
+        # type: () -> None
+        self.pgid = INVALID_PGID
+
+
 class SetPgid(ChildStateChange):
 
     def __init__(self, pgid):
@@ -642,6 +695,11 @@ class SetPgid(ChildStateChange):
                 'osh: parent failed to set process group for PID %d to %d: %s'
                 % (proc.pid, self.pgid, pyutil.strerror(e)))
 
+    def ApplyToSpawn(self, attrs):
+        # type: (SpawnAttrs) -> bool
+        attrs.pgid = self.pgid
+        return True
+
 
 class ExternalProgram(object):
     """The capability to execute an external program like 'ls'."""
@@ -674,6 +732,25 @@ class ExternalProgram(object):
                    True)
         assert False, "This line should never execute"  # NO RETURN
 
+    def Spawn(self, argv0_path, cmd_val, environ, pgid, sig_defaults):
+        # type: (str, cmd_value.Argv, Dict[str, str], int, List[int]) -> int
+        """Start a program with posix_spawn(), which doesn't copy our page
+        tables like fork() does.
+
+        Returns the PID, or -1 if the caller should fork() and call Exec()
+        instead.  That includes errors like ENOENT and ENOEXEC, so they're
+        handled and reported as usual.
+        """
+        if len(self.hijack_shebang):
+            return -1  # we have to read the shebang line
+
+        try:
+            pid = posix.posix_spawn(argv0_path, cmd_val.argv, environ, pgid,
+                                    sig_defaults)
+        except (IOError, OSError) as e:
+            return -1
+        return pid
+
     def _Exec(self, argv0_path, argv, argv0_loc, environ, should_retry):
         # type: (str, List[str], loc_t, Dict[str, str], bool) -> None
         if len(self.hijack_shebang):
@@ -756,6 +833,11 @@ class Thunk(object):
         """Display for the 'jobs' list."""
         raise NotImplementedError()
 
+    def Spawn(self, attrs, sig_defaults):
+        # type: (SpawnAttrs, List[int]) -> int
+        """Start this thunk without fork(), or return -1."""
+        return -1
+
     def __repr__(self):
         # type: () -> str
         return self.UserString()
@@ -786,6 +868,11 @@ class ExternalThunk(Thunk):
         """An ExternalThunk is run in parent for the exec builtin."""
         self.ext_prog.Exec(self.argv0_path, self.cmd_val, self.environ)
 
+    def Spawn(self, attrs, sig_defaults):
+        # type: (SpawnAttrs, List[int]) -> int
+        return self.ext_prog.Spawn(self.argv0_path, self.cmd_val, self.environ,
+                                   attrs.pgid, sig_defaults)
+
 
 class SubProgramThunk(Thunk):
     """A subprogram that can be executed in another process."""
@@ -1015,10 +1102,34 @@ class Process(Job):
             posix.close(self.close_r)
             posix.close(self.close_w)
 
+    def _Spawn(self):
+        # type: () -> int
+        """Start an external command with posix_spawn(), if there's nothing
+        else to do in the child.
+
+        Returns the PID, or -1 if we have to fork().
+        """
+        attrs = SpawnAttrs()
+        for st in self.state_changes:
+            if not st.ApplyToSpawn(attrs):
+                return -1
+
+        # The same signals that are reset after fork() below
+        sig_defaults = [SIGPIPE, SIGQUIT, SIGTTOU, SIGTTIN]
+        if attrs.pgid == OWN_LEADER and self.parent_pipeline is None:
+            sig_defaults.append(SIGTSTP)
+
+        return self.thunk.Spawn(attrs, sig_defaults)
+
     def StartProcess(self, why):
         # type: (trace_t) -> int
-        """Start this process with fork(), handling redirects."""
-        pid = posix.fork()
+        """Start this process with posix_spawn() or fork(), handling
+        redirects."""
+        pid = self._Spawn()
+        spawned = pid != -1
+        if not spawned:
+            pid = posix.fork()
+
         if pid < 0:
             # When does this happen?
             e_die('Fatal error in posix.fork()')
@@ -1066,8 +1177,12 @@ class Process(Job):
 
         # SetPgid needs to be applied from the child and the parent to avoid
         # racing in calls to tcsetpgrp() in the parent. See APUE sec. 9.2.
-        for st in self.state_changes:
-            st.ApplyFromParent(self)
+        #
+        # posix_spawn() doesn't return until the child has set its process
+        # group and called exec(), after which setpgid() fails with EACCES.
+        if not spawned:
+            for st in self.state_changes:
+                st.ApplyFromParent(self)
 
         # Program invariant: We keep track of every child process!
         self.job_list.AddChildProcess(pid, self)
@@ -106,6 +106,27 @@ class ProcessTest(unittest.TestCase):
         self.assertEqual('one', line1)
         self.assertEqual('one', line2)
 
+    def testHereDoc(self):
+
+        class CommandEvaluator(object):
+
+            def RunPendingTraps(self):
+                pass
+
+        cmd_ev = CommandEvaluator()
+
+        # A small body is written to a pipe, and a large one to a temp file.
+        # Neither starts a process.
+        for body in ['one\ntwo\n', 'one\n' + 'x' * 10000 + '\n']:
+            r = RedirValue(Id.Redir_DLess, runtime.NO_SPID, redir_loc.Fd(0),
+                           redirect_arg.HereDoc(body))
+            self.fd_state.Push([r])
+            line, _ = read_osh._ReadPortion(pyos.NEWLINE_CH, -1, cmd_ev)
+            self.fd_state.Pop()
+
+            self.assertEqual('one', line)
+            self.assertEqual({}, self.job_list.child_procs)
+
     def testProcess(self):
         # 3 fds.  Does Python open it?  Shell seems to have it too.  Maybe it
         # inherits from the shell.
@@ -126,6 +147,52 @@ class ProcessTest(unittest.TestCase):
         # 12 file descriptors open!
         print('FDS AFTER', os.listdir('/dev/fd'))
 
+    def testSpawn(self):
+        why = trace.External(['false'])
+
+        p = self._ExtProc(['false'])
+        self.assertEqual(1, p.RunProcess(self.waiter, why))
+
+        # If posix_spawn() fails, the forked child reports the error
+        p = self._ExtProc(['does-not-exist'])
+        self.assertEqual(127, p.RunProcess(self.waiter, why))
+
+        # A process group is set by posix_spawn()
+        p = self._ExtProc(['false'])
+        p.AddStateChange(process.SetPgid(process.OWN_LEADER))
+        self.assertEqual(1, p.RunProcess(self.waiter, why))
+
+        # But pipes are set up in a forked child
+        p = self._ExtProc(['false'])
+        p.AddStateChange(process.StdoutToPipe(-1, -1))
+        self.assertEqual(-1, p._Spawn())
+
+    def testSpawnIgnoredSignals(self):
+        if not os.path.exists('/proc/self/status'):
+            return
+
+        class ForceFork(process.ChildStateChange):
+
+            def Apply(self):
+                pass
+
+        # A spawned child ignores the same signals as a forked one
+        why = trace.External(['sh'])
+        masks = []
+        for force_fork in [False, True]:
+            path = '_tmp/sig-ign-%d.txt' % force_fork
+            p = self._ExtProc(
+                ['sh', '-c',
+                 'grep SigIgn /proc/self/status > %s' % path])
+            if force_fork:
+                p.AddStateChange(ForceFork())
+            self.assertEqual(0, p.RunProcess(self.waiter, why))
+            with open(path) as f:
+                masks.append(f.read())
+
+        log('%s', masks)
+        self.assertEqual(masks[1], masks[0])
+
     def testPipeline(self):
         node = _CommandNode('uniq -c', self.arena)
         cmd_ev = test_lib.InitCommandEvaluator(arena=self.arena,
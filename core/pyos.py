@@ -6,11 +6,13 @@ Like py{error,util}.py, it won't be translated to C++.
 from __future__ import print_function
 
 from errno import EINTR
+import os
 import pwd
 import resource
 import signal
 import select
 import sys
+import tempfile  # for here docs
 import termios  # for read -n
 import time
 
@@ -27,6 +29,10 @@ _ = log
 EOF_SENTINEL = 256  # bigger than any byte
 NEWLINE_CH = 10  # ord('\n')
 
+# Sizes of the read() calls made by ReadAll()
+READ_ALL_MIN = 4096
+READ_ALL_MAX = 1 << 20
+
 
 def FlushStdout():
     # type: () -> None
@@ -109,6 +115,105 @@ def ReadByte(fd):
             return EOF_SENTINEL, 0
 
 
+def ReadUntilDelim(fd, delim_byte, max_bytes, chunks):
+    # type: (int, int, int, List[str]) -> Tuple[int, int]
+    """Read bytes up to a delimiter from a seekable file descriptor.
+
+    The 'read' builtin must not consume bytes after the delimiter, since they
+    may be read by the next command.  ReadByte() avoids that by calling
+    read(fd, 1) repeatedly.  On a regular file, we can read a block instead,
+    and then lseek() back to the byte after the delimiter.
+
+    Appends the bytes before the delimiter to chunks.  If max_bytes isn't -1,
+    it stops after that many bytes.
+
+    Returns:
+      (-1, errno) on failure.  ESPIPE means that fd isn't seekable, and
+        nothing was read.
+      (EOF_SENTINEL, 0) if it stopped at EOF
+      (0, 0) if it stopped at the delimiter or after max_bytes
+    """
+    try:
+        posix.lseek(fd, 0, posix.SEEK_CUR)
+    except OSError as e:
+        return -1, e.errno
+
+    delim = chr(delim_byte)
+    block_size = 128  # lines are usually short, and we give back the rest
+    while True:
+        n = block_size
+        if max_bytes >= 0:
+            if max_bytes == 0:
+                return 0, 0
+            n = min(n, max_bytes)
+
+        try:
+            chunk = posix.read(fd, n)
+        except OSError as e:
+            return -1, e.errno
+
+        if len(chunk) == 0:
+            return EOF_SENTINEL, 0
+
+        i = chunk.find(delim)
+        if i != -1:
+            if i != 0:
+                chunks.append(chunk[:i])
+            extra = len(chunk) - i - 1
+            if extra != 0:
+                try:
+                    posix.lseek(fd, -extra, posix.SEEK_CUR)
+                except OSError as e:
+                    return -1, e.errno
+            return 0, 0
+
+        chunks.append(chunk)
+        if max_bytes >= 0:
+            max_bytes -= len(chunk)
+        if block_size < 4096:
+            block_size *= 2
+
+
+def ReadAll(fd, strip_newlines):
+    # type: (int, bool) -> Tuple[str, int]
+    """Read from a file descriptor until EOF.
+
+    Used by command sub, $(< file), and read --all.  The C++ version reads into
+    a single buffer that doubles in size, so there are fewer read() calls for
+    big outputs.  Each read() is at most READ_ALL_MAX bytes.  The result is
+    copied at most once, to free unused space.  Reads interrupted by a signal
+    are retried.
+
+    If strip_newlines is true, trailing newlines are removed, like command sub
+    does.
+
+    Returns:
+      (contents, 0) on success
+      (what was read so far, errno) on failure
+    """
+    chunks = []  # type: List[str]
+    block_size = READ_ALL_MIN
+    while True:
+        try:
+            chunk = posix.read(fd, block_size)
+        except OSError as e:
+            if e.errno == EINTR:
+                continue
+            return ''.join(chunks), e.errno
+
+        if len(chunk) == 0:
+            break
+
+        chunks.append(chunk)
+        if block_size < READ_ALL_MAX:
+            block_size *= 2
+
+    s = ''.join(chunks)
+    if strip_newlines:
+        s = s.rstrip('\n')
+    return s, 0
+
+
 def ReadLineBuffered():
     # type: () -> str
     """Read a line from stdin.
@@ -405,7 +510,49 @@ def RegisterSignalInterest(sig_num):
 
 def MakeDirCacheKey(path):
     # type: (str) -> Tuple[str, int]
-    """Returns a pair (path with last modified time) that can be used to cache
-    directory accesses."""
+    """Returns (key, mtime seconds) for a directory.
+
+    A cached listing of the dir is valid while its key is the same.  The key
+    has the device and inode, so it changes if a symlink or rename puts
+    another dir at the path, and the mtime and ctime to the nanosecond.
+    """
+    st = posix.stat(path)
+    key = '%d:%d:%r:%r' % (st.st_dev, st.st_ino, st.st_mtime, st.st_ctime)
+    return key, int(st.st_mtime)
+
+
+def MakeFileCacheKey(path):
+    # type: (str) -> str
+    """Returns a key for the contents of a file.
+
+    Used to check if a cached parse of the file is still valid.  Like
+    MakeDirCacheKey(), the key has the device, inode and mtime, and it raises
+    OSError if the file can't be stat'd.  It also has the size, which may not
+    fit in an int.
+    """
     st = posix.stat(path)
-    return (path, int(st.st_mtime))
+    return '%d:%d:%r:%d' % (st.st_dev, st.st_ino, st.st_mtime, st.st_size)
+
+
+def WriteTempFile(contents):
+    # type: (str) -> int
+    """Write contents to a temp file that's already been unlinked.
+
+    Returns a descriptor open for reading at the start of the file, or -1 on
+    error.  The file is removed from the disk when it's closed.
+    """
+    try:
+        fd, path = tempfile.mkstemp(prefix='osh-heredoc-')
+    except (IOError, OSError) as e:
+        return -1
+
+    try:
+        os.unlink(path)
+        n = 0
+        while n < len(contents):
+            n += posix.write(fd, contents[n:])
+        posix.lseek(fd, 0, posix.SEEK_SET)
+    except (IOError, OSError) as e:
+        posix.close(fd)
+        return -1
+    return fd
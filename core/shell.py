@@ -383,6 +383,9 @@ def Main(
                                        aliases,
                                        ysh_grammar,
                                        one_pass_parse=one_pass_parse)
+    # Only the main parser caches; completion and history parsers have a Trail
+    parse_cache = parse_lib.ParseCache(mutable_opts)
+    parse_ctx.Init_ParseCache(parse_cache)
 
     # Three ParseContext instances SHARE aliases.
     comp_arena = alloc.Arena()
@@ -588,12 +591,16 @@ def Main(
     b[builtin_i.runproc] = meta_osh.RunProc(shell_ex, procs, errfmt)
 
     # Meta builtins
+    source_cache = None  # type: Optional[main_loop.BatchCache]
+    if len(environ.get('OILS_SOURCE_CACHE', '')):
+        source_cache = main_loop.BatchCache('source', 100, parse_cache)
     source_builtin = meta_osh.Source(parse_ctx, search_path, cmd_ev, fd_state,
-                                     tracer, errfmt, loader)
+                                     tracer, errfmt, loader, source_cache)
     b[builtin_i.source] = source_builtin
     b[builtin_i.dot] = source_builtin
+    eval_cache = main_loop.BatchCache('eval', 1000, parse_cache)
     b[builtin_i.eval] = meta_osh.Eval(parse_ctx, exec_opts, cmd_ev, tracer,
-                                      errfmt)
+                                      errfmt, eval_cache)
 
     # Module builtins
     modules = {}  # type: Dict[str, bool]
@@ -613,8 +620,8 @@ def Main(
     b[builtin_i.true_] = true_
     b[builtin_i.false_] = pure_osh.Boolean(1)
 
-    b[builtin_i.alias] = pure_osh.Alias(aliases, errfmt)
-    b[builtin_i.unalias] = pure_osh.UnAlias(aliases, errfmt)
+    b[builtin_i.alias] = pure_osh.Alias(aliases, errfmt, parse_cache)
+    b[builtin_i.unalias] = pure_osh.UnAlias(aliases, errfmt, parse_cache)
 
     b[builtin_i.getopts] = pure_osh.GetOpts(mem, errfmt)
 
@@ -629,13 +636,23 @@ def Main(
 
     # Output
     b[builtin_i.echo] = io_osh.Echo(exec_opts)
-    b[builtin_i.printf] = printf_osh.Printf(mem, parse_ctx, unsafe_arith,
-                                            errfmt)
+    printf_builtin = printf_osh.Printf(mem, parse_ctx, unsafe_arith, errfmt)
+    b[builtin_i.printf] = printf_builtin
     b[builtin_i.write] = io_ysh.Write(mem, errfmt)
     b[builtin_i.fopen] = io_ysh.Fopen(mem, cmd_ev)
 
+    # For pp cache-stats
+    caches = [
+        printf_builtin.parse_lru, prompt_ev.tokens_lru, prompt_ev.parse_lru,
+        tracer.parse_lru, splitter.splitters_lru, parse_cache.alias_lru,
+        eval_cache.lru, word_ev.globber.pattern_lru, word_ev.globber.dirs_lru,
+        word_ev.utf8_cache.lru
+    ]  # type: List[util.Lru]
+    if source_cache:
+        caches.append(source_cache.lru)
+
     # (pp output format isn't stable)
-    b[builtin_i.pp] = io_ysh.Pp(mem, errfmt, procs, arena)
+    b[builtin_i.pp] = io_ysh.Pp(mem, errfmt, procs, arena, caches)
 
     # Input
     b[builtin_i.cat] = io_osh.Cat()  # for $(<file)
@@ -655,8 +672,8 @@ def Main(
 
     b[builtin_i.times] = misc_osh.Times()
 
-    b[builtin_i.json] = json_ysh.Json(mem, errfmt, False)
-    b[builtin_i.json8] = json_ysh.Json(mem, errfmt, True)
+    b[builtin_i.json] = json_ysh.Json(mem, errfmt, False, cmd_ev)
+    b[builtin_i.json8] = json_ysh.Json(mem, errfmt, True, cmd_ev)
 
     ### Process builtins
     b[builtin_i.exec_] = process_osh.Exec(mem, ext_prog, fd_state, search_path,
@@ -679,8 +696,8 @@ def Main(
 
     # Completion
     spec_builder = completion_osh.SpecBuilder(cmd_ev, parse_ctx, word_ev,
-                                              splitter, comp_lookup, help_data,
-                                              errfmt)
+                                              splitter, comp_lookup,
+                                              search_path, help_data, errfmt)
     complete_builtin = completion_osh.Complete(spec_builder, comp_lookup)
     b[builtin_i.complete] = complete_builtin
     b[builtin_i.compgen] = completion_osh.CompGen(spec_builder)
@@ -956,7 +973,7 @@ def Main(
                 except util.UserExit as e:
                     return e.status
 
-        loop = main_loop.Headless(cmd_ev, parse_ctx, errfmt)
+        loop = main_loop.Headless(cmd_ev, parse_ctx, root_comp, errfmt)
         try:
             # TODO: What other exceptions happen here?
             status = loop.Loop()
@@ -1028,6 +1045,7 @@ def Main(
             line_reader.Reset()  # After sourcing startup file, render $PS1
 
             prompt_plugin = prompt.UserPlugin(mem, parse_ctx, cmd_ev, errfmt)
+            caches.append(prompt_plugin.parse_lru)
             try:
                 status = main_loop.Interactive(flag, cmd_ev, c_parser, display,
                                                prompt_plugin, waiter, errfmt)
@@ -18,8 +18,9 @@ from _devbuild.gen.types_asdl import opt_group_i
 from _devbuild.gen.value_asdl import (value, value_e, value_t, sh_lvalue,
                                       sh_lvalue_e, sh_lvalue_t, LeftName,
                                       y_lvalue_e, regex_match, regex_match_e,
-                                      regex_match_t, RegexMatch)
+                                      regex_match_t, RegexMatch, FrameLayout)
 from asdl import runtime
+from core import bash_impl
 from core import error
 from core.error import e_usage, e_die
 from core import pyos
@@ -38,6 +39,7 @@ from pylib import path_stat
 
 import libc
 import posix_ as posix
+import time as time_
 from posix_ import X_OK  # translated directly to C macro
 
 from typing import Tuple, List, Dict, Optional, Any, cast, TYPE_CHECKING
@@ -62,25 +64,115 @@ SetNameref = 1 << 4
 ClearNameref = 1 << 5
 
 
+class _DirListing(object):
+    """The names in one $PATH directory, as of its last change."""
+
+    def __init__(self, key, names):
+        # type: (str, Dict[str, bool]) -> None
+        self.key = key  # from pyos.MakeDirCacheKey()
+        self.names = names
+        # For completion; computed lazily
+        self.executables = None  # type: Optional[List[str]]
+
+
 class SearchPath(object):
-    """For looking up files in $PATH."""
+    """For looking up files in $PATH.
+
+    Directory listings are indexed by the identity and mtime of each dir, so
+    a lookup costs one stat() per directory, and the index is dropped when
+    $PATH changes.  A name that isn't in any listing is looked up again
+    without the index before it's reported as not found.
+    """
 
     def __init__(self, mem):
         # type: (Mem) -> None
         self.mem = mem
         self.cache = {}  # type: Dict[str, str]
 
+        # $PATH as of the last lookup, split into dirs
+        self.path_str = None  # type: Optional[str]
+        self.path_dirs = []  # type: List[str]
+
+        # absolute dir -> listing
+        self.index = {}  # type: Dict[str, _DirListing]
+
     def _GetPath(self):
         # type: () -> List[str]
-
-        # TODO: Could cache this to avoid split() allocating all the time.
         val = self.mem.GetValue('PATH')
         UP_val = val
+        path_str = None  # type: Optional[str]
         if val.tag() == value_e.Str:
             val = cast(value.Str, UP_val)
-            return val.s.split(':')
+            path_str = val.s
+        # else treat as empty path
+
+        if (path_str is None or self.path_str is None or
+                path_str != self.path_str):
+            # Like bash, forget the hashed commands when $PATH changes
+            self.cache.clear()
+            self.index.clear()
+            self.path_str = path_str
+            if path_str is None:
+                self.path_dirs = []
+            else:
+                self.path_dirs = path_str.split(':')
+
+        return self.path_dirs
+
+    def _Listing(self, path_dir, must_list):
+        # type: (str, bool) -> Optional[_DirListing]
+        """Returns the names in a $PATH dir, or None if it can't be listed.
+
+        A listing that can't be kept is only made if must_list is true.
+        Otherwise it's cheaper to check the one file.
+        """
+        try:
+            key, mtime = pyos.MakeDirCacheKey(path_dir)
+        except (IOError, OSError) as e:
+            # There could be a directory that doesn't exist in the $PATH.
+            return None
+
+        listing = self.index.get(path_dir)
+        if listing is not None and listing.key == key:
+            return listing
+
+        # Relative dirs depend on the current dir.  And the mtime only has
+        # a resolution of a second, so a listing made in the same second the
+        # dir changed could miss a later change.
+        can_keep = path_dir.startswith('/') and mtime < int(time_.time())
+        if not can_keep:
+            mylib.dict_erase(self.index, path_dir)
+            if not must_list:
+                return None
+
+        try:
+            entries = posix.listdir(path_dir)
+        except (IOError, OSError) as e:
+            return None  # e.g. a dir we can search but not read
+
+        names = {}  # type: Dict[str, bool]
+        for name in entries:
+            names[name] = True
+        listing = _DirListing(key, names)
+
+        if can_keep:
+            self.index[path_dir] = listing
+        return listing
+
+    def _Exists(self, path_dir, name, full_path, exec_required, use_index):
+        # type: (str, str, str, bool, bool) -> bool
+        if use_index:
+            listing = self._Listing(path_dir, False)
+            if listing is not None:
+                if name not in listing.names:
+                    return False  # common case: no syscall
+                if not exec_required:
+                    return True
+
+        if exec_required:
+            return posix.access(full_path, X_OK)
         else:
-            return []  # treat as empty path
+            return path_stat.exists(full_path)
 
     def LookupOne(self, name, exec_required=True):
         # type: (str, bool) -> Optional[str]
@@ -90,14 +182,17 @@ class SearchPath(object):
         if '/' in name:
             return name if path_stat.exists(name) else None
 
-        for path_dir in self._GetPath():
+        path_dirs = self._GetPath()
+        for path_dir in path_dirs:
             full_path = os_path.join(path_dir, name)
-            if exec_required:
-                found = posix.access(full_path, X_OK)
-            else:
-                found = path_stat.exists(full_path)
+            if self._Exists(path_dir, name, full_path, exec_required, True):
+                return full_path
 
-            if found:
+        # A listing could be stale if its key didn't change, e.g. on a file
+        # system with coarse timestamps.  So check each file before failing.
+        for path_dir in path_dirs:
+            full_path = os_path.join(path_dir, name)
+            if self._Exists(path_dir, name, full_path, exec_required, False):
                 return full_path
 
         return None
@@ -113,19 +208,53 @@ class SearchPath(object):
             else:
                 return []
 
+        path_dirs = self._GetPath()
         results = []  # type: List[str]
-        for path_dir in self._GetPath():
+        for path_dir in path_dirs:
             full_path = os_path.join(path_dir, name)
-            if path_stat.exists(full_path):
+            if self._Exists(path_dir, name, full_path, False, True):
                 results.append(full_path)
                 if not do_all:
                     return results
 
+        if len(results) == 0:  # like LookupOne()
+            for path_dir in path_dirs:
+                full_path = os_path.join(path_dir, name)
+                if self._Exists(path_dir, name, full_path, False, False):
+                    results.append(full_path)
+                    if not do_all:
+                        return results
+
+        return results
+
+    def Executables(self):
+        # type: () -> List[str]
+        """Returns the names of all executables in $PATH, for completion."""
+        results = []  # type: List[str]
+        for path_dir in self._GetPath():
+            listing = self._Listing(path_dir, True)
+            if listing is None:
+                continue
+
+            executables = listing.executables
+            if executables is None:
+                executables = []
+                for name, _ in iteritems(listing.names):
+                    path = os_path.join(path_dir, name)
+                    # TODO: Handle exception if file gets deleted in between
+                    # listing and check?
+                    if posix.access(path, X_OK):
+                        executables.append(name)
+                listing.executables = executables
+
+            results.extend(executables)
         return results
 
     def CachedLookup(self, name):
         # type: (str) -> Optional[str]
         #log('name %r', name)
+        self._GetPath()  # clears the cache if $PATH changed
+
         if name in self.cache:
             return self.cache[name]
 
@@ -143,9 +272,11 @@ class SearchPath(object):
         # type: () -> None
         """For hash -r."""
         self.cache.clear()
+        self.index.clear()
 
     def CachedCommands(self):
         # type: () -> List[str]
+        self._GetPath()  # clears the cache if $PATH changed
         return self.cache.values()
 
 
@@ -461,6 +592,17 @@ class MutableOpts(object):
         else:
             return overlay[-1]  # the top value
 
+    def ParseOptionsKey(self):
+        # type: () -> str
+        """Returns a string that changes when any parse option changes.
+
+        Used to check that a cached parse of a file is still valid.
+        """
+        bits = []  # type: List[str]
+        for opt_num in consts.PARSE_OPTION_NUMS:
+            bits.append('1' if self.Get(opt_num) else '0')
+        return ''.join(bits)
+
     def _Set(self, opt_num, b):
         # type: (int, bool) -> None
         """Used to disable errexit.
@@ -682,7 +824,7 @@ class _ArgFrame(object):
         # type: () -> Dict[str, value_t]
         return {
             # Easier to serialize value.BashArray than value.List
-            'argv': value.BashArray(self.argv),
+            'argv': bash_impl.BashArray_FromList(self.argv),
             'num_shifted': value.Int(self.num_shifted),
         }
 
@@ -708,6 +850,29 @@ class _ArgFrame(object):
         self.num_shifted = 0
 
 
+class _FrameSlots(object):
+    """Cells of a proc or func frame, indexed by its FrameLayout.
+
+    The Dict[str, Cell] frame is still the source of truth, so eval, setref,
+    and pp see the same cells.  A slot is filled from the dict when it's first
+    read, and cleared when its cell is removed from the dict.
+    """
+
+    def __init__(self, layout):
+        # type: (FrameLayout) -> None
+        self.layout = layout
+        no_cell = None  # type: Optional[Cell]
+        self.cells = [no_cell] * len(layout.names)
+
+
+# GetValue() computes these before looking at frames, so they don't get slots
+_COMPUTED_VARS = [
+    'ARGV', '_status', '_error', '_this_dir', 'PIPESTATUS', '_pipeline_status',
+    '_process_sub_status', 'BASH_REMATCH', 'FUNCNAME', 'BASH_SOURCE',
+    'BASH_LINENO', 'LINENO', 'BASHPID', '_'
+]
+
+
 def _DumpVarFrame(frame):
     # type: (Dict[str, Cell]) -> Dict[str, value_t]
     """Dump the stack frame as reasonably compact and readable JSON."""
@@ -905,7 +1070,7 @@ class ctx_FuncCall(object):
 
     def __init__(self, mem, func):
         # type: (Mem, value.Func) -> None
-        mem.PushCall(func.name, func.parsed.name, None)
+        mem.PushCall(func.name, func.parsed.name, None, func.layout)
         self.mem = mem
 
     def __enter__(self):
@@ -922,7 +1087,7 @@ class ctx_ProcCall(object):
 
     def __init__(self, mem, mutable_opts, proc, argv):
         # type: (Mem, MutableOpts, value.Proc, List[str]) -> None
-        mem.PushCall(proc.name, proc.name_tok, argv)
+        mem.PushCall(proc.name, proc.name_tok, argv, proc.layout)
         mutable_opts.PushDynamicScope(proc.dynamic_scope)
         # It may have been disabled with ctx_ErrExit for 'if echo $(false)', but
         # 'if p' should be allowed.
@@ -1048,6 +1213,16 @@ class Mem(object):
         self.argv_stack = [_ArgFrame(argv)]
         frame = NewDict()  # type: Dict[str, Cell]
         self.var_stack = [frame]
+        # Parallel to var_stack.  None for the global frame, temp frames, and
+        # shell functions.
+        no_slots = None  # type: Optional[_FrameSlots]
+        self.slot_stack = [no_slots]
+
+        # GetExported() is called for every external command, so we cache its
+        # result.  Any change to an exported cell, or to the set of exported
+        # cells, sets the dirty flag.
+        self.exported_dirty = True
+        self.exported_cache = {}  # type: Dict[str, str]
 
         # The debug_stack isn't strictly necessary for execution.  We use it
         # for crash dumps and for 3 parallel arrays: BASH_SOURCE, FUNCNAME, and
@@ -1259,8 +1434,8 @@ class Mem(object):
     # Call Stack
     #
 
-    def PushCall(self, func_name, def_tok, argv):
-        # type: (str, Token, Optional[List[str]]) -> None
+    def PushCall(self, func_name, def_tok, argv, layout=None):
+        # type: (str, Token, Optional[List[str]], Optional[FrameLayout]) -> None
         """Push argv, var, and debug stack frames.
 
         Currently used for proc and func calls.  TODO: New func evaluator may
@@ -1269,11 +1444,16 @@ class Mem(object):
         Args:
           def_tok: Token where proc or func was defined, used to compute
                    BASH_SOURCE.
+          layout: Slots for the locals of a proc or func, or None
         """
         if argv is not None:
             self.argv_stack.append(_ArgFrame(argv))
         frame = NewDict()  # type: Dict[str, Cell]
         self.var_stack.append(frame)
+        if layout is None:
+            self.slot_stack.append(None)
+        else:
+            self.slot_stack.append(_FrameSlots(layout))
 
         # self.token_for_line can be None?
         self.debug_stack.append(
@@ -1287,7 +1467,7 @@ class Mem(object):
         """
         self.debug_stack.pop()
 
-        self.var_stack.pop()
+        self._PopVarFrame()
 
         if should_pop_argv_stack:
             self.argv_stack.pop()
@@ -1331,16 +1511,83 @@ class Mem(object):
         # We don't want the 'read' builtin to write to this frame!
         frame = NewDict()  # type: Dict[str, Cell]
         self.var_stack.append(frame)
+        self.slot_stack.append(None)
 
     def PopTemp(self):
         # type: () -> None
-        self.var_stack.pop()
+        self._PopVarFrame()
+
+    def _PopVarFrame(self):
+        # type: () -> None
+        frame = self.var_stack.pop()
+        self.slot_stack.pop()
+        if not self.exported_dirty:
+            for _, cell in iteritems(frame):
+                if cell.exported:
+                    self.exported_dirty = True
+                    break
 
     def TopNamespace(self):
         # type: () -> Dict[str, Cell]
         """For eval_to_dict()."""
         return self.var_stack[-1]
 
+    #
+    # Frame slots
+    #
+
+    def ResolveSlot(self, name):
+        # type: (str) -> int
+        """Return the slot of a local in the current proc or func.
+
+        Returns -2 if it isn't one.  (expr.Var uses -1 for "not resolved yet".)
+        """
+        slots = self.slot_stack[-1]
+        if slots is None or name in _COMPUTED_VARS:
+            return -2
+        return slots.layout.index.get(name, -2)
+
+    def GetSlotCell(self, name, slot):
+        # type: (str, int) -> Optional[Cell]
+        """Like _ResolveNameOnly(name, scope_e.LocalOrGlobal), but only for
+        locals, and without hashing.
+
+        Returns None if the slot doesn't hold 'name' in the current frame, or if
+        the local isn't bound.  The caller should then do a full lookup.
+        """
+        slots = self.slot_stack[-1]
+        if slots is None:
+            return None
+
+        # An expression may be evaluated in a frame other than the one it was
+        # resolved in, e.g. a block passed to a proc
+        names = slots.layout.names
+        if slot >= len(names) or names[slot] != name:
+            return None
+
+        cell = slots.cells[slot]
+        if cell is None:
+            cell = self.var_stack[-1].get(name)
+            if cell is None:
+                return None  # not bound yet, or a global
+            slots.cells[slot] = cell
+
+        if cell.nameref:
+            return None
+        return cell
+
+    def _ClearSlot(self, name_map, name):
+        # type: (Dict[str, Cell], str) -> None
+        """Called when the cell for 'name' is removed from a frame."""
+        for i in xrange(len(self.var_stack) - 1, -1, -1):
+            if self.var_stack[i] is name_map:
+                slots = self.slot_stack[i]
+                if slots is not None:
+                    slot = slots.layout.index.get(name, -1)
+                    if slot != -1:
+                        slots.cells[slot] = None
+                break
+
     #
     # Argv
     #
@@ -1550,6 +1797,8 @@ class Mem(object):
                     frame[yval.name] = cell
                 else:
                     cell.val = val
+                    if cell.exported:
+                        self.exported_dirty = True
 
             elif case(y_lvalue_e.Container):
                 e_die('Container place not implemented', blame_loc)
@@ -1570,6 +1819,8 @@ class Mem(object):
                 e_die("Can't assign to readonly value %r" % lval.name,
                       lval.blame_loc)
             cell.val = val  # Mutate value_t
+            if cell.exported:
+                self.exported_dirty = True
         else:
             cell = Cell(False, False, False, val)
             name_map[lval.name] = cell
@@ -1597,6 +1848,8 @@ class Mem(object):
             # Clear before checking readonly bit.
             # NOTE: Could be cell.flags &= flag_clear_mask
             if flags & ClearExport:
+                if cell.exported:
+                    self.exported_dirty = True
                 cell.exported = False
             if flags & ClearReadOnly:
                 cell.readonly = False
@@ -1629,6 +1882,9 @@ class Mem(object):
                         bool(flags & SetNameref), val)
             name_map[cell_name] = cell
 
+        if cell.exported or flags & ClearExport:
+            self.exported_dirty = True
+
         # Maintain invariant that only strings and undefined cells can be
         # exported.
         assert cell.val is not None, cell
@@ -1716,25 +1972,14 @@ class Mem(object):
 
                     elif case2(value_e.BashArray):
                         cell_val = cast(value.BashArray, UP_cell_val)
-                        strs = cell_val.strs
-
-                        n = len(strs)
-                        index = lval.index
-                        if index < 0:  # a[-1]++ computes this twice; could we avoid it?
-                            index += n
-
-                        if 0 <= index and index < n:
-                            strs[index] = rval.s
-                        else:
-                            # Fill it in with None.  It could look like this:
-                            # ['1', 2, 3, None, None, '4', None]
-                            # Then ${#a[@]} counts the entries that are not None.
-                            #
-                            # TODO: strict_array for Oil arrays won't auto-fill.
-                            n = index - len(strs) + 1
-                            for i in xrange(n):
-                                strs.append(None)
-                            strs[lval.index] = rval.s
+                        # a[-1]++ computes the negative index twice; could we
+                        # avoid it?
+                        #
+                        # TODO: strict_array for Oil arrays won't auto-fill.
+                        if not bash_impl.BashArray_SetItem(
+                                cell_val, lval.index, rval.s):
+                            e_die("Index %d is out of bounds" % lval.index,
+                                  left_loc)
                         return
 
                 # This could be an object, eggex object, etc.  It won't be
@@ -1772,13 +2017,13 @@ class Mem(object):
     def _BindNewArrayWithEntry(self, name_map, lval, val, flags):
         # type: (Dict[str, Cell], sh_lvalue.Indexed, value.Str, int) -> None
         """Fill 'name_map' with a new indexed array entry."""
-        no_str = None  # type: Optional[str]
-        items = [no_str] * lval.index
-        items.append(val.s)
-        new_value = value.BashArray(items)
+        new_value = bash_impl.BashArray_FromList([])
+        if not bash_impl.BashArray_SetItem(new_value, lval.index, val.s):
+            e_die("Index %d is out of bounds" % lval.index, lval.blame_loc)
 
         # arrays can't be exported; can't have BashAssoc flag
         readonly = bool(flags & SetReadOnly)
+        self._ClearSlot(name_map, lval.name)  # may replace an Undef cell
         name_map[lval.name] = Cell(False, readonly, False, new_value)
 
     def InternalSetGlobal(self, name, new_val):
@@ -1795,6 +2040,8 @@ class Mem(object):
         """
         cell = self.var_stack[0][name]
         cell.val = new_val
+        if cell.exported:
+            self.exported_dirty = True
 
     def GetValue(self, name, which_scopes=scope_e.Shopt):
         # type: (str, scope_t) -> value_t
@@ -1839,7 +2086,7 @@ class Mem(object):
 
         if name == 'PIPESTATUS':
             strs2 = [str(i) for i in self.pipe_status[-1]]  # type: List[str]
-            return value.BashArray(strs2)
+            return bash_impl.BashArray_FromList(strs2)
 
         if name == '_pipeline_status':
             items = [value.Int(i) for i in self.pipe_status[-1]]
@@ -1857,7 +2104,7 @@ class Mem(object):
                 elif case(regex_match_e.Yes):
                     m = cast(RegexMatch, top_match)
                     groups = util.RegexGroups(m.s, m.indices)
-            return value.BashArray(groups)
+            return bash_impl.BashArray_FromList(groups)
 
         # Do lookup of system globals before looking at user variables.  Note: we
         # could optimize this at compile-time like $?.  That would break
@@ -1881,7 +2128,7 @@ class Mem(object):
                     elif case(debug_frame_e.Main):
                         strs.append('main')  # also bash behavior
 
-            return value.BashArray(strs)  # TODO: Reuse this object too?
+            return bash_impl.BashArray_FromList(strs)  # TODO: Reuse this object too?
 
         # $BASH_SOURCE and $BASH_LINENO have OFF BY ONE design bugs:
         #
@@ -1913,7 +2160,7 @@ class Mem(object):
                         frame = cast(debug_frame.Main, UP_frame)
                         strs.append(frame.dollar0)
 
-            return value.BashArray(strs)  # TODO: Reuse this object too?
+            return bash_impl.BashArray_FromList(strs)  # TODO: Reuse this object too?
 
         if name == 'BASH_LINENO':
             strs = []
@@ -1932,7 +2179,7 @@ class Mem(object):
                         # Bash does this to line up with 'main'
                         strs.append('0')
 
-            return value.BashArray(strs)  # TODO: Reuse this object too?
+            return bash_impl.BashArray_FromList(strs)  # TODO: Reuse this object too?
 
         if name == 'LINENO':
             assert self.token_for_line is not None
@@ -2011,6 +2258,9 @@ class Mem(object):
                 # Make variables in higher scopes visible.
                 # example: test/spec.sh builtin-vars -r 24 (ble.sh)
                 mylib.dict_erase(name_map, cell_name)
+                self._ClearSlot(name_map, cell_name)
+                if cell.exported:
+                    self.exported_dirty = True
 
                 # alternative that some shells use:
                 #   name_map[cell_name].val = value.Undef
@@ -2030,27 +2280,12 @@ class Mem(object):
                     raise error.Runtime("%r isn't an array" % var_name)
 
                 val = cast(value.BashArray, UP_val)
-                strs = val.strs
-
-                n = len(strs)
-                last_index = n - 1
-                index = lval.index
-                if index < 0:
-                    index += n
-
-                if index == last_index:
-                    # Special case: The array SHORTENS if you unset from the end.  You
-                    # can tell with a+=(3 4)
-                    strs.pop()
-                elif 0 <= index and index < last_index:
-                    strs[index] = None
-                else:
-                    # If it's not found, it's not an error.  In other words, 'unset'
-                    # ensures that a value doesn't exist, regardless of whether it
-                    # existed.  It's idempotent.
-                    # (Ousterhout specifically argues that the strict behavior was a
-                    # mistake for Tcl!)
-                    pass
+                # If it's not found, it's not an error.  In other words, 'unset'
+                # ensures that a value doesn't exist, regardless of whether it
+                # existed.  It's idempotent.
+                # (Ousterhout specifically argues that the strict behavior was a
+                # mistake for Tcl!)
+                bash_impl.BashArray_UnsetItem(val, lval.index)
 
             elif case(sh_lvalue_e.Keyed):  # unset 'A["K"]'
                 lval = cast(sh_lvalue.Keyed, UP_lval)
@@ -2092,6 +2327,8 @@ class Mem(object):
         cell, name_map = self._ResolveNameOnly(name, self.ScopesForReading())
         if cell:
             if flag & ClearExport:
+                if cell.exported:
+                    self.exported_dirty = True
                 cell.exported = False
             if flag & ClearNameref:
                 cell.nameref = False
@@ -2101,11 +2338,17 @@ class Mem(object):
 
     def GetExported(self):
         # type: () -> Dict[str, str]
-        """Get all the variables that are marked exported."""
-        # TODO: This is run on every SimpleCommand.  Should we have a dirty flag?
-        # We have to notice these things:
+        """Get all the variables that are marked exported.
+
+        The result is shared, so callers must not mutate it.
+        """
+        # This is run on every external command, so it's cached.  We notice
+        # these things with self.exported_dirty:
         # - If an exported variable is changed.
-        # - If the set of exported variables changes.
+        # - If the set of exported variables changes, including when a frame
+        #   with exported temp bindings is popped.
+        if not self.exported_dirty:
+            return self.exported_cache
 
         exported = {}  # type: Dict[str, str]
         # Search from globals up.  Names higher on the stack will overwrite names
@@ -2117,6 +2360,9 @@ class Mem(object):
                 if cell.exported and cell.val.tag() == value_e.Str:
                     val = cast(value.Str, cell.val)
                     exported[name] = val.s
+
+        self.exported_cache = exported
+        self.exported_dirty = False
         return exported
 
     def VarNames(self):
@@ -2236,7 +2482,8 @@ def BuiltinSetArray(mem, name, a):
     Used by compadjust, read -a, etc.
     """
     assert isinstance(a, list)
-    BuiltinSetValue(mem, location.LName(name), value.BashArray(a))
+    BuiltinSetValue(mem, location.LName(name),
+                    bash_impl.BashArray_FromList(a))
 
 
 def SetGlobalString(mem, name, s):
@@ -2251,7 +2498,8 @@ def SetGlobalArray(mem, name, a):
     # type: (Mem, str, List[str]) -> None
     """Used by completion, shell initialization, etc."""
     assert isinstance(a, list)
-    mem.SetNamed(location.LName(name), value.BashArray(a), scope_e.GlobalOnly)
+    mem.SetNamed(location.LName(name), bash_impl.BashArray_FromList(a),
+                 scope_e.GlobalOnly)
 
 
 def ExportGlobalString(mem, name, s):
@@ -1,14 +1,18 @@
 #!/usr/bin/env python2
 """state_test.py: Tests for state.py."""
 
-import unittest
 import os.path
+import shutil
+import tempfile
+import unittest
 
 from _devbuild.gen.id_kind_asdl import Id
 from _devbuild.gen.runtime_asdl import scope_e
 from _devbuild.gen.syntax_asdl import source, SourceLine
-from _devbuild.gen.value_asdl import (value, value_e, sh_lvalue)
+from _devbuild.gen.value_asdl import (value, value_e, sh_lvalue,
+                                      FrameLayout)
 from asdl import runtime
+from core import bash_impl
 from core import error
 from core import test_lib
 from core import state  # module under test
@@ -37,7 +41,7 @@ class MemTest(unittest.TestCase):
         mem = _InitMem()
 
         tok_a = lexer.DummyToken(Id.Lit_Chars, 'a')
-        tok_a.line = SourceLine(1, 'a b', source.Interactive)
+        tok_a.line = SourceLine(1, 'a b', source.Interactive, -1)
 
         mem.PushCall('my-func', tok_a, ['a', 'b'])
         print(mem.GetValue('HOME'))
@@ -69,6 +73,89 @@ class MemTest(unittest.TestCase):
         else:
             self.assertEqual(search_path.LookupOne('env'), '/usr/bin/env')
 
+    def testSearchPathIndex(self):
+        mem = _InitMem()
+        search_path = state.SearchPath(mem)
+
+        d = tempfile.mkdtemp()
+        try:
+            exe = os.path.join(d, 'my-cmd')
+            with open(exe, 'w') as f:
+                f.write('#!/bin/sh\n')
+            os.chmod(exe, 0o755)
+            with open(os.path.join(d, 'my-data'), 'w') as f:
+                f.write('')
+            # An old mtime, so the listing can be kept
+            os.utime(d, (1000, 1000))
+
+            mem.SetValue(location.LName('PATH'), value.Str(d),
+                         scope_e.GlobalOnly)
+
+            self.assertEqual(exe, search_path.LookupOne('my-cmd'))
+            self.assertEqual(None, search_path.LookupOne('my-data'))
+            self.assertEqual([os.path.join(d, 'my-data')],
+                             search_path.LookupReflect('my-data', False))
+            self.assertEqual(['my-cmd'], search_path.Executables())
+            self.assertEqual([d], list(search_path.index))
+
+            # A new file changes the directory's mtime
+            exe2 = os.path.join(d, 'my-cmd2')
+            with open(exe2, 'w') as f:
+                f.write('#!/bin/sh\n')
+            os.chmod(exe2, 0o755)
+            os.utime(d, (2000, 2000))
+            self.assertEqual(exe2, search_path.CachedLookup('my-cmd2'))
+            self.assertEqual([exe2], search_path.CachedCommands())
+
+            # A dir modified in this second isn't listed for a lookup, but it
+            # is for completion
+            os.utime(d, None)
+            self.assertEqual(exe, search_path.LookupOne('my-cmd'))
+            self.assertEqual({}, search_path.index)
+            self.assertEqual(['my-cmd', 'my-cmd2'],
+                             sorted(search_path.Executables()))
+            self.assertEqual({}, search_path.index)
+
+            # Changing $PATH drops the index and the hashed commands
+            mem.SetValue(location.LName('PATH'), value.Str('/nonexistent'),
+                         scope_e.GlobalOnly)
+            self.assertEqual(None, search_path.CachedLookup('my-cmd'))
+            self.assertEqual([], search_path.CachedCommands())
+            self.assertEqual({}, search_path.index)
+        finally:
+            shutil.rmtree(d)
+
+    def testSearchPathIndexSymlink(self):
+        mem = _InitMem()
+        search_path = state.SearchPath(mem)
+
+        d = tempfile.mkdtemp()
+        try:
+            for name in ['v1', 'v2']:
+                os.mkdir(os.path.join(d, name))
+                exe = os.path.join(d, name, 'tool-' + name)
+                with open(exe, 'w') as f:
+                    f.write('#!/bin/sh\n')
+                os.chmod(exe, 0o755)
+                os.utime(os.path.join(d, name), (1000, 1000))
+            cur = os.path.join(d, 'cur')
+            os.symlink('v1', cur)
+
+            mem.SetValue(location.LName('PATH'), value.Str(cur),
+                         scope_e.GlobalOnly)
+            self.assertEqual(os.path.join(cur, 'tool-v1'),
+                             search_path.LookupOne('tool-v1'))
+            self.assertEqual([cur], list(search_path.index))
+
+            # The symlink now points to a dir with the same mtime
+            os.remove(cur)
+            os.symlink('v2', cur)
+            self.assertEqual(os.path.join(cur, 'tool-v2'),
+                             search_path.LookupOne('tool-v2'))
+            self.assertEqual(None, search_path.LookupOne('tool-v1'))
+        finally:
+            shutil.rmtree(d)
+
     def testPushTemp(self):
         mem = _InitMem()
 
@@ -98,10 +185,10 @@ class MemTest(unittest.TestCase):
         print(mem)
 
         tok_one = lexer.DummyToken(Id.Lit_Chars, 'ONE')
-        tok_one.line = SourceLine(1, 'ONE', source.Interactive)
+        tok_one.line = SourceLine(1, 'ONE', source.Interactive, -1)
 
         tok_two = lexer.DummyToken(Id.Lit_Chars, 'TWO')
-        tok_two.line = SourceLine(1, 'TWO', source.Interactive)
+        tok_two.line = SourceLine(1, 'TWO', source.Interactive, -1)
 
         mem.PushCall('my-func', tok_one, ['ONE'])
         self.assertEqual(2, len(mem.var_stack))  # internal details
@@ -174,7 +261,8 @@ class MemTest(unittest.TestCase):
         # COMPREPLY=(1 2 3)
         # invariant to enforce: arrays can't be exported
         mem.SetValue(location.LName('COMPREPLY'),
-                     value.BashArray(['1', '2', '3']), scope_e.GlobalOnly)
+                     bash_impl.BashArray_FromList(['1', '2', '3']),
+                     scope_e.GlobalOnly)
         self.assertEqual(['1', '2', '3'],
                          mem.var_stack[0]['COMPREPLY'].val.strs)
 
@@ -234,7 +322,8 @@ class MemTest(unittest.TestCase):
         # a[1]=(x y z)  # illegal but doesn't parse anyway
         if 0:
             try:
-                mem.SetValue(lhs, value.BashArray(['x', 'y', 'z']),
+                mem.SetValue(lhs,
+                             bash_impl.BashArray_FromList(['x', 'y', 'z']),
                              scope_e.Dynamic)
             except error.FatalRuntime as e:
                 pass
@@ -288,6 +377,63 @@ class MemTest(unittest.TestCase):
         e = mem.GetExported()
         self.assertEqual('u', e['U'])
 
+    def testGetExportedCache(self):
+        mem = _InitMem()
+
+        # export U=u
+        mem.SetValue(location.LName('U'),
+                     value.Str('u'),
+                     scope_e.Dynamic,
+                     flags=state.SetExport)
+        e = mem.GetExported()
+        self.assertEqual('u', e['U'])
+
+        # Setting an unexported variable doesn't invalidate it
+        mem.SetValue(location.LName('x'), value.Str('x'), scope_e.Dynamic)
+        self.assertIs(e, mem.GetExported())
+
+        # U=v
+        mem.SetValue(location.LName('U'), value.Str('v'), scope_e.Dynamic)
+        e = mem.GetExported()
+        self.assertEqual('v', e['U'])
+
+        # FOO=bar in temp frame
+        mem.PushTemp()
+        mem.SetValue(location.LName('FOO'),
+                     value.Str('bar'),
+                     scope_e.LocalOnly,
+                     flags=state.SetExport)
+        self.assertEqual('bar', mem.GetExported()['FOO'])
+        mem.PopTemp()
+        self.assertNotIn('FOO', mem.GetExported())
+
+        # export -n U
+        mem.ClearFlag('U', state.ClearExport)
+        self.assertNotIn('U', mem.GetExported())
+
+        # export U; unset U
+        mem.SetValue(location.LName('U'),
+                     None,
+                     scope_e.Dynamic,
+                     flags=state.SetExport)
+        self.assertEqual('v', mem.GetExported()['U'])
+        mem.Unset(location.LName('U'), scope_e.Dynamic)
+        self.assertNotIn('U', mem.GetExported())
+
+        # export R=r; readonly R; declare +x R=s fails, but R isn't exported
+        mem.SetValue(location.LName('R'),
+                     value.Str('r'),
+                     scope_e.Dynamic,
+                     flags=state.SetExport | state.SetReadOnly)
+        self.assertEqual('r', mem.GetExported()['R'])
+        self.assertRaises(error.FatalRuntime,
+                          mem.SetValue,
+                          location.LName('R'),
+                          value.Str('s'),
+                          scope_e.Dynamic,
+                          flags=state.ClearExport)
+        self.assertNotIn('R', mem.GetExported())
+
     def testUnset(self):
         mem = _InitMem()
         # unset a
@@ -303,13 +449,13 @@ class MemTest(unittest.TestCase):
         src = source.Interactive
 
         tok_a = lexer.DummyToken(Id.Lit_Chars, 'a')
-        tok_a.line = SourceLine(1, 'a b', src)
+        tok_a.line = SourceLine(1, 'a b', src, -1)
 
         mem.PushCall('my-func', tok_a, ['a', 'b'])
         self.assertEqual(['a', 'b'], mem.GetArgv())
 
         tok_x = lexer.DummyToken(Id.Lit_Chars, 'x')
-        tok_x.line = SourceLine(2, 'x y', src)
+        tok_x.line = SourceLine(2, 'x y', src, -1)
 
         mem.PushCall('my-func', tok_x, ['x', 'y'])
         self.assertEqual(['x', 'y'], mem.GetArgv())
@@ -329,6 +475,49 @@ class MemTest(unittest.TestCase):
         mem.PopCall(True)
         self.assertEqual(['a', 'b'], mem.GetArgv())
 
+    def testFrameSlots(self):
+        mem = _InitMem()
+        tok_a = lexer.DummyToken(Id.Lit_Chars, 'a')
+        tok_a.line = SourceLine(1, 'a b', source.Interactive, -1)
+
+        state.SetGlobalString(mem, 'g', 'global')
+
+        layout = FrameLayout(['x', 'y', '_status'], {
+            'x': 0,
+            'y': 1,
+            '_status': 2
+        })
+        mem.PushCall('my-func', tok_a, None, layout)
+
+        self.assertEqual(0, mem.ResolveSlot('x'))
+        self.assertEqual(1, mem.ResolveSlot('y'))
+        self.assertEqual(-2, mem.ResolveSlot('g'))
+        self.assertEqual(-2, mem.ResolveSlot('_status'))  # computed
+
+        # Not bound yet
+        self.assertEqual(None, mem.GetSlotCell('x', 0))
+
+        mem.SetLocalName(location.LName('x'), value.Str('local'))
+        cell = mem.GetSlotCell('x', 0)
+        self.assertEqual('local', cell.val.s)
+
+        # Resolved in a different frame
+        self.assertEqual(None, mem.GetSlotCell('z', 0))
+        self.assertEqual(None, mem.GetSlotCell('x', 5))
+
+        # Temp frames don't have slots
+        mem.PushTemp()
+        self.assertEqual(-2, mem.ResolveSlot('x'))
+        self.assertEqual(None, mem.GetSlotCell('x', 0))
+        mem.PopTemp()
+
+        # Unset clears the slot
+        mem.Unset(location.LName('x'), scope_e.LocalOnly)
+        self.assertEqual(None, mem.GetSlotCell('x', 0))
+
+        mem.PopCall(False)
+        self.assertEqual(-2, mem.ResolveSlot('x'))
+
     def testArgv2(self):
         mem = state.Mem('', ['x', 'y'], None, [])
 
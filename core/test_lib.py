@@ -132,7 +132,7 @@ def MakeArena(source_name):
 def InitLineLexer(s, arena):
     line_lexer = lexer.LineLexer(arena)
     src = source.Interactive
-    line_lexer.Reset(SourceLine(1, s, src), 0)
+    line_lexer.Reset(SourceLine(1, s, src, -1), 0)
     return line_lexer
 
 
@@ -226,8 +226,8 @@ def InitCommandEvaluator(parse_ctx=None,
         builtin_i.compopt: completion_osh.CompOpt(compopt_state, errfmt),
         builtin_i.compadjust: completion_osh.CompAdjust(mem),
 
-        builtin_i.alias: pure_osh.Alias(aliases, errfmt),
-        builtin_i.unalias: pure_osh.UnAlias(aliases, errfmt),
+        builtin_i.alias: pure_osh.Alias(aliases, errfmt, None),
+        builtin_i.unalias: pure_osh.UnAlias(aliases, errfmt, None),
     }
 
     debug_f = util.DebugFile(sys.stderr)
@@ -281,8 +281,8 @@ def InitCommandEvaluator(parse_ctx=None,
     except ImportError:
         TOPICS = None  # minimal dev build
     spec_builder = completion_osh.SpecBuilder(cmd_ev, parse_ctx, word_ev,
-                                              splitter, comp_lookup, TOPICS,
-                                              errfmt)
+                                              splitter, comp_lookup,
+                                              search_path, TOPICS, errfmt)
 
     # Add some builtins that depend on the executor!
     complete_builtin = completion_osh.Complete(spec_builder, comp_lookup)
@@ -16,7 +16,7 @@ from mycpp import mylib
 
 import libc
 
-from typing import List
+from typing import List, Dict, Optional
 
 
 def RegexGroups(s, indices):
@@ -61,6 +61,126 @@ class HistoryError(Exception):
         return 'history: %s' % self.msg
 
 
+class Lru(object):
+    """Bounds a cache with str keys, and counts hits, misses, and evictions.
+
+    mycpp doesn't have generic classes, so each cache keeps its values in its
+    own typed dict, and asks this object which key to evict:
+
+        if lru.Lookup(key):
+            val = d[key]
+        else:
+            val = Compute(key)
+            evicted = lru.Insert(key)
+            if evicted is not None:
+                mylib.dict_erase(d, evicted)
+            d[key] = val
+
+    If a cached value turns out to be stale, like a parse of a file that has
+    since changed, call CountStale() so the lookup counts as a miss.
+
+    The counts are shown by 'pp cache-stats'.
+    """
+
+    def __init__(self, name, max_size):
+        # type: (str, int) -> None
+        self.name = name
+        self.max_size = max_size
+
+        # The keys are in a doubly-linked list of slots, from least to most
+        # recently used, so touching and evicting a key are O(1).  Slot 0 is
+        # the head of the circular list.
+        self.slots = {}  # type: Dict[str, int]
+        self.keys = ['']  # type: List[str]
+        self.prev = [0]  # type: List[int]
+        self.next = [0]  # type: List[int]
+        self.free = []  # type: List[int]
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _Unlink(self, i):
+        # type: (int) -> None
+        p = self.prev[i]
+        n = self.next[i]
+        self.next[p] = n
+        self.prev[n] = p
+
+    def _Append(self, i):
+        # type: (int) -> None
+        """Make slot i the most recently used."""
+        last = self.prev[0]
+        self.next[last] = i
+        self.prev[i] = last
+        self.next[i] = 0
+        self.prev[0] = i
+
+    def Lookup(self, key):
+        # type: (str) -> bool
+        """Returns whether key is cached, and marks it as recently used."""
+        i = self.slots.get(key, -1)
+        if i != -1:
+            self._Unlink(i)
+            self._Append(i)
+            self.hits += 1
+            return True
+
+        self.misses += 1
+        return False
+
+    def CountStale(self):
+        # type: () -> None
+        """Count the last hit as a miss, because its value was out of date."""
+        self.hits -= 1
+        self.misses += 1
+
+    def Insert(self, key):
+        # type: (str) -> Optional[str]
+        """Add a key, returning the key the caller should evict, or None."""
+        i = self.slots.get(key, -1)
+        if i != -1:
+            self._Unlink(i)
+            self._Append(i)
+            return None
+
+        evicted = None  # type: Optional[str]
+        if len(self.slots) >= self.max_size:
+            # Reuse the slot of the least recently used key
+            i = self.next[0]
+            evicted = self.keys[i]
+            self._Unlink(i)
+            mylib.dict_erase(self.slots, evicted)
+            self.evictions += 1
+        elif len(self.free):
+            i = self.free.pop()
+        else:
+            i = len(self.keys)
+            self.keys.append('')
+            self.prev.append(0)
+            self.next.append(0)
+
+        self.keys[i] = key
+        self.slots[key] = i
+        self._Append(i)
+        return evicted
+
+    def Remove(self, key):
+        # type: (str) -> None
+        """Forget a key whose value is no longer valid."""
+        i = self.slots.get(key, -1)
+        if i == -1:
+            return
+        self._Unlink(i)
+        mylib.dict_erase(self.slots, key)
+        self.keys[i] = ''
+        self.free.append(i)
+
+    def Size(self):
+        # type: () -> int
+        return len(self.slots)
+
+
 class _DebugFile(object):
 
     def __init__(self):
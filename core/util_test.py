@@ -53,6 +53,55 @@ class UtilTest(unittest.TestCase):
             #print('actual %r' % actual)
             self.assertEqual(expected, actual)
 
+    def testLru(self):
+        lru = util.Lru('test', 2)
+
+        self.assertEqual(False, lru.Lookup('a'))
+        self.assertEqual(None, lru.Insert('a'))
+        self.assertEqual(None, lru.Insert('b'))
+        self.assertEqual(True, lru.Lookup('a'))
+
+        # b is the least recently used
+        self.assertEqual('b', lru.Insert('c'))
+        self.assertEqual(False, lru.Lookup('b'))
+        self.assertEqual(True, lru.Lookup('c'))
+        self.assertEqual(2, lru.Size())
+
+        # Inserting an existing key doesn't evict
+        self.assertEqual(None, lru.Insert('c'))
+
+        self.assertEqual(2, lru.hits)
+        self.assertEqual(2, lru.misses)
+        self.assertEqual(1, lru.evictions)
+
+        self.assertEqual(True, lru.Lookup('c'))
+        lru.CountStale()
+        self.assertEqual(2, lru.hits)
+        self.assertEqual(3, lru.misses)
+
+        # A removed key's slot is reused
+        lru.Remove('a')
+        lru.Remove('a')
+        self.assertEqual(1, lru.Size())
+        self.assertEqual(None, lru.Insert('d'))
+        self.assertEqual('c', lru.Insert('e'))
+        self.assertEqual(3, len(lru.keys))
+
+        # Compare with a list in recently used order
+        lru = util.Lru('test', 3)
+        expected = []
+        for key in 'abacdbeabfca':
+            if lru.Lookup(key):
+                expected.remove(key)
+            else:
+                evicted = lru.Insert(key)
+                if len(expected) == 3:
+                    self.assertEqual(expected.pop(0), evicted)
+                else:
+                    self.assertEqual(None, evicted)
+            expected.append(key)
+        self.assertEqual(3, lru.Size())
+
 
 if __name__ == '__main__':
     unittest.main()
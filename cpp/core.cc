@@ -4,9 +4,12 @@
 
 #include <ctype.h>  // ispunct()
 #include <errno.h>
+#include <limits.h>  // INT_MAX
 #include <math.h>  // fmod()
 #include <pwd.h>   // passwd
 #include <signal.h>
+#include <stdlib.h>  // mkstemp()
+#include <sys/mman.h>      // memfd_create()
 #include <sys/resource.h>  // getrusage
 #include <sys/select.h>    // select(), FD_ISSET, FD_SET, FD_ZERO
 #include <sys/stat.h>      // stat
@@ -76,6 +79,128 @@ Tuple2<int, int> ReadByte(int fd) {
   }
 }
 
+// Read a block, and then lseek() back to the byte after the delimiter, so the
+// file offset is the same as if we called ReadByte() repeatedly.
+Tuple2<int, int> ReadUntilDelim(int fd, int delim_byte, int max_bytes,
+                                List<BigStr*>* chunks) {
+  if (::lseek(fd, 0, SEEK_CUR) < 0) {  // e.g. ESPIPE
+    return Tuple2<int, int>(-1, errno);
+  }
+
+  int block_size = 128;  // lines are usually short, and we give back the rest
+  while (true) {
+    int n = block_size;
+    if (max_bytes >= 0) {
+      if (max_bytes == 0) {
+        return Tuple2<int, int>(0, 0);
+      }
+      if (max_bytes < n) {
+        n = max_bytes;
+      }
+    }
+
+    BigStr* s = OverAllocatedStr(n);
+    int length = ::read(fd, s->data(), n);
+    if (length < 0) {
+      if (errno == EINTR && gSignalSafe->PollSigInt()) {
+        throw Alloc<KeyboardInterrupt>();
+      }
+      return Tuple2<int, int>(-1, errno);
+    }
+    if (length == 0) {
+      return Tuple2<int, int>(EOF_SENTINEL, 0);
+    }
+
+    char* p = static_cast<char*>(memchr(s->data(), delim_byte, length));
+    if (p != nullptr) {
+      int i = p - s->data();
+      if (i != 0) {
+        s->MaybeShrink(i);
+        chunks->append(s);
+      }
+      int extra = length - i - 1;
+      if (extra != 0 && ::lseek(fd, -extra, SEEK_CUR) < 0) {
+        return Tuple2<int, int>(-1, errno);
+      }
+      return Tuple2<int, int>(0, 0);
+    }
+
+    s->MaybeShrink(length);
+    chunks->append(s);
+    if (max_bytes >= 0) {
+      max_bytes -= length;
+    }
+    if (block_size < 4096) {
+      block_size *= 2;
+    }
+  }
+}
+
+// MaybeShrink() doesn't free memory, so copy the string if much of the buffer
+// is unused.  Otherwise every small $(echo hi) would hold on to READ_ALL_MIN
+// bytes.
+static BigStr* FitReadAll(BigStr* buf, int capacity, int length) {
+  if (capacity - length > length / 8) {
+    return StrFromC(buf->data_, length);
+  }
+  buf->MaybeShrink(length);
+  return buf;
+}
+
+// A string's length is an int, so leave room for the header
+const int kReadAllLimit = INT_MAX - 1024;
+
+Tuple2<BigStr*, int> ReadAll(int fd, bool strip_newlines) {
+  int capacity = READ_ALL_MIN;
+  BigStr* buf = OverAllocatedStr(capacity);
+  int length = 0;
+
+  while (true) {
+    if (length == capacity) {
+      // Double the buffer, so the total copying is linear in the size
+      if (capacity == kReadAllLimit) {
+        return Tuple2<BigStr*, int>(FitReadAll(buf, capacity, length), EFBIG);
+      }
+      if (capacity > kReadAllLimit / 2) {
+        capacity = kReadAllLimit;
+      } else {
+        capacity *= 2;
+      }
+      BigStr* bigger = OverAllocatedStr(capacity);
+      memcpy(bigger->data_, buf->data_, length);
+      buf = bigger;
+    }
+
+    int num_requested = capacity - length;
+    if (num_requested > READ_ALL_MAX) {
+      num_requested = READ_ALL_MAX;
+    }
+    int n = ::read(fd, buf->data_ + length, num_requested);
+    if (n < 0) {
+      if (errno == EINTR) {
+        if (gSignalSafe->PollSigInt()) {
+          throw Alloc<KeyboardInterrupt>();
+        }
+        continue;  // retry
+      }
+      int err_num = errno;
+      return Tuple2<BigStr*, int>(FitReadAll(buf, capacity, length), err_num);
+    }
+    if (n == 0) {
+      break;  // EOF
+    }
+    length += n;
+  }
+
+  // Trim in place, rather than copying with rstrip()
+  if (strip_newlines) {
+    while (length > 0 && buf->data_[length - 1] == '\n') {
+      length--;
+    }
+  }
+  return Tuple2<BigStr*, int>(FitReadAll(buf, capacity, length), 0);
+}
+
 // For read --line
 // Note: this has the "FD 0 buffering issue".  See spec/ysh-place.test.sh, and
 // demo/compare-strace.sh.
@@ -270,13 +395,76 @@ void RegisterSignalInterest(int sig_num) {
   assert(sigaction(sig_num, &act, nullptr) == 0);
 }
 
-Tuple2<BigStr*, int>* MakeDirCacheKey(BigStr* path) {
+Tuple2<BigStr*, int> MakeDirCacheKey(BigStr* path) {
   struct stat st;
   if (::stat(path->data(), &st) == -1) {
     throw Alloc<OSError>(errno);
   }
 
-  return Alloc<Tuple2<BigStr*, int>>(path, st.st_mtime);
+  char buf[128];
+  snprintf(buf, sizeof(buf), "%llu:%llu:%lld.%09ld:%lld.%09ld",
+           static_cast<unsigned long long>(st.st_dev),
+           static_cast<unsigned long long>(st.st_ino),
+           static_cast<long long>(st.st_mtim.tv_sec), st.st_mtim.tv_nsec,
+           static_cast<long long>(st.st_ctim.tv_sec), st.st_ctim.tv_nsec);
+  BigStr* key = StrFromC(buf);
+  return Tuple2<BigStr*, int>(key, st.st_mtime);
+}
+
+BigStr* MakeFileCacheKey(BigStr* path) {
+  struct stat st;
+  if (::stat(path->data(), &st) == -1) {
+    throw Alloc<OSError>(errno);
+  }
+
+  char buf[128];
+  snprintf(buf, sizeof(buf), "%llu:%llu:%lld.%09ld:%lld",
+           static_cast<unsigned long long>(st.st_dev),
+           static_cast<unsigned long long>(st.st_ino),
+           static_cast<long long>(st.st_mtim.tv_sec), st.st_mtim.tv_nsec,
+           static_cast<long long>(st.st_size));
+  return StrFromC(buf);
+}
+
+int WriteTempFile(BigStr* contents) {
+#ifdef MFD_CLOEXEC
+  // An anonymous file in memory, on Linux
+  int fd = ::memfd_create("osh-heredoc", MFD_CLOEXEC);
+#else
+  int fd = -1;
+#endif
+  if (fd < 0) {
+    const char* tmp_dir = getenv("TMPDIR");
+    if (tmp_dir == nullptr || tmp_dir[0] == '\0') {
+      tmp_dir = "/tmp";
+    }
+    char path[PATH_MAX];
+    snprintf(path, PATH_MAX, "%s/osh-heredoc-XXXXXX", tmp_dir);
+    fd = ::mkstemp(path);
+    if (fd < 0) {
+      return -1;
+    }
+    ::unlink(path);
+  }
+
+  int n = len(contents);
+  int pos = 0;
+  while (pos < n) {
+    ssize_t num_written = ::write(fd, contents->data_ + pos, n - pos);
+    if (num_written < 0) {
+      if (errno == EINTR) {
+        continue;
+      }
+      ::close(fd);
+      return -1;
+    }
+    pos += num_written;
+  }
+  if (::lseek(fd, 0, SEEK_SET) < 0) {
+    ::close(fd);
+    return -1;
+  }
+  return fd;
 }
 
 Tuple2<int, void*> PushTermAttrs(int fd, int mask) {
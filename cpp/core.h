@@ -34,11 +34,16 @@ const int TERM_ICANON = ICANON;
 const int TERM_ECHO = ECHO;
 const int EOF_SENTINEL = 256;
 const int NEWLINE_CH = 10;
+const int READ_ALL_MIN = 4096;
+const int READ_ALL_MAX = 1 << 20;
 const int UNTRAPPED_SIGWINCH = -1;
 
 Tuple2<int, int> WaitPid(int waitpid_options);
 Tuple2<int, int> Read(int fd, int n, List<BigStr*>* chunks);
 Tuple2<int, int> ReadByte(int fd);
+Tuple2<int, int> ReadUntilDelim(int fd, int delim_byte, int max_bytes,
+                                List<BigStr*>* chunks);
+Tuple2<BigStr*, int> ReadAll(int fd, bool strip_newlines);
 BigStr* ReadLineBuffered();
 Dict<BigStr*, BigStr*>* Environ();
 int Chdir(BigStr* dest_dir);
@@ -236,7 +241,11 @@ void Sigaction(int sig_num, void (*handler)(int));
 
 void RegisterSignalInterest(int sig_num);
 
-Tuple2<BigStr*, int>* MakeDirCacheKey(BigStr* path);
+Tuple2<BigStr*, int> MakeDirCacheKey(BigStr* path);
+
+BigStr* MakeFileCacheKey(BigStr* path);
+
+int WriteTempFile(BigStr* contents);
 
 }  // namespace pyos
 
@@ -167,6 +167,108 @@ TEST pyos_read_test() {
   PASS();
 }
 
+TEST pyos_read_until_delim_test() {
+  const char* tmp_name = "pyos_ReadUntilDelim";
+  int fd = ::open(tmp_name, O_CREAT | O_TRUNC | O_RDWR, 0644);
+  ASSERT(fd > 0);
+  write(fd, "one\ntwo three\nfour", 18);
+  close(fd);
+
+  fd = ::open(tmp_name, O_RDONLY);
+  ASSERT(fd > 0);
+
+  List<BigStr*>* chunks = NewList<BigStr*>();
+  Tuple2<int, int> tup = pyos::ReadUntilDelim(fd, '\n', -1, chunks);
+  ASSERT_EQ_FMT(0, tup.at0(), "%d");
+  ASSERT_EQ_FMT(0, tup.at1(), "%d");  // error code
+  ASSERT(str_equals(StrFromC("one"), chunks->at(0)));
+
+  // Bytes after the delimiter were given back
+  ASSERT_EQ_FMT(4, static_cast<int>(::lseek(fd, 0, SEEK_CUR)), "%d");
+
+  // Stop after max_bytes, and don't consume the delimiter
+  chunks = NewList<BigStr*>();
+  tup = pyos::ReadUntilDelim(fd, ' ', 3, chunks);
+  ASSERT_EQ_FMT(0, tup.at0(), "%d");
+  ASSERT(str_equals(StrFromC("two"), chunks->at(0)));
+  ASSERT_EQ_FMT(7, static_cast<int>(::lseek(fd, 0, SEEK_CUR)), "%d");
+
+  chunks = NewList<BigStr*>();
+  tup = pyos::ReadUntilDelim(fd, ';', -1, chunks);
+  ASSERT_EQ_FMT(pyos::EOF_SENTINEL, tup.at0(), "%d");
+  ASSERT(str_equals(StrFromC(" three\nfour"), chunks->at(0)));
+
+  close(fd);
+  unlink(tmp_name);
+
+  // Pipes aren't seekable, and nothing is read
+  int fds[2];
+  ASSERT(pipe(fds) == 0);
+  write(fds[1], "x\n", 2);
+
+  chunks = NewList<BigStr*>();
+  tup = pyos::ReadUntilDelim(fds[0], '\n', -1, chunks);
+  ASSERT_EQ_FMT(-1, tup.at0(), "%d");
+  ASSERT_EQ_FMT(ESPIPE, tup.at1(), "%d");
+  ASSERT_EQ_FMT(0, len(chunks), "%d");
+
+  close(fds[0]);
+  close(fds[1]);
+
+  PASS();
+}
+
+TEST pyos_read_all_test() {
+  int fds[2];
+  ASSERT(pipe(fds) == 0);
+  write(fds[1], "one\ntwo\n\n", 9);
+  close(fds[1]);
+
+  Tuple2<BigStr*, int> tup = pyos::ReadAll(fds[0], true);
+  ASSERT_EQ_FMT(0, tup.at1(), "%d");  // error code
+  ASSERT(str_equals(StrFromC("one\ntwo"), tup.at0()));
+  close(fds[0]);
+
+  // Bigger than several blocks, and not stripped
+  const char* tmp_name = "pyos_ReadAll";
+  int fd = ::open(tmp_name, O_CREAT | O_TRUNC | O_RDWR, 0644);
+  ASSERT(fd > 0);
+  int n = pyos::READ_ALL_MIN * 5 + 1;
+  for (int i = 0; i < n - 1; ++i) {
+    write(fd, "x", 1);
+  }
+  write(fd, "\n", 1);
+  lseek(fd, 0, SEEK_SET);
+
+  tup = pyos::ReadAll(fd, false);
+  ASSERT_EQ_FMT(0, tup.at1(), "%d");
+  ASSERT_EQ_FMT(n, len(tup.at0()), "%d");
+  ASSERT_EQ('\n', tup.at0()->data_[n - 1]);
+  close(fd);
+  unlink(tmp_name);
+
+  // Errors are returned
+  tup = pyos::ReadAll(-1, true);
+  ASSERT_EQ_FMT(EBADF, tup.at1(), "%d");
+  ASSERT_EQ_FMT(0, len(tup.at0()), "%d");
+
+  PASS();
+}
+
+TEST pyos_write_temp_file_test() {
+  BigStr* contents = str_repeat(StrFromC("x"), 10000);
+  int fd = pyos::WriteTempFile(contents);
+  ASSERT(fd > 0);
+
+  // It's open at the start
+  Tuple2<BigStr*, int> tup = pyos::ReadAll(fd, false);
+  ASSERT_EQ_FMT(0, tup.at1(), "%d");  // error code
+  ASSERT(str_equals(contents, tup.at0()));
+  close(fd);
+
+  PASS();
+}
+
 TEST pyos_test() {
   Tuple3<double, double, double> t = pyos::Time();
   ASSERT(t.at0() > 0.0);
@@ -346,9 +448,16 @@ TEST dir_cache_key_test() {
   struct stat st;
   ASSERT(::stat("/", &st) == 0);
 
-  Tuple2<BigStr*, int>* key = pyos::MakeDirCacheKey(StrFromC("/"));
-  ASSERT(str_equals(key->at0(), StrFromC("/")));
-  ASSERT(key->at1() == st.st_mtime);
+  Tuple2<BigStr*, int> key = pyos::MakeDirCacheKey(StrFromC("/"));
+  ASSERT(key.at1() == st.st_mtime);
+
+  // The same dir has the same key
+  Tuple2<BigStr*, int> key2 = pyos::MakeDirCacheKey(StrFromC("/."));
+  ASSERT(str_equals(key.at0(), key2.at0()));
+
+  // Another dir has a different key, even with the same mtime
+  Tuple2<BigStr*, int> key3 = pyos::MakeDirCacheKey(StrFromC("/tmp"));
+  ASSERT(!str_equals(key.at0(), key3.at0()));
 
   int ec = -1;
   try {
@@ -361,6 +470,35 @@ TEST dir_cache_key_test() {
   PASS();
 }
 
+TEST file_cache_key_test() {
+  BigStr* key = pyos::MakeFileCacheKey(StrFromC("/etc/passwd"));
+  BigStr* key2 = pyos::MakeFileCacheKey(StrFromC("/etc/../etc/passwd"));
+  ASSERT(str_equals(key, key2));
+
+  // The size isn't truncated to an int
+  char path[] = "/tmp/file_cache_key_XXXXXX";
+  int fd = ::mkstemp(path);
+  ASSERT(fd != -1);
+  ASSERT(::ftruncate(fd, 5000000000LL) == 0);
+  ::close(fd);
+
+  BigStr* big = pyos::MakeFileCacheKey(StrFromC(path));
+  ::unlink(path);
+  log("big = %s", big->data());
+  ASSERT(str_equals(StrFromC(":5000000000"),
+                    big->slice(len(big) - 11)));
+
+  int ec = -1;
+  try {
+    pyos::MakeFileCacheKey(StrFromC("nonexistent_ZZ"));
+  } catch (IOError_OSError* e) {
+    ec = e->errno_;
+  }
+  ASSERT(ec == ENOENT);
+
+  PASS();
+}
+
 // Test the theory that LeakSanitizer tests for reachability from global
 // variables.
 struct Node {
@@ -411,6 +549,9 @@ int main(int argc, char** argv) {
   RUN_TEST(uname_test);
   RUN_TEST(pyos_readbyte_test);
   RUN_TEST(pyos_read_test);
+  RUN_TEST(pyos_read_until_delim_test);
+  RUN_TEST(pyos_read_all_test);
+  RUN_TEST(pyos_write_temp_file_test);
   RUN_TEST(pyos_test);  // non-hermetic
   RUN_TEST(pyutil_test);
   RUN_TEST(strerror_test);
@@ -420,6 +561,7 @@ int main(int argc, char** argv) {
 
   RUN_TEST(passwd_test);
   RUN_TEST(dir_cache_key_test);
+  RUN_TEST(file_cache_key_test);
   RUN_TEST(asan_global_leak_test);
 
   RUN_TEST(heap_id_test);
@@ -114,4 +114,13 @@ void WriteString(BigStr* s, int options, mylib::BufWriter* buf) {
   buf->WriteConst("\"");
 }
 
+void WriteInt(int i, mylib::BufWriter* buf) {
+  // Like str(i), but format directly into the buffer
+  buf->EnsureMoreSpace(kIntBufSize);
+
+  char* out = reinterpret_cast<char*>(buf->LengthPointer());
+  int length = snprintf(out, kIntBufSize, "%d", i);
+  buf->SetLengthFrom(reinterpret_cast<uint8_t*>(out + length));
+}
+
 }  // namespace pyj8
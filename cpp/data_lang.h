@@ -9,6 +9,8 @@ bool PartIsUtf8(BigStr* s, int start, int end);
 
 void WriteString(BigStr* s, int options, mylib::BufWriter* buf);
 
+void WriteInt(int i, mylib::BufWriter* buf);
+
 }  // namespace pyj8
 
 #endif  // DATA_LANG_H
@@ -49,6 +49,31 @@ TEST WriteString_test() {
   PASS();
 }
 
+TEST WriteInt_test() {
+  auto buf = Alloc<mylib::BufWriter>();
+
+  pyj8::WriteInt(0, buf);
+  buf->write(StrFromC(","));
+  pyj8::WriteInt(-42, buf);
+  buf->write(StrFromC(","));
+  pyj8::WriteInt(2147483647, buf);
+  buf->write(StrFromC(","));
+  pyj8::WriteInt(-2147483647 - 1, buf);
+
+  BigStr* result = buf->getvalue();
+  ASSERT(str_equals(StrFromC("0,-42,2147483647,-2147483648"), result));
+
+  // Many small writes grow the buffer
+  buf = Alloc<mylib::BufWriter>();
+  for (int i = 0; i < 1000; ++i) {
+    pyj8::WriteInt(i, buf);
+  }
+  result = buf->getvalue();
+  ASSERT_EQ_FMT(2890, len(result), "%d");
+
+  PASS();
+}
+
 TEST compare_c_test() {
   // Compare two implementations
 
@@ -116,6 +141,7 @@ int main(int argc, char** argv) {
 
   RUN_TEST(PartIsUtf8_test);
   RUN_TEST(WriteString_test);
+  RUN_TEST(WriteInt_test);
   RUN_TEST(compare_c_test);
 
   gHeap.CleanProcessExit();
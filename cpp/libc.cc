@@ -7,6 +7,7 @@
 #include <glob.h>
 #include <locale.h>
 #include <regex.h>
+#include <string.h>  // strcmp(), memmove()
 #include <sys/ioctl.h>
 #include <unistd.h>  // gethostname()
 #include <wchar.h>
@@ -103,17 +104,83 @@ List<BigStr*>* glob(BigStr* pat) {
   return matches;
 }
 
+// Compiled regexes are cached, because [[ $x =~ $pat ]], eggex matches and
+// ${x//pat/replace} are often evaluated in a loop with the same pattern.
+//
+// The cache is a small array in most-recently-used order.  A linear search is
+// cheap compared to regcomp().  regex_t is allocated with malloc(), so
+// entries live outside the GC heap.
+
+const int kRegexCacheSize = 100;
+
+struct RegexCacheEntry {
+  char* pattern;  // owned
+  int cflags;
+  regex_t compiled;
+};
+
+static RegexCacheEntry* gRegexCache[kRegexCacheSize];
+static int gRegexCacheLen = 0;
+
+static int gRegexCacheHits = 0;
+static int gRegexCacheMisses = 0;
+static int gRegexCacheEvictions = 0;
+
+// Returns a compiled regex owned by the cache, or nullptr if the pattern is
+// invalid.  In that case, the regcomp() error is written to error_desc.
+static regex_t* RegexCacheGet(const char* pattern, int cflags,
+                              char* error_desc, int error_size) {
+  for (int i = 0; i < gRegexCacheLen; ++i) {
+    RegexCacheEntry* e = gRegexCache[i];
+    if (e->cflags == cflags && strcmp(e->pattern, pattern) == 0) {
+      // Move it to the front
+      memmove(gRegexCache + 1, gRegexCache, i * sizeof(RegexCacheEntry*));
+      gRegexCache[0] = e;
+      gRegexCacheHits++;
+      return &e->compiled;
+    }
+  }
+  gRegexCacheMisses++;
+
+  auto e = static_cast<RegexCacheEntry*>(malloc(sizeof(RegexCacheEntry)));
+  int status = regcomp(&e->compiled, pattern, cflags);
+  if (status != 0) {
+    regerror(status, &e->compiled, error_desc, error_size);
+    free(e);
+    return nullptr;
+  }
+  e->pattern = strdup(pattern);
+  e->cflags = cflags;
+
+  if (gRegexCacheLen == kRegexCacheSize) {
+    RegexCacheEntry* last = gRegexCache[kRegexCacheSize - 1];
+    regfree(&last->compiled);
+    free(last->pattern);
+    free(last);
+    gRegexCacheLen--;
+    gRegexCacheEvictions++;
+  }
+  memmove(gRegexCache + 1, gRegexCache,
+          gRegexCacheLen * sizeof(RegexCacheEntry*));
+  gRegexCache[0] = e;
+  gRegexCacheLen++;
+
+  return &e->compiled;
+}
+
+List<int>* regex_cache_stats() {
+  return NewList<int>({gRegexCacheLen, gRegexCacheHits, gRegexCacheMisses,
+                       gRegexCacheEvictions});
+}
+
 // Raises RuntimeError if the pattern is invalid.  TODO: Use a different
 // exception?
 List<int>* regex_search(BigStr* pattern, int cflags, BigStr* str, int eflags,
                         int pos) {
   cflags |= REG_EXTENDED;
-  regex_t pat;
-  int status = regcomp(&pat, pattern->data_, cflags);
-  if (status != 0) {
-    char error_desc[50];
-    regerror(status, &pat, error_desc, 50);
-
+  char error_desc[50];
+  regex_t* pat = RegexCacheGet(pattern->data_, cflags, error_desc, 50);
+  if (pat == nullptr) {
     char error_message[80];
     snprintf(error_message, 80, "Invalid regex %s (%s)", pattern->data_,
              error_desc);
@@ -121,7 +188,7 @@ List<int>* regex_search(BigStr* pattern, int cflags, BigStr* str, int eflags,
     throw Alloc<ValueError>(StrFromC(error_message));
   }
 
-  int num_groups = pat.re_nsub + 1;  // number of captures
+  int num_groups = pat->re_nsub + 1;  // number of captures
 
   List<int>* indices = NewList<int>();
   indices->reserve(num_groups * 2);
@@ -129,7 +196,7 @@ List<int>* regex_search(BigStr* pattern, int cflags, BigStr* str, int eflags,
   const char* s = str->data_;
   regmatch_t* pmatch =
       static_cast<regmatch_t*>(malloc(sizeof(regmatch_t) * num_groups));
-  bool match = regexec(&pat, s + pos, num_groups, pmatch, eflags) == 0;
+  bool match = regexec(pat, s + pos, num_groups, pmatch, eflags) == 0;
   if (match) {
     int i;
     for (i = 0; i < num_groups; i++) {
@@ -148,7 +215,6 @@ List<int>* regex_search(BigStr* pattern, int cflags, BigStr* str, int eflags,
   }
 
   free(pmatch);
-  regfree(&pat);
 
   if (!match) {
     return nullptr;
@@ -167,20 +233,20 @@ const int NMATCH = 2;
 // Odd: This a Tuple2* not Tuple2 because it's Optional[Tuple2]!
 Tuple2<int, int>* regex_first_group_match(BigStr* pattern, BigStr* str,
                                           int pos) {
-  regex_t pat;
   regmatch_t m[NMATCH];
 
   // Could have been checked by regex_parse for [[ =~ ]], but not for glob
   // patterns like ${foo/x*/y}.
 
-  if (regcomp(&pat, pattern->data_, REG_EXTENDED) != 0) {
+  char error_desc[80];
+  regex_t* pat = RegexCacheGet(pattern->data_, REG_EXTENDED, error_desc, 80);
+  if (pat == nullptr) {
     throw Alloc<RuntimeError>(
         StrFromC("Invalid regex syntax (func_regex_first_group_match)"));
   }
 
   // Match at offset 'pos'
-  int result = regexec(&pat, str->data_ + pos, NMATCH, m, 0 /*flags*/);
-  regfree(&pat);
+  int result = regexec(pat, str->data_ + pos, NMATCH, m, 0 /*flags*/);
 
   if (result != 0) {
     return nullptr;
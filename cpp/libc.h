@@ -30,6 +30,9 @@ Tuple2<int, int>* regex_first_group_match(BigStr* pattern, BigStr* str,
 List<int>* regex_search(BigStr* pattern, int cflags, BigStr* str, int eflags,
                         int pos = 0);
 
+// Returns [size, hits, misses, evictions] of the compiled regex cache
+List<int>* regex_cache_stats();
+
 int wcswidth(BigStr* str);
 int get_terminal_width();
 
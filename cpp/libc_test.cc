@@ -121,6 +121,48 @@ TEST regex_test() {
   PASS();
 }
 
+TEST regex_cache_test() {
+  List<int>* before = libc::regex_cache_stats();
+
+  BigStr* pat = StrFromC("(cache)+_test_[0-9]");
+  List<int>* indices =
+      libc::regex_search(pat, 0, StrFromC("cache_test_1"), 0);
+  ASSERT_EQ_FMT(0, indices->at(0), "%d");
+  ASSERT_EQ_FMT(12, indices->at(1), "%d");
+
+  indices = libc::regex_search(pat, 0, StrFromC("cache_test_"), 0);
+  ASSERT_EQ(nullptr, indices);
+
+  // Different cflags is a different entry
+  indices = libc::regex_search(pat, REG_ICASE, StrFromC("x"), 0);
+  ASSERT_EQ(nullptr, indices);
+
+  List<int>* after = libc::regex_cache_stats();
+  ASSERT_EQ_FMT(before->at(1) + 1, after->at(1), "%d");  // hits
+  ASSERT_EQ_FMT(before->at(2) + 2, after->at(2), "%d");  // misses
+
+  // Evict everything
+  for (int i = 0; i < 200; ++i) {
+    libc::regex_first_group_match(str_repeat(StrFromC("a"), i + 1),
+                                  StrFromC("abc"), 0);
+  }
+  after = libc::regex_cache_stats();
+  ASSERT_EQ_FMT(100, after->at(0), "%d");
+  ASSERT(after->at(3) > before->at(3));
+
+  // Invalid patterns aren't cached
+  bool caught = false;
+  try {
+    libc::regex_search(StrFromC("*"), 0, StrFromC("abcd"), 0);
+  } catch (ValueError* e) {
+    caught = true;
+  }
+  ASSERT(caught);
+  ASSERT_EQ_FMT(100, libc::regex_cache_stats()->at(0), "%d");
+
+  PASS();
+}
+
 TEST libc_glob_test() {
   // This depends on the file system
   auto files = libc::glob(StrFromC("*.testdata"));
@@ -259,6 +301,7 @@ int main(int argc, char** argv) {
   RUN_TEST(realpath_test);
   RUN_TEST(libc_test);
   RUN_TEST(regex_test);
+  RUN_TEST(regex_cache_test);
   RUN_TEST(libc_glob_test);
   RUN_TEST(for_test_coverage);
 
@@ -47,6 +47,11 @@ bool exists(BigStr* path) {
   }
 }
 
+bool lexists(BigStr* path) {
+  struct stat st;
+  return ::lstat(path->data_, &st) == 0;
+}
+
 bool isdir(BigStr* path) {
   struct stat st;
   if (::stat(path->data_, &st) < 0) {
@@ -55,4 +60,12 @@ bool isdir(BigStr* path) {
   return S_ISDIR(st.st_mode);
 }
 
+bool islink(BigStr* path) {
+  struct stat st;
+  if (::lstat(path->data_, &st) < 0) {
+    return false;
+  }
+  return S_ISLNK(st.st_mode);
+}
+
 }  // namespace path_stat
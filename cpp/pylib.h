@@ -15,8 +15,12 @@ namespace path_stat {
 
 bool exists(BigStr* path);
 
+bool lexists(BigStr* path);
+
 bool isdir(BigStr* path);
 
+bool islink(BigStr* path);
+
 }  // namespace path_stat
 
 #endif  // LEAKY_PYLIB_H
@@ -26,6 +26,9 @@ TEST os_path_test() {
   ASSERT(path_stat::exists(StrFromC("/")));
   ASSERT(!path_stat::exists(StrFromC("/nonexistent_ZZZ")));
 
+  ASSERT(path_stat::lexists(StrFromC("/")));
+  ASSERT(!path_stat::lexists(StrFromC("/nonexistent_ZZZ")));
+
   PASS();
 }
 
@@ -35,6 +38,12 @@ TEST isdir_test() {
   PASS();
 }
 
+TEST islink_test() {
+  ASSERT(!path_stat::islink(StrFromC("/")));
+  ASSERT(!path_stat::islink(StrFromC("/nonexistent_ZZZ")));
+  PASS();
+}
+
 GREATEST_MAIN_DEFS();
 
 int main(int argc, char** argv) {
@@ -44,6 +53,7 @@ int main(int argc, char** argv) {
 
   RUN_TEST(os_path_test);
   RUN_TEST(isdir_test);
+  RUN_TEST(islink_test);
 
   gHeap.CleanProcessExit();
 
@@ -7,6 +7,7 @@
 #include <errno.h>
 #include <fcntl.h>      // open
 #include <signal.h>     // kill
+#include <spawn.h>      // posix_spawn
 #include <sys/stat.h>   // umask
 #include <sys/types.h>  // umask
 #include <sys/wait.h>   // WUNTRACED
@@ -85,10 +86,9 @@ mylib::LineReader* fdopen(int fd, BigStr* c_mode) {
   return Alloc<mylib::CFileLineReader>(f);
 }
 
-void execve(BigStr* argv0, List<BigStr*>* argv,
-            Dict<BigStr*, BigStr*>* environ) {
+// Returns a NULL-terminated array of pointers into the argv strings
+static char** MakeArgv(List<BigStr*>* argv) {
   int n_args = len(argv);
-  // never deallocated
   char** _argv = static_cast<char**>(malloc((n_args + 1) * sizeof(char*)));
 
   // Annoying const_cast
@@ -97,8 +97,11 @@ void execve(BigStr* argv0, List<BigStr*>* argv,
     _argv[i] = const_cast<char*>(argv->at(i)->data_);
   }
   _argv[n_args] = nullptr;
+  return _argv;
+}
 
-  // Convert environ into an array of pointers to strings of the form: "k=v".
+// Convert environ into an array of pointers to strings of the form: "k=v".
+static char** MakeEnvp(Dict<BigStr*, BigStr*>* environ) {
   int n_env = len(environ);
   char** envp = static_cast<char**>(malloc((n_env + 1) * sizeof(char*)));
 
@@ -117,6 +120,14 @@ void execve(BigStr* argv0, List<BigStr*>* argv,
     envp[env_index++] = buf;
   }
   envp[n_env] = nullptr;
+  return envp;
+}
+
+void execve(BigStr* argv0, List<BigStr*>* argv,
+            Dict<BigStr*, BigStr*>* environ) {
+  // never deallocated
+  char** _argv = MakeArgv(argv);
+  char** envp = MakeEnvp(environ);
 
   int ret = ::execve(argv0->data_, _argv, envp);
   if (ret == -1) {
@@ -127,6 +138,63 @@ void execve(BigStr* argv0, List<BigStr*>* argv,
   FAIL(kShouldNotGetHere);
 }
 
+// The libc's posix_spawn() child sets its internal signals, from 32 up to
+// SIGRTMIN, to SIG_IGN, and that survives exec.  A forked child gets SIG_DFL.
+// sigaddset() rejects these signals, so set their bits directly, to reset them
+// like fork() does.
+static void AddInternalSignals(sigset_t* set) {
+#ifdef __linux__
+  unsigned long* words = reinterpret_cast<unsigned long*>(set);
+  const int bits_per_word = 8 * sizeof(unsigned long);
+  for (int sig = 32; sig < SIGRTMIN; ++sig) {
+    int i = sig - 1;
+    words[i / bits_per_word] |= 1UL << (i % bits_per_word);
+  }
+#endif
+}
+
+int posix_spawn(BigStr* path, List<BigStr*>* argv,
+                Dict<BigStr*, BigStr*>* environ, int pgroup,
+                List<int>* sig_defaults) {
+  sigset_t sigdef;
+  sigemptyset(&sigdef);
+  for (ListIter<int> it(sig_defaults); !it.Done(); it.Next()) {
+    sigaddset(&sigdef, it.Value());
+  }
+  AddInternalSignals(&sigdef);
+
+  posix_spawnattr_t attr;
+  int err = ::posix_spawnattr_init(&attr);
+  if (err != 0) {
+    throw Alloc<OSError>(err);
+  }
+  short flags = POSIX_SPAWN_SETSIGDEF;
+  if (pgroup != -1) {
+    flags |= POSIX_SPAWN_SETPGROUP;
+    ::posix_spawnattr_setpgroup(&attr, pgroup);
+  }
+  ::posix_spawnattr_setsigdefault(&attr, &sigdef);
+  ::posix_spawnattr_setflags(&attr, flags);
+
+  char** _argv = MakeArgv(argv);
+  char** envp = MakeEnvp(environ);
+
+  pid_t pid;
+  err = ::posix_spawn(&pid, path->data_, nullptr, &attr, _argv, envp);
+
+  ::posix_spawnattr_destroy(&attr);
+  free(_argv);
+  for (char** p = envp; *p != nullptr; ++p) {
+    free(*p);
+  }
+  free(envp);
+
+  if (err != 0) {
+    throw Alloc<OSError>(err);
+  }
+  return pid;
+}
+
 void kill(int pid, int sig) {
   if (::kill(pid, sig) != 0) {
     throw Alloc<OSError>(errno);
@@ -144,6 +144,11 @@ mylib::LineReader* fdopen(int fd, BigStr* c_mode);
 void execve(BigStr* argv0, List<BigStr*>* argv,
             Dict<BigStr*, BigStr*>* environ);
 
+// Returns the PID of the child.  pgroup is -1 to stay in our process group.
+int posix_spawn(BigStr* path, List<BigStr*>* argv,
+                Dict<BigStr*, BigStr*>* environ, int pgroup,
+                List<int>* sig_defaults);
+
 void kill(int pid, int sig);
 void killpg(int pgid, int sig);
 
@@ -1,7 +1,10 @@
 #include "cpp/stdlib.h"
 
 #include <errno.h>
+#include <pthread.h>
+#include <signal.h>  // SIGPIPE
 #include <sys/stat.h>
+#include <sys/wait.h>  // waitpid()
 
 #include "mycpp/gc_builtins.h"
 #include "vendor/greatest.h"
@@ -120,6 +123,95 @@ TEST listdir_test() {
   PASS();
 }
 
+TEST posix_spawn_test() {
+  auto argv = NewList<BigStr*>(
+      std::initializer_list<BigStr*>{StrFromC("sh"), StrFromC("-c"),
+                                     StrFromC("exit $CODE")});
+  auto environ = Alloc<Dict<BigStr*, BigStr*>>();
+  environ->set(StrFromC("CODE"), StrFromC("42"));
+  auto sig_defaults = NewList<int>(std::initializer_list<int>{SIGPIPE});
+
+  int pid = posix::posix_spawn(StrFromC("/bin/sh"), argv, environ, 0,
+                               sig_defaults);
+  ASSERT(pid > 0);
+
+  int status;
+  ASSERT_EQ(pid, ::waitpid(pid, &status, 0));
+  ASSERT_EQ(42, WEXITSTATUS(status));
+
+  int ec = -1;
+  try {
+    posix::posix_spawn(StrFromC("nonexistent_ZZ"), argv, environ, -1,
+                       sig_defaults);
+  } catch (IOError_OSError* e) {
+    ec = e->errno_;
+  }
+  ASSERT_EQ(ENOENT, ec);
+
+  PASS();
+}
+
+// Returns the SigIgn line of a child's /proc/self/status
+static BigStr* ChildSigIgn(bool use_spawn) {
+  int fds[2];
+  if (::pipe(fds) != 0) {
+    return nullptr;
+  }
+  BigStr* cmd = StrFormat("grep SigIgn /proc/self/status >&%d", fds[1]);
+  auto argv = NewList<BigStr*>(
+      std::initializer_list<BigStr*>{StrFromC("sh"), StrFromC("-c"), cmd});
+  auto environ = Alloc<Dict<BigStr*, BigStr*>>();
+
+  int pid;
+  if (use_spawn) {
+    pid = posix::posix_spawn(StrFromC("/bin/sh"), argv, environ, -1,
+                             NewList<int>());
+  } else {
+    pid = ::fork();
+    if (pid == 0) {
+      posix::execve(StrFromC("/bin/sh"), argv, environ);
+    }
+  }
+  ::close(fds[1]);
+
+  char buf[100];
+  int n = ::read(fds[0], buf, sizeof(buf));
+  ::close(fds[0]);
+
+  int status;
+  ::waitpid(pid, &status, 0);
+  return n > 0 ? StrFromC(buf, n) : nullptr;
+}
+
+static void* BlockForever(void* arg) {
+  ::pause();
+  return nullptr;
+}
+
+TEST posix_spawn_signals_test() {
+  struct stat st;
+  if (::stat("/proc/self/status", &st) != 0) {
+    PASS();  // not Linux
+  }
+
+  // Make glibc install handlers for its internal signals, like CPython does
+  pthread_t t;
+  pthread_create(&t, 0, BlockForever, nullptr);
+  pthread_cancel(t);
+  pthread_join(t, 0);
+
+  // A spawned child ignores the same signals as a forked one
+  BigStr* spawned = ChildSigIgn(true);
+  BigStr* forked = ChildSigIgn(false);
+  ASSERT(spawned != nullptr);
+  ASSERT(forked != nullptr);
+  log("spawned %s", spawned->data_);
+  log("forked  %s", forked->data_);
+  ASSERT(str_equals(forked, spawned));
+
+  PASS();
+}
+
 TEST for_test_coverage() {
   time_::sleep(0);
 
@@ -142,6 +234,8 @@ int main(int argc, char** argv) {
   RUN_TEST(time_test);
   RUN_TEST(mtime_demo);
   RUN_TEST(listdir_test);
+  RUN_TEST(posix_spawn_test);
+  RUN_TEST(posix_spawn_signals_test);
 
   RUN_TEST(for_test_coverage);
 
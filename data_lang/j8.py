@@ -39,17 +39,20 @@ from _devbuild.gen.id_kind_asdl import Id, Id_t, Id_str
 from _devbuild.gen.value_asdl import (value, value_e, value_t)
 
 from asdl import format as fmt
+from core import bash_impl
 from core import error
+from core import pyos
 from core import vm
 from data_lang import pyj8
 from frontend import consts
 from frontend import match
 from mycpp import mylib
-from mycpp.mylib import tagswitch, iteritems, NewDict, log
+from mycpp.mylib import iteritems, NewDict, log
 
 _ = log
 unused = pyj8
 
+from errno import EINTR
 from typing import cast, Dict, List, Tuple, Optional
 
 
@@ -84,7 +87,7 @@ class Printer(object):
             pretty.UnquotedKeys - ASDL uses this?
         """
         self.options = 0
-        self.spaces = {0: ''}  # cache of strings with spaces
+        self.newlines = {}  # type: Dict[int, str]  # cache of '\n' + spaces
 
     # Could be PrintMessage or PrintJsonMessage()
     def _Print(self, val, buf, indent, options=0):
@@ -93,7 +96,7 @@ class Printer(object):
         Args:
           indent: number of spaces to indent, or -1 for everything on one line
         """
-        p = InstancePrinter(buf, indent, options, self.spaces)
+        p = InstancePrinter(buf, indent, options, self.newlines)
         p.Print(val)
 
     def PrintMessage(self, val, buf, indent):
@@ -152,210 +155,213 @@ class Printer(object):
 
 
 class InstancePrinter(object):
-    """Print a value tree as J8/JSON."""
+    """Print a value tree as J8/JSON.
 
-    def __init__(self, buf, indent, options, spaces):
+    This is a single pass over the tree that appends to one buffer.  Scalars
+    are written without recursing, and indentation strings are only computed
+    for containers, and only when pretty printing.
+    """
+
+    def __init__(self, buf, indent, options, newlines):
         # type: (mylib.BufWriter, int, int, Dict[int, str]) -> None
         self.buf = buf
         self.indent = indent
         self.options = options
-        self.spaces = spaces
+        self.newlines = newlines
+
+        # special value that means everything is on one line
+        # It's like
+        #    JSON.stringify(d, null, 0)
+        # except we use -1, not 0.  0 can still have newlines.
+        self.pretty = indent != -1
 
         # Key is vm.HeapValueId(val)
         # Value is always True
         # Dict[int, None] doesn't translate -- it would be nice to have a set()
         self.seen = {}  # type: Dict[int, bool]
 
-    def _GetIndent(self, num_spaces):
+    def _Newline(self, level):
         # type: (int) -> str
-        if num_spaces not in self.spaces:
-            self.spaces[num_spaces] = ' ' * num_spaces
-        return self.spaces[num_spaces]
+        """Return a newline followed by the indentation for a level."""
+        num_spaces = level * self.indent
+        if num_spaces not in self.newlines:
+            self.newlines[num_spaces] = '\n' + ' ' * num_spaces
+        return self.newlines[num_spaces]
+
+    def _ItemSep(self, level):
+        # type: (int) -> None
+        """Write what goes between [ or { and the first item."""
+        if self.pretty:
+            self.buf.write(self._Newline(level))
+
+    def _EndSep(self, level, empty):
+        # type: (int, bool) -> None
+        """Write what goes between the last item and ] or }."""
+        if self.pretty:
+            if empty:
+                self.buf.write('\n')
+            self.buf.write(self._Newline(level))
 
     def Print(self, val, level=0):
         # type: (value_t, int) -> None
 
         #log('indent %r level %d', indent, level)
 
-        # special value that means everything is on one line
-        # It's like
-        #    JSON.stringify(d, null, 0)
-        # except we use -1, not 0.  0 can still have newlines.
-
-        if self.indent == -1:
-            bracket_indent = ''
-            item_indent = ''
-            maybe_newline = ''
-            maybe_space = ''
-        else:
-            bracket_indent = self._GetIndent(level * self.indent)
-            item_indent = self._GetIndent((level + 1) * self.indent)
-            maybe_newline = '\n'
-            maybe_space = ' '  # after colon
-
+        # Common cases first, without a tagswitch
         UP_val = val
-        with tagswitch(val) as case:
-            if case(value_e.Null):
-                self.buf.write('null')
-
-            elif case(value_e.Bool):
-                val = cast(value.Bool, UP_val)
-                self.buf.write('true' if val.b else 'false')
-
-            elif case(value_e.Int):
-                val = cast(value.Int, UP_val)
-                # TODO: use pyj8.WriteInt(val.i, self.buf)
-                self.buf.write(str(val.i))
-
-            elif case(value_e.Float):
-                val = cast(value.Float, UP_val)
-
-                # TODO: use pyj8.WriteFloat(val.f, self.buf)
-                self.buf.write(str(val.f))
-
-            elif case(value_e.Str):
-                val = cast(value.Str, UP_val)
-
-                pyj8.WriteString(val.s, self.options, self.buf)
-
-            elif case(value_e.List):
-                val = cast(value.List, UP_val)
-
-                # Cycle detection, only for containers that can be in cycles
-                heap_id = vm.HeapValueId(val)
-                if heap_id in self.seen:
-                    if self.options & SHOW_CYCLES:
-                        self.buf.write('[ ...%s ]' % vm.ValueIdString(val))
-                        return
-                    else:
-                        # node.js prints which index closes the cycle
-                        raise error.Encode(
-                            "Can't encode List%s in object cycle" %
-                            vm.ValueIdString(val))
-
-                self.seen[heap_id] = True
-
-                self.buf.write('[')
-                self.buf.write(maybe_newline)
-                for i, item in enumerate(val.items):
-                    if i != 0:
-                        self.buf.write(',')
-                        self.buf.write(maybe_newline)
-
-                    self.buf.write(item_indent)
-                    self.Print(item, level + 1)
-                self.buf.write(maybe_newline)
-
-                self.buf.write(bracket_indent)
-                self.buf.write(']')
-
-            elif case(value_e.Dict):
-                val = cast(value.Dict, UP_val)
+        tag = val.tag()
+        if tag == value_e.Str:
+            val = cast(value.Str, UP_val)
+            pyj8.WriteString(val.s, self.options, self.buf)
+
+        elif tag == value_e.Int:
+            val = cast(value.Int, UP_val)
+            pyj8.WriteInt(val.i, self.buf)
+
+        elif tag == value_e.Null:
+            self.buf.write('null')
+
+        elif tag == value_e.Bool:
+            val = cast(value.Bool, UP_val)
+            self.buf.write('true' if val.b else 'false')
+
+        elif tag == value_e.Float:
+            val = cast(value.Float, UP_val)
+
+            # TODO: use pyj8.WriteFloat(val.f, self.buf)
+            self.buf.write(str(val.f))
+
+        elif tag == value_e.List:
+            val = cast(value.List, UP_val)
+            self._PrintList(val, level)
+
+        elif tag == value_e.Dict:
+            val = cast(value.Dict, UP_val)
+            self._PrintDict(val, level)
+
+        # BashArray and BashAssoc should be printed with pp line (x), e.g.
+        # for spec tests.
+        # - BashAssoc has a clear encoding.
+        # - BashArray could eventually be Dict[int, str].  But that's not
+        #   encodable in JSON, which has string keys!
+        #   So I think we can print it like ["a",null,'b"] and that won't
+        #   change.  That's what users expect.
+        elif tag == value_e.BashArray:
+            val = cast(value.BashArray, UP_val)
+            self._PrintBashArray(val, level)
+
+        elif tag == value_e.BashAssoc:
+            val = cast(value.BashAssoc, UP_val)
+            self._PrintBashAssoc(val, level)
 
-                # Cycle detection, only for containers that can be in cycles
-                heap_id = vm.HeapValueId(val)
-                if heap_id in self.seen:
-                    if self.options & SHOW_CYCLES:
-                        self.buf.write('{ ...%s }' % vm.ValueIdString(val))
-                        return
-                    else:
-                        # node.js prints which key closes the cycle
-                        raise error.Encode(
-                            "Can't encode Dict%s in object cycle" %
-                            vm.ValueIdString(val))
-
-                self.seen[heap_id] = True
-
-                self.buf.write('{')
-                self.buf.write(maybe_newline)
-                i = 0
-                for k, v in iteritems(val.d):
-                    if i != 0:
-                        self.buf.write(',')
-                        self.buf.write(maybe_newline)
-
-                    self.buf.write(item_indent)
+        else:
+            if self.options & SHOW_NON_DATA:
+                # Similar to = operator, ui.DebugPrint()
+                # TODO: that prints value.Range in a special way
+                from core import ui
+                ysh_type = ui.ValType(val)
+                id_str = vm.ValueIdString(val)
+                self.buf.write('<%s%s>' % (ysh_type, id_str))
+            else:
+                from core import ui  # TODO: break dep
+                raise error.Encode("Can't serialize object of type %s" %
+                                   ui.ValType(val))
+
+    def _PrintList(self, val, level):
+        # type: (value.List, int) -> None
+
+        # Cycle detection, only for containers that can be in cycles
+        heap_id = vm.HeapValueId(val)
+        if heap_id in self.seen:
+            if self.options & SHOW_CYCLES:
+                self.buf.write('[ ...%s ]' % vm.ValueIdString(val))
+                return
+            else:
+                # node.js prints which index closes the cycle
+                raise error.Encode("Can't encode List%s in object cycle" %
+                                   vm.ValueIdString(val))
+
+        self.seen[heap_id] = True
+
+        self.buf.write('[')
+        for i, item in enumerate(val.items):
+            if i != 0:
+                self.buf.write(',')
+            self._ItemSep(level + 1)
+            self.Print(item, level + 1)
+        self._EndSep(level, len(val.items) == 0)
+        self.buf.write(']')
+
+    def _PrintDict(self, val, level):
+        # type: (value.Dict, int) -> None
+
+        # Cycle detection, only for containers that can be in cycles
+        heap_id = vm.HeapValueId(val)
+        if heap_id in self.seen:
+            if self.options & SHOW_CYCLES:
+                self.buf.write('{ ...%s }' % vm.ValueIdString(val))
+                return
+            else:
+                # node.js prints which key closes the cycle
+                raise error.Encode("Can't encode Dict%s in object cycle" %
+                                   vm.ValueIdString(val))
 
-                    pyj8.WriteString(k, self.options, self.buf)
+        self.seen[heap_id] = True
 
-                    self.buf.write(':')
-                    self.buf.write(maybe_space)
+        colon = ': ' if self.pretty else ':'
 
-                    self.Print(v, level + 1)
+        self.buf.write('{')
+        i = 0
+        for k, v in iteritems(val.d):
+            if i != 0:
+                self.buf.write(',')
+            self._ItemSep(level + 1)
 
-                    i += 1
+            pyj8.WriteString(k, self.options, self.buf)
+            self.buf.write(colon)
+            self.Print(v, level + 1)
 
-                self.buf.write(maybe_newline)
-                self.buf.write(bracket_indent)
-                self.buf.write('}')
+            i += 1
+        self._EndSep(level, i == 0)
+        self.buf.write('}')
 
-            # BashArray and BashAssoc should be printed with pp line (x), e.g.
-            # for spec tests.
-            # - BashAssoc has a clear encoding.
-            # - BashArray could eventually be Dict[int, str].  But that's not
-            #   encodable in JSON, which has string keys!
-            #   So I think we can print it like ["a",null,'b"] and that won't
-            #   change.  That's what users expect.
-            elif case(value_e.BashArray):
-                val = cast(value.BashArray, UP_val)
-
-                self.buf.write('[')
-                self.buf.write(maybe_newline)
-                for i, s in enumerate(val.strs):
-                    if i != 0:
-                        self.buf.write(',')
-                        self.buf.write(maybe_newline)
+    def _PrintBashArray(self, val, level):
+        # type: (value.BashArray, int) -> None
 
-                    self.buf.write(item_indent)
-                    if s is None:
-                        self.buf.write('null')
-                    else:
-                        pyj8.WriteString(s, self.options, self.buf)
-
-                self.buf.write(maybe_newline)
-
-                self.buf.write(bracket_indent)
-                self.buf.write(']')
-
-            elif case(value_e.BashAssoc):
-                val = cast(value.BashAssoc, UP_val)
-
-                self.buf.write('{')
-                self.buf.write(maybe_newline)
-                i = 0
-                for k2, v2 in iteritems(val.d):
-                    if i != 0:
-                        self.buf.write(',')
-                        self.buf.write(maybe_newline)
-
-                    self.buf.write(item_indent)
+        self.buf.write('[')
+        n = bash_impl.BashArray_Length(val)
+        for i in xrange(0, n):
+            if i != 0:
+                self.buf.write(',')
+            self._ItemSep(level + 1)
 
-                    pyj8.WriteString(k2, self.options, self.buf)
+            s = bash_impl.BashArray_GetItem(val, i)
+            if s is None:
+                self.buf.write('null')
+            else:
+                pyj8.WriteString(s, self.options, self.buf)
+        self._EndSep(level, n == 0)
+        self.buf.write(']')
 
-                    self.buf.write(':')
-                    self.buf.write(maybe_space)
+    def _PrintBashAssoc(self, val, level):
+        # type: (value.BashAssoc, int) -> None
 
-                    pyj8.WriteString(v2, self.options, self.buf)
+        colon = ': ' if self.pretty else ':'
 
-                    i += 1
+        self.buf.write('{')
+        i = 0
+        for k, v in iteritems(val.d):
+            if i != 0:
+                self.buf.write(',')
+            self._ItemSep(level + 1)
 
-                self.buf.write(maybe_newline)
-                self.buf.write(bracket_indent)
-                self.buf.write('}')
+            pyj8.WriteString(k, self.options, self.buf)
+            self.buf.write(colon)
+            pyj8.WriteString(v, self.options, self.buf)
 
-            else:
-                pass  # mycpp workaround
-                if self.options & SHOW_NON_DATA:
-                    # Similar to = operator, ui.DebugPrint()
-                    # TODO: that prints value.Range in a special way
-                    from core import ui
-                    ysh_type = ui.ValType(val)
-                    id_str = vm.ValueIdString(val)
-                    self.buf.write('<%s%s>' % (ysh_type, id_str))
-                else:
-                    from core import ui  # TODO: break dep
-                    raise error.Encode("Can't serialize object of type %s" %
-                                       ui.ValType(val))
+            i += 1
+        self._EndSep(level, i == 0)
+        self.buf.write('}')
 
 
 class PrettyPrinter(object):
@@ -397,11 +403,24 @@ class PrettyPrinter(object):
         pass
 
 
+# Read at least this much from a file descriptor at a time.  If a token is
+# longer than what's buffered, we read more, so the buffer doubles.
+READ_CHUNK = 64 * 1024
+
+# A token that ends this close to the end of the buffer may be cut off, e.g.
+# 1.5 of 1.5e3, or \ud83d of a surrogate pair.  So we refill and lex it again.
+LOOKAHEAD = 16
+
+
 class LexerDecoder(object):
     """J8 lexer and string decoder.
 
     Similar interface as SimpleLexer, except we return an optional decoded
     string
+
+    After ReadFromFd(), 's' is a buffer that holds the rest of the current
+    token and whatever was read after it.  It's refilled from the fd when a
+    token reaches its end, so a big document isn't in memory all at once.
     """
 
     def __init__(self, s, is_j8):
@@ -411,10 +430,50 @@ class LexerDecoder(object):
         self.lang_str = "J8" if is_j8 else "JSON"
 
         self.pos = 0
+        self.tok_start = 0  # after whitespace
         # Reuse this instance to save GC objects.  JSON objects could have
         # thousands of strings.
         self.decoded = mylib.BufWriter()
 
+        self.fd = -1  # not reading from a file descriptor
+        self.eof = False
+
+    def ReadFromFd(self, fd):
+        # type: (int) -> None
+        """Lex input read from fd in chunks, instead of the string."""
+        self.fd = fd
+
+    def _Refill(self):
+        # type: () -> bool
+        """Read more input into the buffer.
+
+        The bytes before self.pos are dropped, so positions shift.  Returns
+        False at EOF, or if we're not reading from a file descriptor.
+
+        Raises pyos.ReadError.
+        """
+        if self.fd == -1 or self.eof:
+            return False
+
+        rest = self.s[self.pos:]
+        chunks = []  # type: List[str]
+        while True:
+            n, err_num = pyos.Read(self.fd, max(READ_CHUNK, len(rest)),
+                                   chunks)
+            if n < 0:
+                if err_num == EINTR:
+                    continue  # retry, like pyos.ReadAll()
+                raise pyos.ReadError(err_num)
+            break
+
+        if n == 0:
+            self.eof = True
+            return False
+
+        self.s = rest + chunks[0]
+        self.pos = 0
+        return True
+
     def _Error(self, msg, end_pos):
         # type: (str, int) -> error.Decode
 
@@ -427,9 +486,12 @@ class LexerDecoder(object):
 
         while True:  # ignore spaces
             tok_id, end_pos = match.MatchJ8Token(self.s, self.pos)
+            if len(self.s) - end_pos < LOOKAHEAD and self._Refill():
+                continue  # the token may be cut off, so lex it again
             if tok_id != Id.Ignored_Space:
                 break
             self.pos = end_pos
+        self.tok_start = self.pos
 
         # Non-string tokens like { } null etc.
         if tok_id not in (Id.Left_DoubleQuote, Id.Left_USingleQuote,
@@ -457,6 +519,13 @@ class LexerDecoder(object):
             else:
                 tok_id, str_end = match.MatchJ8StrToken(self.s, str_pos)
 
+            if len(self.s) - str_end < LOOKAHEAD and self.fd != -1:
+                # Keep only the part of the string we haven't decoded
+                self.pos = str_pos
+                if self._Refill():
+                    str_pos = 0
+                    continue
+
             if tok_id == Id.Eol_Tok:
                 # TODO: point to beginning of # quote?
                 raise self._Error(
@@ -576,10 +645,17 @@ class Parser(object):
         self.end_pos = 0
         self.decoded = ''
 
+    def ReadFromFd(self, fd):
+        # type: (int) -> None
+        """Parse input read from fd in chunks, instead of the string."""
+        self.lexer.ReadFromFd(fd)
+
     def _Next(self):
         # type: () -> None
-        self.start_pos = self.end_pos
         self.tok_id, self.end_pos, self.decoded = self.lexer.Next()
+        # Token text is in the lexer's buffer, which may have been refilled
+        self.s = self.lexer.s
+        self.start_pos = self.lexer.tok_start
         #log('NEXT %s %s %s', Id_str(self.tok_id), self.end_pos, self.decoded or '-')
 
     def _Eat(self, tok_id):
@@ -714,3 +790,10 @@ class Parser(object):
         """ Raises error.Decode. """
         self._Next()
         return self._ParseValue()
+
+    def CheckEof(self):
+        # type: () -> None
+        """Raises error.Decode if there's input after the value."""
+        if self.tok_id != Id.Eol_Tok:
+            raise self._Error('Unexpected input after %s value' %
+                              self.lang_str)
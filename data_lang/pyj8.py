@@ -21,6 +21,15 @@ def WriteString(s, options, buf):
     buf.write(fastfunc.J8EncodeString(s, j8_fallback))
 
 
+def WriteInt(i, buf):
+    # type: (int, mylib.BufWriter) -> None
+    """Write decimal integer to buffer.
+
+    The C++ version formats it in place, without an intermediate string.
+    """
+    buf.write(str(i))
+
+
 PartIsUtf8 = fastfunc.PartIsUtf8
 
 
@@ -4,9 +4,11 @@ pyj8_test.py: Tests for pyj8.py
 """
 from __future__ import print_function
 
+import os
 import unittest
 
 from _devbuild.gen.syntax_asdl import Id, Id_str
+from _devbuild.gen.value_asdl import value_e
 from core import error
 from data_lang import pyj8  # module under test
 from data_lang import j8
@@ -113,6 +115,36 @@ class J8Test(unittest.TestCase):
         else:
             self.fail('Expected failure')
 
+    def testParseFromFd(self):
+        # Tokens and strings are split across small chunks
+        doc = r"""{"k": [true, 123, 1.5e3, null], "s": "ab\n\u03bc \u00e9cd",
+                  u'j8': b'\yff', "pair": "\ud83d\ude00", "empty": ""}"""
+
+        saved = j8.READ_CHUNK
+        j8.READ_CHUNK = 3
+        try:
+            r, w = os.pipe()
+            os.write(w, doc)
+            os.close(w)
+
+            p = j8.Parser('', True)
+            p.ReadFromFd(r)
+            val = p.ParseValue()
+            p.CheckEof()
+            os.close(r)
+
+            items = val.d['k'].items
+            self.assertEqual(True, items[0].b)
+            self.assertEqual(123, items[1].i)
+            self.assertEqual(1500.0, items[2].f)
+            self.assertEqual(value_e.Null, items[3].tag())
+            self.assertEqual('ab\n\xce\xbc \xc3\xa9cd', val.d['s'].s)
+            self.assertEqual('\xff', val.d['j8'].s)
+            self.assertEqual('\xf0\x9f\x98\x80', val.d['pair'].s)
+            self.assertEqual('', val.d['empty'].s)
+        finally:
+            j8.READ_CHUNK = saved
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -513,3 +513,7 @@ JSON_READ_SPEC.LongFlag('--validate',
                         args.Bool,
                         default=True,
                         help='Validate UTF-8')
+JSON_READ_SPEC.LongFlag('--lines',
+                        args.Bool,
+                        default=False,
+                        help='Read one value per line, like JSON Lines')
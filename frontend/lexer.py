@@ -395,7 +395,7 @@ class Lexer(object):
             if t.id == old_id:
                 #log('==> TRANSLATING %s ==> %s', Id_str(t.id), Id_str(new_id))
                 self.translation_stack.pop()
-                t.id = new_id
+                self.line_lexer.arena.SetTokenId(t, new_id)
 
         return t
 
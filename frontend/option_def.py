@@ -218,7 +218,6 @@ _NO_OPS = [
     'extquote',
     'force_fignore',
     'globasciiranges',
-    'globstar',  # TODO:  implement **
     'gnu_errfmt',
     'histreedit',
     'histverify',
@@ -276,8 +275,12 @@ def _Init(opt_def):
     # shopt options that aren't in any groups.
     opt_def.Add('failglob')
     opt_def.Add('extglob')
+    opt_def.Add('globstar')
     opt_def.Add('nocasematch')
 
+    # Cache directory listings for globs, by mtime
+    opt_def.Add('glob_dir_cache', default=True)
+
     # Compatibility
     opt_def.Add(
         'eval_unsafe_arith')  # recursive parsing and evaluation (ble.sh)
@@ -4,12 +4,14 @@ parse_lib.py - Consolidate various parser instantiations here.
 
 from _devbuild.gen.id_kind_asdl import Id_t
 from _devbuild.gen.syntax_asdl import (Token, CompoundWord, expr_t, Redir,
-                                       ArgList, Proc, Func, command, pat_t)
+                                       ArgList, Proc, Func, command, pat_t,
+                                       command_t, source_t)
 from _devbuild.gen.types_asdl import lex_mode_e
 from _devbuild.gen import grammar_nt
 
 from asdl import format as fmt
 from core import state
+from core import util
 from frontend import lexer
 from frontend import reader
 from osh import tdop
@@ -24,7 +26,7 @@ from ysh.expr_parse import ctx_PNodeAllocator
 
 _ = log
 
-from typing import Any, List, Tuple, Dict, TYPE_CHECKING
+from typing import Any, List, Tuple, Dict, Optional, TYPE_CHECKING
 if TYPE_CHECKING:
     from core.alloc import Arena
     from core.util import _DebugFile
@@ -184,6 +186,69 @@ if TYPE_CHECKING:
     AliasesInFlight = List[Tuple[str, int]]
 
 
+class _AliasEntry(object):
+
+    def __init__(self, node, src):
+        # type: (command_t, source_t) -> None
+        self.node = node
+        self.src = src  # source.Alias, shared by all tokens of the node
+
+
+class ParseCache(object):
+    """Remembers the commands that alias expansions parsed to.
+
+    How code parses depends on parse options and alias definitions, so the
+    cache key includes StateKey().  main_loop.BatchCache uses the same key for
+    'eval' and 'source'.
+    """
+
+    def __init__(self, mutable_opts):
+        # type: (state.MutableOpts) -> None
+        self.mutable_opts = mutable_opts
+        self.alias_version = 0  # incremented by 'alias' and 'unalias'
+
+        self.alias_nodes = {}  # type: Dict[str, _AliasEntry]
+        self.alias_lru = util.Lru('alias', 1000)
+
+    def AliasesChanged(self):
+        # type: () -> None
+        self.alias_version += 1
+
+    def StateKey(self):
+        # type: () -> str
+        """Changes whenever code could parse differently."""
+        return '%s %d' % (self.mutable_opts.ParseOptionsKey(),
+                          self.alias_version)
+
+    def AliasKey(self, code_str, aliases_in_flight):
+        # type: (str, AliasesInFlight) -> str
+        """The key for the expansion code_str of the aliases in flight."""
+        parts = [self.StateKey()]  # type: List[str]
+        for name, _ in aliases_in_flight:
+            parts.append(name)
+        parts.append(code_str)
+        return '\0'.join(parts)
+
+    def GetAlias(self, key):
+        # type: (str) -> Optional[command_t]
+        """Returns the cached command, or None.
+
+        The command is shared by every expansion with the same key, and so is
+        its source.Alias.  That's OK because errors only show the name of the
+        alias, which is part of the key, not where it was used.
+        """
+        if not self.alias_lru.Lookup(key):
+            return None
+        return self.alias_nodes[key].node
+
+    def PutAlias(self, key, node, src):
+        # type: (str, command_t, source_t) -> None
+        evicted = self.alias_lru.Insert(key)
+        if evicted is not None:
+            mylib.dict_erase(self.alias_nodes, evicted)
+        self.alias_nodes[key] = _AliasEntry(node, src)
+
+
 class ParseContext(object):
     """Context shared between the mutually recursive Command and Word parsers.
 
@@ -219,10 +284,16 @@ class ParseContext(object):
         # Completion state lives here since it may span multiple parsers.
         self.trail = _BaseTrail()  # no-op by default
 
+        self.parse_cache = None  # type: Optional[ParseCache]
+
     def Init_Trail(self, trail):
         # type: (_BaseTrail) -> None
         self.trail = trail
 
+    def Init_ParseCache(self, parse_cache):
+        # type: (ParseCache) -> None
+        self.parse_cache = parse_cache
+
     def MakeLexer(self, line_reader):
         # type: (_Reader) -> Lexer
         """Helper function.
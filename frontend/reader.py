@@ -106,6 +106,18 @@ class FileLineReader(_Reader):
 
         return line
 
+    def SkipLines(self, line_num):
+        # type: (int) -> None
+        """Discard lines without adding them to the arena, so that the next
+        line read has the given line number.
+
+        Used to resume parsing partway through a file.
+        """
+        while self.line_num < line_num:
+            if self._GetLine() is None:
+                break
+            self.line_num += 1
+
     def LastLineHint(self):
         # type: () -> bool
         return self.last_line_hint
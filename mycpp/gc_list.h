@@ -421,9 +421,14 @@ inline bool _cmp(BigStr* a, BigStr* b) {
   return mylib::str_cmp(a, b) < 0;
 }
 
+inline bool _cmp(int a, int b) {
+  return a < b;
+}
+
 template <typename T>
 void List<T>::sort() {
-  std::sort(slab_->items_, slab_->items_ + len_, _cmp);
+  std::sort(slab_->items_, slab_->items_ + len_,
+            [](T a, T b) { return _cmp(a, b); });
 }
 
 // TODO: mycpp can just generate the constructor instead?
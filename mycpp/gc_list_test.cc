@@ -386,6 +386,13 @@ TEST sort_test() {
   ASSERT(str_equals0("aa", strs->at(2)));
   ASSERT(str_equals0("b", strs->at(3)));
 
+  List<int>* ints = NewList<int>(std::initializer_list<int>{3, -1, 42, 0});
+  ints->sort();  // [-1, 0, 3, 42]
+  ASSERT_EQ(-1, ints->at(0));
+  ASSERT_EQ(0, ints->at(1));
+  ASSERT_EQ(3, ints->at(2));
+  ASSERT_EQ(42, ints->at(3));
+
   PASS();
 }
 
@@ -17,10 +17,18 @@ static const int kMaxFmtWidth = 256;  // arbitrary...
 
 int BigStr::find(BigStr* needle, int pos) {
   int len_ = len(this);
-  assert(len(needle) == 1);  // Oil's usage
-  char c = needle->data_[0];
-  for (int i = pos; i < len_; ++i) {
-    if (data_[i] == c) {
+  int needle_len = len(needle);
+  if (needle_len == 1) {
+    char c = needle->data_[0];
+    for (int i = pos; i < len_; ++i) {
+      if (data_[i] == c) {
+        return i;
+      }
+    }
+    return -1;
+  }
+  for (int i = pos; i + needle_len <= len_; ++i) {
+    if (memcmp(data_ + i, needle->data_, needle_len) == 0) {
       return i;
     }
   }
@@ -29,10 +37,18 @@ int BigStr::find(BigStr* needle, int pos) {
 
 int BigStr::rfind(BigStr* needle) {
   int len_ = len(this);
-  assert(len(needle) == 1);  // Oil's usage
-  char c = needle->data_[0];
-  for (int i = len_ - 1; i >= 0; --i) {
-    if (data_[i] == c) {
+  int needle_len = len(needle);
+  if (needle_len == 1) {
+    char c = needle->data_[0];
+    for (int i = len_ - 1; i >= 0; --i) {
+      if (data_[i] == c) {
+        return i;
+      }
+    }
+    return -1;
+  }
+  for (int i = len_ - needle_len; i >= 0; --i) {
+    if (memcmp(data_ + i, needle->data_, needle_len) == 0) {
       return i;
     }
   }
@@ -119,6 +119,18 @@ TEST test_str_find() {
   ASSERT_EQ(4, s->rfind(StrFromC("a")));
   ASSERT_EQ(6, s->rfind(StrFromC("c")));
 
+  // Longer needles
+  ASSERT_EQ(1, s->find(StrFromC("bc")));
+  ASSERT_EQ(5, s->find(StrFromC("bc"), 2));
+  ASSERT_EQ(5, s->rfind(StrFromC("bc")));
+  ASSERT_EQ(-1, s->find(StrFromC("ca")));
+  ASSERT_EQ(-1, s->rfind(StrFromC("abc-abc-")));
+  ASSERT_EQ(0, s->rfind(StrFromC("abc-abc")));
+
+  // Empty needle
+  ASSERT_EQ(3, s->find(kEmptyString, 3));
+  ASSERT_EQ(7, s->rfind(kEmptyString));
+
   PASS();
 }
 
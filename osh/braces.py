@@ -301,7 +301,7 @@ def BraceDetect(w):
         return None
 
     if found:
-        return word.BracedTree(cur_parts)
+        return word.BracedTree(cur_parts, None)
     else:
         return None
 
@@ -501,6 +501,56 @@ def _BraceExpand(parts):
         return _ExpandPart(parts, first_alt_index, suffixes)
 
 
+# Don't keep huge expansions like {1..100000} alive with the LST
+MAX_CACHED_WORDS = 10000
+
+
+def _JoinLiterals(parts):
+    # type: (List[word_part_t]) -> List[word_part_t]
+    """Join plain literal parts into one Id.Lit_Chars token.
+
+    Then words like a/1.txt from a/{1..3}.txt can be evaluated with
+    word_.FastStrEval().  Tokens that may be globbed or are special, like *
+    and a=, are left alone.
+    """
+    if len(parts) <= 1:
+        return parts
+
+    blame_tok = None  # type: Optional[Token]
+    strs = []  # type: List[str]
+    for part in parts:
+        if part.tag() != word_part_e.Literal:
+            return parts
+        tok = cast(Token, part)
+        if tok.id not in (Id.Lit_Chars, Id.Lit_Comma, Id.Lit_Colon,
+                          Id.Lit_Other):
+            return parts
+        if blame_tok is None and tok.line is not None:
+            blame_tok = tok
+        strs.append(tok.tval)
+
+    s = ''.join(strs)
+    if blame_tok is None:
+        t = lexer.DummyToken(Id.Lit_Chars, s)
+    else:
+        # The length matches the joined string, not the source
+        t = Token(Id.Lit_Chars, blame_tok.col, len(s), blame_tok.span_id,
+                  blame_tok.line, s)
+    return [t]
+
+
+def _ExpandTree(w):
+    # type: (word.BracedTree) -> List[CompoundWord]
+    out = []  # type: List[CompoundWord]
+    # Note: for the case of {1..100000}, this is a flat list of Token.
+    # Would be nice to optimize, but we don't really know the structure
+    # ahead of time
+    parts_list = _BraceExpand(w.parts)
+    for p in parts_list:
+        out.append(CompoundWord(_JoinLiterals(p)))
+    return out
+
+
 def BraceExpandWords(words):
     # type: (List[word_t]) -> List[CompoundWord]
     out = []  # type: List[CompoundWord]
@@ -509,12 +559,15 @@ def BraceExpandWords(words):
         with tagswitch(w) as case:
             if case(word_e.BracedTree):
                 w = cast(word.BracedTree, UP_w)
-                # Note: for the case of {1..100000}, this is a flat list of Token.
-                # Would be nice to optimize, but we don't really know the structure
-                # ahead of time
-                parts_list = _BraceExpand(w.parts)
-                for p in parts_list:
-                    out.append(CompoundWord(p))
+                # Expansion only copies parts like $x around; it doesn't
+                # evaluate them.  So the result can be reused on every run of
+                # the command, like a template.
+                expanded = w.expanded
+                if expanded is None:
+                    expanded = _ExpandTree(w)
+                    if len(expanded) <= MAX_CACHED_WORDS:
+                        w.expanded = expanded
+                out.extend(expanded)
 
             elif case(word_e.Compound):
                 w = cast(CompoundWord, UP_w)
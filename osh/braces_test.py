@@ -180,6 +180,37 @@ class BracesTest(unittest.TestCase):
             _PrettyPrint(CompoundWord(parts))
             print('')
 
+    def testBraceExpandWordsReusesExpansion(self):
+        w = _assertReadWord(self, 'B-{a,$x}-{1..3}')
+        tree = braces.BraceDetect(w)
+        self.assertEqual(None, tree.expanded)
+
+        words1 = braces.BraceExpandWords([tree])
+        self.assertEqual(6, len(words1))
+        self.assertEqual(words1, tree.expanded)
+
+        words2 = braces.BraceExpandWords([tree])
+        self.assertEqual(6, len(words2))
+        for w1, w2 in zip(words1, words2):
+            self.assertIs(w1, w2)
+
+        # Too big to keep
+        w = _assertReadWord(self, '{1..%d}' % (braces.MAX_CACHED_WORDS + 1))
+        tree = braces.BraceDetect(w)
+        words = braces.BraceExpandWords([tree])
+        self.assertEqual(braces.MAX_CACHED_WORDS + 1, len(words))
+        self.assertEqual(None, tree.expanded)
+
+    def testBraceExpandWordsJoinsLiterals(self):
+        w = _assertReadWord(self, 'a/{1..3}.txt')
+        words = braces.BraceExpandWords([braces.BraceDetect(w)])
+        self.assertEqual(3, len(words))
+
+        tok = words[1].parts[0]
+        self.assertEqual(1, len(words[1].parts))
+        self.assertEqual('a/2.txt', tok.tval)
+        self.assertEqual(len(tok.tval), tok.length)
+
 
 if __name__ == '__main__':
     unittest.main()
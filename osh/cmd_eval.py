@@ -66,6 +66,7 @@ from _devbuild.gen.types_asdl import redir_arg_type_e
 from _devbuild.gen.value_asdl import (value, value_e, value_t, y_lvalue,
                                       y_lvalue_e, y_lvalue_t, LeftName)
 
+from core import bash_impl
 from core import dev
 from core import error
 from core.error import e_die, e_die_status
@@ -195,10 +196,10 @@ def PlusEquals(old_val, val):
                 to_append = cast(value.BashArray, UP_val)
 
                 # TODO: MUTATE the existing value for efficiency?
-                strs = []  # type: List[str]
-                strs.extend(old_val.strs)
-                strs.extend(to_append.strs)
-                val = value.BashArray(strs)
+                new_val = bash_impl.BashArray_Copy(old_val)
+                bash_impl.BashArray_AppendValues(
+                    new_val, bash_impl.BashArray_GetValues(to_append))
+                val = new_val
 
             else:
                 raise AssertionError()  # parsing should prevent this
@@ -391,8 +392,13 @@ class CommandEvaluator(object):
                                 blame_loc,
                                 show_code=cmd_st.show_code)
 
-    def _EvalRedirect(self, r):
+    def EvalRedirect(self, r):
         # type: (Redir) -> RedirValue
+        """Evaluate one redirect node.  Also used for $(< file).
+
+        Raises:
+          error.RedirectEval
+        """
 
         result = RedirValue(r.op.id, r.op, r.loc, None)
 
@@ -563,7 +569,7 @@ class CommandEvaluator(object):
 
         result = []  # type: List[RedirValue]
         for redir in redirects:
-            result.append(self._EvalRedirect(redir))
+            result.append(self.EvalRedirect(redir))
 
         return result
 
@@ -1330,7 +1336,7 @@ class CommandEvaluator(object):
                 node.name, node.name_tok)
         self.procs[node.name] = value.Proc(node.name, node.name_tok,
                                            proc_sig.Open, node.body, None,
-                                           True)
+                                           True, None)
 
     def _DoProc(self, node):
         # type: (Proc) -> None
@@ -1347,8 +1353,10 @@ class CommandEvaluator(object):
             proc_defaults = None
 
         # no dynamic scope
+        layout = func_proc.ResolveProcLocals(node)
         self.procs[proc_name] = value.Proc(proc_name, node.name, node.sig,
-                                           node.body, proc_defaults, False)
+                                           node.body, proc_defaults, False,
+                                           layout)
 
     def _DoFunc(self, node):
         # type: (Func) -> None
@@ -1369,7 +1377,9 @@ class CommandEvaluator(object):
 
         pos_defaults, named_defaults = func_proc.EvalFuncDefaults(
             self.expr_ev, node)
-        func_val = value.Func(name, node, pos_defaults, named_defaults, None)
+        layout = func_proc.ResolveFuncLocals(node)
+        func_val = value.Func(name, node, pos_defaults, named_defaults, None,
+                              layout)
 
         self.mem.SetNamed(lval,
                           func_val,
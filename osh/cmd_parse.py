@@ -1002,6 +1002,16 @@ class CommandParser(object):
 
         code_str = ''.join(expanded)
 
+        # Only cache the outermost expansion.  Nested expansions append to the
+        # shared aliases_in_flight list, which affects the rest of the parse.
+        parse_cache = self.parse_ctx.parse_cache
+        cache_key = None  # type: Optional[str]
+        if parse_cache and len(self.aliases_in_flight) == 0:
+            cache_key = parse_cache.AliasKey(code_str, aliases_in_flight)
+            cached = parse_cache.GetAlias(cache_key)
+            if cached:
+                return cached
+
         # TODO:
         # Aliases break static parsing (like backticks), so use our own Arena.
         # This matters for Hay, which calls SaveLinesAndDiscard().
@@ -1029,6 +1039,9 @@ class CommandParser(object):
                     # We don't need more handling here/
                     raise
 
+        if cache_key is not None:
+            parse_cache.PutAlias(cache_key, node, src)
+
         if 0:
             log('AFTER expansion:')
             node.PrettyPrint()
@@ -1655,7 +1668,7 @@ class CommandParser(object):
         # Id.Lit_RBrace.
         ate = self._Eat(Id.Op_RBrace)
         arms_end = word_.AsOperatorToken(ate)
-        arms_end.id = Id.Lit_RBrace
+        self.arena.SetTokenId(arms_end, Id.Lit_RBrace)
 
         return command.Case(case_kw, to_match, arms_start, arms, arms_end,
                             None)
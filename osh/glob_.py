@@ -11,11 +11,18 @@ from _devbuild.gen.syntax_asdl import (
     glob_part_e,
     glob_part_t,
 )
+from core import pyos
 from core import pyutil
+from core import util
 from frontend import match
+from mycpp import mylib
 from mycpp.mylib import log, print_stderr
+from pylib import path_stat
 
-from typing import List, Tuple, cast, TYPE_CHECKING
+import posix_ as posix
+import time as time_
+
+from typing import Dict, List, Optional, Tuple, cast, TYPE_CHECKING
 if TYPE_CHECKING:
     from core import optview
     from frontend.match import SimpleLexer
@@ -382,6 +389,53 @@ def GlobToERE(pat):
 # - See 2 calls in osh/word_eval.py
 
 
+class _GlobPattern(object):
+    """A glob pattern split into path components, so it's only parsed once."""
+
+    def __init__(self, comps, magic):
+        # type: (List[str], List[bool]) -> None
+        self.comps = comps  # passed to fnmatch() if magic[i]
+        self.magic = magic
+
+
+def _CompileGlob(glob_pat, fnmatch_pat):
+    # type: (str, str) -> Optional[_GlobPattern]
+    """Split a pattern on /, and find the components that need fnmatch().
+
+    For extended globs, glob_pat has * in place of each @(a|b), and
+    fnmatch_pat is matched.  Returns None if libc.glob() should handle the
+    pattern instead.
+    """
+    if '\\/' in fnmatch_pat:
+        return None
+
+    glob_comps = glob_pat.split('/')
+    comps = fnmatch_pat.split('/')
+    if len(comps) != len(glob_comps):
+        return None  # e.g. a / inside @(a/b|c)
+
+    magic = []  # type: List[bool]
+    for comp in glob_comps:
+        # fnmatch() removes any backslashes in a literal component
+        magic.append(LooksLikeGlob(comp) or '\\' in comp)
+    return _GlobPattern(comps, magic)
+
+
+class _DirListing(object):
+    """The names in a directory, as of its last change."""
+
+    def __init__(self, key, names):
+        # type: (str, List[str]) -> None
+        self.key = key  # from pyos.MakeDirCacheKey()
+        self.names = names
+
+        # Computed lazily
+        self.matches = {}  # type: Dict[str, List[str]]
+        self.name_set = None  # type: Optional[Dict[str, bool]]
+        self.subdirs = None  # type: Optional[List[str]]
+        self.dir_links = None  # type: Optional[List[str]]
+
+
 class Globber(object):
     def __init__(self, exec_opts):
         # type: (optview.Exec) -> None
@@ -390,18 +444,245 @@ class Globber(object):
         # Other unimplemented bash options:
         #
         # dotglob           dotfiles are matched
-        # globstar          ** for directories
         # globasciiranges   ascii or unicode char classes (unicode by default)
         # nocaseglob
-        # extglob          the @() !() syntax -- libc helps us with fnmatch(), but
-        #                  not glob().
         #
         # NOTE: Bash also respects the GLOBIGNORE variable, but no other shells
         # do.  Could a default GLOBIGNORE to ignore flags on the file system be
         # part of the security solution?  It doesn't seem totally sound.
 
-    def _Glob(self, arg, out):
-        # type: (str, List[str]) -> int
+        self.pattern_lru = util.Lru('glob', 1000)
+        self.patterns = {}  # type: Dict[str, Optional[_GlobPattern]]
+
+        # Directory listings, keyed by absolute path.  An entry is used only
+        # if pyos.MakeDirCacheKey() of the dir hasn't changed, and shopt -u
+        # glob_dir_cache turns it off.
+        self.dirs_lru = util.Lru('glob-dirs', 100)
+        self.dirs = {}  # type: Dict[str, _DirListing]
+
+        # Set for each expansion
+        self.cwd = ''
+        self.now = 0
+
+    def _Compile(self, glob_pat, fnmatch_pat):
+        # type: (str, str) -> Optional[_GlobPattern]
+
+        # The key is fnmatch_pat, since glob_pat is derived from it
+        if self.pattern_lru.Lookup(fnmatch_pat):
+            return self.patterns[fnmatch_pat]
+
+        pat = _CompileGlob(glob_pat, fnmatch_pat)
+        evicted = self.pattern_lru.Insert(fnmatch_pat)
+        if evicted is not None:
+            mylib.dict_erase(self.patterns, evicted)
+        self.patterns[fnmatch_pat] = pat
+        return pat
+
+    def _Listing(self, prefix, must_list):
+        # type: (str, bool) -> Optional[_DirListing]
+        """Returns the names in a directory, or None if it can't be listed.
+
+        A listing that can't be cached is only made if must_list is true.
+        """
+        path = prefix if len(prefix) else '.'
+        try:
+            key, mtime = pyos.MakeDirCacheKey(path)
+        except (IOError, OSError) as e:
+            return None
+
+        use_cache = self.exec_opts.glob_dir_cache()
+        abs_path = ''
+        if use_cache:
+            if len(prefix) == 0:
+                abs_path = self.cwd
+            elif prefix.startswith('/'):
+                abs_path = prefix
+            elif len(self.cwd):
+                abs_path = self.cwd + '/' + prefix
+            # else we couldn't get the current dir, so don't cache
+
+        if len(abs_path) and self.dirs_lru.Lookup(abs_path):
+            listing = self.dirs[abs_path]
+            if listing.key == key:
+                return listing
+            self.dirs_lru.CountStale()
+
+        # Like SearchPath in core/state.py, don't cache a listing made in the
+        # same second the dir changed
+        can_keep = len(abs_path) != 0 and mtime < self.now
+        if not can_keep:
+            if abs_path in self.dirs:
+                self.dirs_lru.Remove(abs_path)
+                mylib.dict_erase(self.dirs, abs_path)
+            if not must_list:
+                return None
+
+        try:
+            names = posix.listdir(path)
+        except (IOError, OSError) as e:
+            return None  # e.g. a file, or a dir we can search but not read
+
+        listing = _DirListing(key, names)
+        if can_keep:
+            evicted = self.dirs_lru.Insert(abs_path)
+            if evicted is not None:
+                mylib.dict_erase(self.dirs, evicted)
+            self.dirs[abs_path] = listing
+        return listing
+
+    def _Exists(self, prefix, name):
+        # type: (str, str) -> bool
+        """Does the literal last component of a pattern exist?"""
+        if len(name) == 0:  # pattern ends with /
+            return len(prefix) != 0 and path_stat.isdir(prefix)
+
+        if name == '.' or name == '..':  # not in listings
+            return path_stat.exists(prefix + name)
+
+        listing = self._Listing(prefix, False)
+        if listing is None:
+            # One lstat() is cheaper than a listing we can't keep
+            return path_stat.lexists(prefix + name)
+
+        if listing.name_set is None:
+            listing.name_set = {}
+            for s in listing.names:
+                listing.name_set[s] = True
+        # Unlike stat(), this finds broken symlinks, as glob() does
+        return name in listing.name_set
+
+    def _MatchDir(self, prefix, comp, last, out):
+        # type: (str, str, bool, List[str]) -> None
+        listing = self._Listing(prefix, True)
+        if listing is None:
+            return
+
+        # The names matched by a component don't change until the listing does
+        names = listing.matches.get(comp)
+        if names is None:
+            names = []
+            # Like glob(), only a pattern starting with . matches hidden names,
+            # including . and ..
+            dot_ok = comp.startswith('.') or comp.startswith('\\.')
+            if dot_ok:
+                for name in ['.', '..']:
+                    if libc.fnmatch(comp, name):
+                        names.append(name)
+
+            for name in listing.names:
+                if name.startswith('.') and not dot_ok:
+                    continue
+                if libc.fnmatch(comp, name):
+                    names.append(name)
+            listing.matches[comp] = names
+
+        for name in names:
+            out.append(prefix + name if last else prefix + name + '/')
+
+    def _Subdirs(self, prefix, listing):
+        # type: (str, _DirListing) -> List[str]
+        """Dirs that ** descends into.
+
+        Like bash, it skips hidden dirs, and doesn't follow symlinks.  They're
+        saved in listing.dir_links.
+        """
+        if listing.subdirs is None:
+            listing.subdirs = []
+            listing.dir_links = []
+            for name in listing.names:
+                if name.startswith('.'):
+                    continue
+                path = prefix + name
+                if path_stat.islink(path):
+                    if path_stat.isdir(path):
+                        listing.dir_links.append(name)
+                elif path_stat.isdir(path):
+                    listing.subdirs.append(name)
+        return listing.subdirs
+
+    def _Walk(self, prefix, dirs_only, with_links, out):
+        # type: (str, bool, bool, List[str]) -> None
+        """Append the files or dirs under prefix.
+
+        If with_links is true, symlinks to dirs are included but not walked,
+        as bash does for a pattern ending with **/
+        """
+        listing = self._Listing(prefix, True)
+        if listing is None:
+            return
+
+        if not dirs_only:
+            for name in listing.names:
+                if not name.startswith('.'):
+                    out.append(prefix + name)
+
+        subdirs = self._Subdirs(prefix, listing)
+        if with_links:
+            dir_links = listing.dir_links
+            assert dir_links is not None  # set by _Subdirs()
+            for name in dir_links:
+                out.append(prefix + name + '/')
+
+        for name in subdirs:
+            sub = prefix + name + '/'
+            if dirs_only:
+                out.append(sub)
+            self._Walk(sub, dirs_only, with_links, out)
+
+    def _MatchPattern(self, pat):
+        # type: (_GlobPattern) -> List[str]
+        """Match each component against the names in the dirs matched so
+        far."""
+        paths = ['']  # each path is empty or ends with /
+        literal = True  # have all the components so far been literal?
+        n = len(pat.comps)
+        for i in xrange(n):
+            comp = pat.comps[i]
+            last = i == n - 1
+
+            matched = []  # type: List[str]
+            for prefix in paths:
+                if not pat.magic[i]:
+                    if not last:
+                        matched.append(prefix + comp + '/')
+                    elif self._Exists(prefix, comp):
+                        matched.append(prefix + comp)
+
+                elif comp == '**' and self.exec_opts.globstar():
+                    # ** matches zero or more dirs.  At the end, it matches
+                    # every file under them too.
+                    if last:
+                        if len(prefix) == 0:
+                            self._Walk(prefix, False, False, matched)
+                        elif path_stat.isdir(prefix):
+                            # Like bash, the dir keeps its / only if it was
+                            # written out, as in a/**, and not matched, as in
+                            # */** or **/**
+                            matched.append(prefix if literal else prefix[:-1])
+                            self._Walk(prefix, False, False, matched)
+                    else:
+                        # Like bash, **/ matches symlinks to dirs, but
+                        # **/foo doesn't look inside them
+                        with_links = i == n - 2 and len(pat.comps[n - 1]) == 0
+                        matched.append(prefix)
+                        self._Walk(prefix, True, with_links, matched)
+
+                else:
+                    self._MatchDir(prefix, comp, last, matched)
+            paths = matched
+            if pat.magic[i]:
+                literal = False
+
+        # Sort like glob(), and remove duplicates from **/**
+        paths.sort()
+        results = []  # type: List[str]
+        for path in paths:
+            if len(results) == 0 or path != results[-1]:
+                results.append(path)
+        return results
+
+    def _LibcGlob(self, arg):
+        # type: (str) -> List[str]
         try:
             results = libc.glob(arg)
         except RuntimeError as e:
@@ -413,6 +694,34 @@ class Globber(object):
             print_stderr("Error expanding glob %r: %s" % (arg, msg))
             raise
         #log('glob %r -> %r', arg, g)
+        return results
+
+    def _Glob(self, arg, out):
+        # type: (str, List[str]) -> int
+        return self._GlobExtended(arg, arg, out)
+
+    def _GlobExtended(self, glob_pat, fnmatch_pat, out):
+        # type: (str, str, List[str]) -> int
+
+        # A ( that isn't part of an extended glob is literal to glob(), but
+        # fnmatch() is always called with FNM_EXTMATCH
+        pat = None  # type: Optional[_GlobPattern]
+        if '(' not in glob_pat:
+            pat = self._Compile(glob_pat, fnmatch_pat)
+
+        if pat is not None:
+            if self.exec_opts.glob_dir_cache():
+                try:
+                    self.cwd = posix.getcwd()
+                except (IOError, OSError) as e:
+                    self.cwd = ''
+                self.now = int(time_.time())
+            results = self._MatchPattern(pat)
+        else:
+            results = self._LibcGlob(glob_pat)
+            if fnmatch_pat != glob_pat:
+                tmp = [s for s in results if libc.fnmatch(fnmatch_pat, s)]
+                results = tmp
 
         n = len(results)
         if n:  # Something matched
@@ -464,13 +773,8 @@ class Globber(object):
             out.append(fnmatch_pat)
             return 1
 
-        tmp = []  # type: List[str]
-        self._Glob(glob_pat, tmp)
-        filtered = [s for s in tmp if libc.fnmatch(fnmatch_pat, s)]
-        n = len(filtered)
-
+        n = self._GlobExtended(glob_pat, fnmatch_pat, out)
         if n:
-            out.extend(filtered)
             return n
 
         if self.exec_opts.failglob():
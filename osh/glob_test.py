@@ -4,9 +4,13 @@ glob_test.py: Tests for glob.py
 """
 from __future__ import print_function
 
+import os
 import re
+import shutil
+import tempfile
 import unittest
 
+from core import state
 from frontend import match
 from osh import glob_
 
@@ -154,5 +158,118 @@ class GlobParserTest(unittest.TestCase):
             print('warnings: %s' % warnings)
 
 
+class GlobberTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        for path in ['a.c', 'b.c', '.h.c', 'd/f.c', 'd/sub/s.c', 'e/x.py']:
+            path = os.path.join(self.tmp, path)
+            if not os.path.isdir(os.path.dirname(path)):
+                os.makedirs(os.path.dirname(path))
+            open(path, 'w').close()
+        os.symlink('d', os.path.join(self.tmp, 'link'))
+
+        self.old_cwd = os.getcwd()
+        os.chdir(self.tmp)
+
+        mem = state.Mem('', [], None, [])
+        _, exec_opts, self.mutable_opts = state.MakeOpts(mem, None)
+        self.globber = glob_.Globber(exec_opts)
+
+    def tearDown(self):
+        os.chdir(self.old_cwd)
+        shutil.rmtree(self.tmp)
+
+    def _Expand(self, pat):
+        out = []
+        self.globber.Expand(pat, out)
+        return out
+
+    def testExpand(self):
+        self.assertEqual(['a.c', 'b.c'], self._Expand('*.c'))
+        self.assertEqual(['.', '..', '.h.c'], self._Expand('.*'))
+        self.assertEqual(['d/', 'e/', 'link/'], self._Expand('*/'))
+        self.assertEqual(['d/f.c', 'link/f.c'], self._Expand('*/f.c'))
+        self.assertEqual(['d//f.c'], self._Expand('d//[f].c'))
+        self.assertEqual(['d/sub/s.c', 'link/sub/s.c'],
+                         self._Expand('*/sub/*'))
+
+        abs_pat = os.path.join(self.tmp, '[ab].c')
+        self.assertEqual([os.path.join(self.tmp, 'a.c'),
+                          os.path.join(self.tmp, 'b.c')],
+                         self._Expand(abs_pat))
+
+        # No match
+        self.assertEqual(['*.z'], self._Expand('*.z'))
+
+        out = []
+        self.globber.ExpandExtended('*/*', '*/@(f.c|x.py)', out)
+        self.assertEqual(['d/f.c', 'e/x.py', 'link/f.c'], out)
+
+    def testGlobStar(self):
+        # Without globstar, ** is like *
+        self.assertEqual(['d/f.c', 'link/f.c'], self._Expand('**/*.c'))
+
+        self.mutable_opts.SetAnyOption('globstar', True)
+        self.assertEqual(['a.c', 'b.c', 'd/f.c', 'd/sub/s.c'],
+                         self._Expand('**/*.c'))
+        self.assertEqual(['d/', 'd/f.c', 'd/sub', 'd/sub/s.c'],
+                         self._Expand('d/**'))
+        # A dir that was matched has no trailing /, and appears once
+        self.assertEqual(['d', 'd/f.c', 'd/sub', 'd/sub/s.c'],
+                         self._Expand('[d]/**'))
+        self.assertEqual(['d', 'd/f.c', 'd/sub', 'd/sub/s.c'],
+                         self._Expand('d/**/**'))
+
+        # Like bash, **/ matches a symlink to a dir, but doesn't walk it
+        self.assertEqual(['d/', 'd/sub/', 'e/', 'link/'], self._Expand('**/'))
+        self.assertEqual(['link/', 'link/sub/'], self._Expand('l*/**/'))
+        self.assertEqual(['d/sub/s.c'], self._Expand('**/s.c'))
+
+    def testExists(self):
+        os.symlink('nonexistent', os.path.join(self.tmp, 'd/broken'))
+
+        # The dir was just modified, so it's checked with lstat() instead of
+        # a listing that can't be cached
+        self.assertEqual(['d/broken'], self._Expand('[d]/broken'))
+        self.assertEqual(['[d]/nope'], self._Expand('[d]/nope'))
+        self.assertEqual(0, self.globber.dirs_lru.Size())
+
+        os.utime(os.path.join(self.tmp, 'd'), (1000, 1000))
+        self.assertEqual(['d/broken'], self._Expand('[d]/broken'))
+        self.assertEqual(1, self.globber.dirs_lru.Size())
+
+    def testDirCache(self):
+        # Make the dir look old, so its listing is cached
+        os.utime(self.tmp, (1000, 1000))
+        self.assertEqual(['a.c', 'b.c'], self._Expand('*.c'))
+        self.assertEqual(1, self.globber.dirs_lru.Size())
+
+        open('c.c', 'w').close()
+        self.assertEqual(['a.c', 'b.c', 'c.c'], self._Expand('*.c'))
+
+        os.utime(self.tmp, (2000, 2000))
+        os.remove('a.c')
+        os.utime(self.tmp, (2000, 2000))
+        self.assertEqual(['b.c', 'c.c'], self._Expand('*.c'))
+        key = self.globber.dirs[self.tmp].key
+
+        self.mutable_opts.SetAnyOption('glob_dir_cache', False)
+        os.utime(self.tmp, (3000, 3000))
+        self.assertEqual(['b.c', 'c.c'], self._Expand('*.c'))
+        self.assertEqual(key, self.globber.dirs[self.tmp].key)
+
+    def testDirCacheRename(self):
+        # Another dir renamed to the same path, with the same mtime
+        os.utime('e', (1000, 1000))
+        self.assertEqual(['e/x.py'], self._Expand('e/*'))
+        self.assertEqual(1, self.globber.dirs_lru.Size())
+
+        os.rename('e', 'old-e')
+        os.mkdir('e')
+        open('e/y.py', 'w').close()
+        os.utime('e', (1000, 1000))
+        self.assertEqual(['e/y.py'], self._Expand('e/*'))
+
+
 if __name__ == '__main__':
     unittest.main()
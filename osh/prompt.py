@@ -16,6 +16,7 @@ from core import error
 from core import pyos
 from core import state
 from core import ui
+from core import util
 from frontend import consts
 from frontend import match
 from frontend import reader
@@ -118,7 +119,9 @@ class Evaluator(object):
         # These caches should reduce memory pressure a bit.  We don't want to
         # reparse the prompt twice every time you hit enter.
         self.tokens_cache = {}  # type: Dict[str, List[Tuple[Id_t, str]]]
+        self.tokens_lru = util.Lru('prompt-tokens', 100)
         self.parse_cache = {}  # type: Dict[str, CompoundWord]
+        self.parse_lru = util.Lru('prompt-parse', 100)
 
     def CheckCircularDeps(self):
         # type: () -> None
@@ -260,9 +263,13 @@ class Evaluator(object):
         val = cast(value.Str, UP_val)
 
         # Parse backslash escapes (cached)
-        tokens = self.tokens_cache.get(val.s)
-        if tokens is None:
+        if self.tokens_lru.Lookup(val.s):
+            tokens = self.tokens_cache[val.s]
+        else:
             tokens = match.Ps1Tokens(val.s)
+            evicted = self.tokens_lru.Insert(val.s)
+            if evicted is not None:
+                mylib.dict_erase(self.tokens_cache, evicted)
             self.tokens_cache[val.s] = tokens
 
         # Replace values.
@@ -271,14 +278,18 @@ class Evaluator(object):
         # Parse it like a double-quoted word (cached).  TODO: This could be done on
         # mem.SetValue(), so we get the error earlier.
         # NOTE: This is copied from the PS4 logic in Tracer.
-        ps1_word = self.parse_cache.get(ps1_str)
-        if ps1_word is None:
+        if self.parse_lru.Lookup(ps1_str):
+            ps1_word = self.parse_cache[ps1_str]
+        else:
             w_parser = self.parse_ctx.MakeWordParserForPlugin(ps1_str)
             try:
                 ps1_word = w_parser.ReadForPlugin()
             except error.Parse as e:
                 ps1_word = word_.ErrorWord("<ERROR: Can't parse PS1: %s>" %
                                            e.UserErrorString())
+            evicted = self.parse_lru.Insert(ps1_str)
+            if evicted is not None:
+                mylib.dict_erase(self.parse_cache, evicted)
             self.parse_cache[ps1_str] = ps1_word
 
         # Evaluate, e.g. "${debian_chroot}\u" -> '\u'
@@ -340,6 +351,7 @@ class UserPlugin(object):
 
         self.arena = parse_ctx.arena
         self.parse_cache = {}  # type: Dict[str, command_t]
+        self.parse_lru = util.Lru('prompt-command', 100)
 
     def Run(self):
         # type: () -> None
@@ -350,8 +362,9 @@ class UserPlugin(object):
         # PROMPT_COMMAND almost never changes, so we try to cache its parsing.
         # This avoids memory allocations.
         prompt_cmd = cast(value.Str, val).s
-        node = self.parse_cache.get(prompt_cmd)
-        if node is None:
+        if self.parse_lru.Lookup(prompt_cmd):
+            node = self.parse_cache[prompt_cmd]
+        else:
             line_reader = reader.StringLineReader(prompt_cmd, self.arena)
             c_parser = self.parse_ctx.MakeOshParser(line_reader)
 
@@ -364,6 +377,9 @@ class UserPlugin(object):
                     self.errfmt.PrettyPrintError(e)
                     return  # don't execute
 
+            evicted = self.parse_lru.Insert(prompt_cmd)
+            if evicted is not None:
+                mylib.dict_erase(self.parse_cache, evicted)
             self.parse_cache[prompt_cmd] = node
 
         # Save this so PROMPT_COMMAND can't set $?
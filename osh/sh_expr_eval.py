@@ -45,6 +45,7 @@ from _devbuild.gen.value_asdl import (
     RegexMatch,
 )
 from core import alloc
+from core import bash_impl
 from core import error
 from core.error import e_die, e_die_status, e_strict, e_usage
 from core import state
@@ -137,7 +138,7 @@ def OldValue(lval, mem, exec_opts):
             array_val = None  # type: value.BashArray
             with tagswitch(val) as case2:
                 if case2(value_e.Undef):
-                    array_val = value.BashArray([])
+                    array_val = bash_impl.BashArray_FromList([])
                 elif case2(value_e.BashArray):
                     tmp = cast(value.BashArray, UP_val)
                     # mycpp rewrite: add tmp.  cast() creates a new var in inner scope
@@ -145,7 +146,7 @@ def OldValue(lval, mem, exec_opts):
                 else:
                     e_die("Can't use [] on value of type %s" % ui.ValType(val))
 
-            s = word_eval.GetArrayItem(array_val.strs, lval.index)
+            s = bash_impl.BashArray_GetItem(array_val, lval.index)
 
             if s is None:
                 val = value.Str('')  # NOTE: Other logic is value.Undef?  0?
@@ -678,7 +679,7 @@ class ArithEvaluator(object):
                         if case(value_e.BashArray):
                             array_val = cast(value.BashArray, UP_left)
                             index = self.EvalToInt(node.right)
-                            s = word_eval.GetArrayItem(array_val.strs, index)
+                            s = bash_impl.BashArray_GetItem(array_val, index)
 
                         elif case(value_e.BashAssoc):
                             left = cast(value.BashAssoc, UP_left)
@@ -31,6 +31,7 @@ from _devbuild.gen.runtime_asdl import ( scope_e, span_e, emit_i,
 from _devbuild.gen.value_asdl import (value, value_e, value_t)
 from mycpp.mylib import log
 from core import pyutil
+from core import util
 from frontend import consts
 from mycpp import mylib
 from mycpp.mylib import tagswitch
@@ -97,6 +98,7 @@ class SplitContext(object):
         # Split into (ifs_whitespace, ifs_other)
         self.splitters = {
         }  # type: Dict[str, IfsSplitter]  # aka IFS value -> splitter instance
+        self.splitters_lru = util.Lru('ifs', 100)
 
     def _GetSplitter(self, ifs=None):
         # type: (str) -> IfsSplitter
@@ -117,8 +119,9 @@ class SplitContext(object):
                     # TODO: Raise proper error
                     raise AssertionError("IFS shouldn't be an array")
 
-        sp = self.splitters.get(ifs)
-        if sp is None:
+        if self.splitters_lru.Lookup(ifs):
+            sp = self.splitters[ifs]
+        else:
             # Figure out what kind of splitter we should instantiate.
 
             ifs_whitespace = mylib.BufWriter()
@@ -135,6 +138,9 @@ class SplitContext(object):
             # NOTE: Technically, we could make the key more precise.  IFS=$' \t' is
             # the same as IFS=$'\t '.  But most programs probably don't do that, and
             # everything should work in any case.
+            evicted = self.splitters_lru.Insert(ifs)
+            if evicted is not None:
+                mylib.dict_erase(self.splitters, evicted)
             self.splitters[ifs] = sp
 
         return sp
@@ -170,6 +176,23 @@ class SplitContext(object):
 
         raise AssertionError('for -Wreturn-type in C++')
 
+    def IfsIsDefault(self):
+        # type: () -> bool
+        """Is IFS unset or ' \t\n'?
+
+        For the word evaluator's fast path, which doesn't split.
+        """
+        val = self.mem.GetValue('IFS', scope_e.Dynamic)
+        UP_val = val
+        with tagswitch(val) as case:
+            if case(value_e.Undef):
+                return True
+            elif case(value_e.Str):
+                val = cast(value.Str, UP_val)
+                return val.s == DEFAULT_IFS
+            else:
+                return False
+
     def Escape(self, s):
         # type: (str) -> str
         """Escape IFS chars."""
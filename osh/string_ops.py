@@ -12,17 +12,20 @@ YSH:
     Pass x => sub('a*', 'b', :ALL) => var y
 """
 
-from _devbuild.gen.id_kind_asdl import Id
+from _devbuild.gen.id_kind_asdl import Id, Id_t
 from _devbuild.gen.syntax_asdl import loc, Token, suffix_op
+from core import error
 from core import pyutil
 from core import ui
+from core import util
 from core.error import e_die, e_strict
+from mycpp import mylib
 from mycpp.mylib import log
 from osh import glob_
 
 import libc
 
-from typing import List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 _ = log
 
@@ -202,6 +205,143 @@ def AdvanceUtf8Chars(s, num_chars, byte_offset):
     return i
 
 
+# Strings shorter than this are decoded each time, since it's cheap
+_MIN_INDEX_LEN = 32
+# The byte offset of every Nth character is saved
+_INDEX_STRIDE = 64
+
+
+class _Utf8Index(object):
+    """Character positions in a valid UTF-8 string."""
+
+    def __init__(self, num_chars, offsets):
+        # type: (int, Optional[List[int]]) -> None
+        self.num_chars = num_chars
+        # Byte offsets of characters 0, _INDEX_STRIDE, ..., or None if the
+        # string is ASCII
+        self.offsets = offsets
+
+
+def _MakeUtf8Index(s):
+    # type: (str) -> Optional[_Utf8Index]
+    """Returns None if s isn't valid UTF-8."""
+    num_bytes = len(s)
+    i = 0
+    while i < num_bytes and ord(s[i]) < 0x80:
+        i += 1
+    if i == num_bytes:
+        return _Utf8Index(num_bytes, None)
+
+    offsets = []  # type: List[int]
+    num_chars = 0
+    i = 0
+    try:
+        while i < num_bytes:
+            if num_chars % _INDEX_STRIDE == 0:
+                offsets.append(i)
+            i = _NextUtf8Char(s, i)
+            num_chars += 1
+    except error.Strict as e:
+        return None
+    return _Utf8Index(num_chars, offsets)
+
+
+class Utf8Cache(object):
+    """Indexes long strings, so ${#s} and ${s:i:n} don't decode them from the
+    start each time.
+
+    For an ASCII string, characters are bytes.  Otherwise the index has a
+    checkpoint every _INDEX_STRIDE characters.  A string that isn't valid
+    UTF-8 isn't indexed, so errors are reported as before.
+    """
+
+    def __init__(self):
+        # type: () -> None
+        self.lru = util.Lru('utf8-index', 100)
+        self.indexes = {}  # type: Dict[str, Optional[_Utf8Index]]
+
+    def _Get(self, s):
+        # type: (str) -> Optional[_Utf8Index]
+        if len(s) < _MIN_INDEX_LEN:
+            return None
+
+        if self.lru.Lookup(s):
+            return self.indexes[s]
+
+        index = _MakeUtf8Index(s)
+        evicted = self.lru.Insert(s)
+        if evicted is not None:
+            mylib.dict_erase(self.indexes, evicted)
+        self.indexes[s] = index
+        return index
+
+    def CountChars(self, s):
+        # type: (str) -> int
+        """Like CountUtf8Chars()."""
+        index = self._Get(s)
+        if index is None:
+            return CountUtf8Chars(s)
+        return index.num_chars
+
+    def _ByteOffset(self, s, index, char_pos):
+        # type: (str, _Utf8Index, int) -> int
+        if char_pos >= index.num_chars:
+            return len(s)
+        if index.offsets is None:
+            return char_pos
+
+        i = index.offsets[char_pos // _INDEX_STRIDE]
+        for _ in xrange(char_pos % _INDEX_STRIDE):
+            i = _NextUtf8Char(s, i)
+        return i
+
+    def Slice(self, s, begin, length, has_length):
+        # type: (str, int, int, bool) -> str
+        """Returns the characters of ${s:begin:length}.
+
+        Negative values count from the end.
+        """
+        index = self._Get(s)
+        if index is not None:
+            # Positions before the start are handled below
+            char_begin = begin if begin >= 0 else index.num_chars + begin
+            if char_begin >= 0:
+                byte_begin = self._ByteOffset(s, index, char_begin)
+                if not has_length:
+                    return s[byte_begin:]
+
+                if length >= 0:
+                    char_end = char_begin + length
+                else:
+                    char_end = index.num_chars + length  # a position
+                if char_end >= 0:
+                    byte_end = self._ByteOffset(s, index, char_end)
+                    return s[byte_begin:byte_end]
+
+        n = len(s)
+        if begin < 0:  # Compute offset with unicode
+            byte_begin = n
+            num_iters = -begin
+            for _ in xrange(num_iters):
+                byte_begin = PreviousUtf8Char(s, byte_begin)
+        else:
+            byte_begin = AdvanceUtf8Chars(s, begin, 0)
+
+        if has_length:
+            if length < 0:  # Compute offset with unicode
+                # Confusing: this is a POSITION
+                byte_end = n
+                num_iters = -length
+                for _ in xrange(num_iters):
+                    byte_end = PreviousUtf8Char(s, byte_end)
+            else:
+                byte_end = AdvanceUtf8Chars(s, length, byte_begin)
+        else:
+            byte_end = n
+
+        return s[byte_begin:byte_end]
+
+
 # Implementation without Python regex:
 #
 # (1) PatSub: I think we fill in GlobToExtendedRegex, then use regcomp and
@@ -229,6 +369,150 @@ def AdvanceUtf8Chars(s, num_chars, byte_offset):
 # - Compile time errors for [[:space:]] ?
 
 
+def _IsValidUtf8(s, begin, end):
+    # type: (str, int, int) -> bool
+    """Is s[begin:end] made of whole, valid UTF-8 characters?"""
+    i = begin
+    try:
+        while i < end:
+            if ord(s[i]) < 0x80:
+                i += 1
+            else:
+                i = _NextUtf8Char(s, i)
+    except error.Strict as e:
+        return False
+    return i == end
+
+
+# Patterns for ${x#pat} and family that are matched by comparing bytes
+_STAR = 0  # *
+_STAR_LITERAL = 1  # */ or *.c
+_LITERAL_STAR = 2  # /* or .*
+_OTHER_PATTERN = 3
+
+
+def _ParseAffixPattern(pat):
+    # type: (str) -> Tuple[int, str]
+    """Returns the kind of pattern, and its unescaped literal part."""
+    n = len(pat)
+    leading_star = False
+    trailing_star = False
+    lit = []  # type: List[str]
+
+    i = 0
+    while i < n:
+        c = pat[i]
+        if c == '\\':
+            if i == n - 1:
+                return _OTHER_PATTERN, ''
+            lit.append(pat[i + 1])
+            i += 2
+            continue
+
+        if c == '*':
+            if i == 0:
+                leading_star = True
+            elif i == n - 1:
+                trailing_star = True
+            else:
+                return _OTHER_PATTERN, ''
+        elif c in '?[(':  # ( for extended globs like @(a|b)
+            return _OTHER_PATTERN, ''
+        else:
+            lit.append(c)
+        i += 1
+
+    s = ''.join(lit)
+    if len(s) == 0:
+        if leading_star:  # * or **
+            return _STAR, ''
+        return _OTHER_PATTERN, ''
+
+    # A literal that isn't UTF-8 could match part of a character
+    if not _IsValidUtf8(s, 0, len(s)):
+        return _OTHER_PATTERN, ''
+
+    if leading_star and not trailing_star:
+        return _STAR_LITERAL, s
+    if trailing_star and not leading_star:
+        return _LITERAL_STAR, s
+    return _OTHER_PATTERN, ''
+
+
+def _StripAffix(s, id_, kind, lit):
+    # type: (str, Id_t, int, str) -> int
+    """Find ${s#pat} and family without calling fnmatch().
+
+    Returns the position to strip at: the result is s[pos:] for # and ##, and
+    s[:pos] for % and %%.  Returns -1 if the loop in DoUnarySuffixOp() must
+    run, because it would have checked invalid UTF-8.
+    """
+    n = len(s)
+    lit_len = len(lit)
+    pos = -1  # no match
+    begin = 0  # The loop would have checked the chars in s[begin:end]
+    end = 0
+
+    if id_ == Id.VOp1_Pound:  # shortest prefix
+        if kind == _STAR:
+            return 0
+        elif kind == _STAR_LITERAL:
+            j = s.find(lit)
+            if j != -1:
+                pos = j + lit_len
+                end = pos
+        else:
+            if s.startswith(lit):
+                return lit_len
+
+    elif id_ == Id.VOp1_DPound:  # longest prefix
+        if kind == _STAR:
+            return n
+        elif kind == _STAR_LITERAL:
+            j = s.rfind(lit)
+            if j != -1:
+                pos = j + lit_len
+                begin = pos
+                end = n
+        else:
+            if s.startswith(lit):
+                return n
+
+    elif id_ == Id.VOp1_Percent:  # shortest suffix
+        if kind == _STAR:
+            return n
+        elif kind == _STAR_LITERAL:
+            if s.endswith(lit):
+                return n - lit_len
+        else:
+            j = s.rfind(lit)
+            if j != -1:
+                pos = j
+                begin = pos
+                end = n
+
+    else:  # longest suffix
+        if kind == _STAR:
+            return 0
+        elif kind == _STAR_LITERAL:
+            if s.endswith(lit):
+                return 0
+        else:
+            j = s.find(lit)
+            if j != -1:
+                pos = j
+                end = pos
+
+    if pos == -1:  # The loop would have checked every char
+        if not _IsValidUtf8(s, 0, n):
+            return -1
+        return 0 if id_ in (Id.VOp1_Pound, Id.VOp1_DPound) else n
+
+    if not _IsValidUtf8(s, begin, end):
+        return -1
+    return pos
+
+
 def DoUnarySuffixOp(s, op_tok, arg, is_extglob):
     # type: (str, Token, str, bool) -> str
     """Helper for ${x#prefix} and family."""
@@ -288,20 +572,39 @@ def DoUnarySuffixOp(s, op_tok, arg, is_extglob):
         else:  # e.g. ^ ^^ , ,,
             raise AssertionError(id_)
 
-    # For patterns, do fnmatch() in a loop.
-    #
-    # TODO:
-    # - Another potential fast path:
-    #   v=aabbccdd
-    #   echo ${v#*b}  # strip shortest prefix
-    #
-    # If the whole thing doesn't match '*b*', then no test can succeed.  So we
-    # can fail early.  Conversely echo ${v%%c*} and '*c*'.
-    #
-    # (Although honestly this whole construct is nuts and should be deprecated.)
+    if id_ not in (Id.VOp1_Pound, Id.VOp1_DPound, Id.VOp1_Percent,
+                   Id.VOp1_DPercent):
+        raise NotImplementedError(ui.PrettyId(id_))
 
     n = len(s)
 
+    # Fast path for patterns like */ and .*, e.g. ${f##*/} and ${f%.*}
+    if not is_extglob:
+        kind, lit = _ParseAffixPattern(arg)
+        if kind != _OTHER_PATTERN:
+            pos = _StripAffix(s, id_, kind, lit)
+            if pos != -1:
+                if id_ in (Id.VOp1_Pound, Id.VOp1_DPound):
+                    return s[pos:]
+                else:
+                    return s[:pos]
+
+    # If no prefix or suffix can match, fail early, without slicing the
+    # string at every char.  The loop would have checked all of it, so only
+    # do this for valid UTF-8.  (Appending * to a trailing \ would escape it,
+    # and prepending it to ( would make an extended glob.)
+    if not arg.endswith('\\') and not arg.startswith('('):
+        if id_ in (Id.VOp1_Pound, Id.VOp1_DPound):
+            any_pat = arg + '*'
+        else:
+            any_pat = '*' + arg
+        if not libc.fnmatch(any_pat, s) and _IsValidUtf8(s, 0, n):
+            return s
+
+    # For other patterns, do fnmatch() in a loop.
+    #
+    # (Although honestly this whole construct is nuts and should be deprecated.)
+
     if id_ == Id.VOp1_Pound:  # shortest prefix
         # 'abcd': match '', 'a', 'ab', 'abc', ...
         i = 0
@@ -355,7 +658,7 @@ def DoUnarySuffixOp(s, op_tok, arg, is_extglob):
         return s
 
     else:
-        raise NotImplementedError(ui.PrettyId(id_))
+        raise AssertionError()
 
 
 def _AllMatchPositions(s, regex):
@@ -6,6 +6,7 @@ from __future__ import print_function
 
 import unittest
 
+from _devbuild.gen.id_kind_asdl import Id
 from core import error
 from osh import string_ops  # module under test
 
@@ -124,6 +125,81 @@ class LibStrTest(unittest.TestCase):
         # Replacement with no match
         self.assertEqual(s, string_ops._PatSubAll(s, '(z)', '_'))
 
+    def testStripAffix(self):
+        CASES = [
+            ('*', string_ops._STAR, ''),
+            ('**', string_ops._STAR, ''),
+            ('*/', string_ops._STAR_LITERAL, '/'),
+            ('.*', string_ops._LITERAL_STAR, '.'),
+            ('*\\*', string_ops._STAR_LITERAL, '*'),
+            ('*a*', string_ops._OTHER_PATTERN, ''),
+            ('*[ab]', string_ops._OTHER_PATTERN, ''),
+            ('a', string_ops._OTHER_PATTERN, ''),
+            ('*\xce', string_ops._OTHER_PATTERN, ''),  # partial character
+        ]
+        for pat, kind, lit in CASES:
+            self.assertEqual((kind, lit), string_ops._ParseAffixPattern(pat))
+
+        f = '/x/\xce\xb1.tar.gz'
+        CASES2 = [
+            (Id.VOp1_Pound, '*/', 1),
+            (Id.VOp1_DPound, '*/', 3),
+            (Id.VOp1_Percent, '.*', 9),
+            (Id.VOp1_DPercent, '.*', 5),
+            (Id.VOp1_Pound, '*q', 0),  # no match
+            (Id.VOp1_Percent, 'q*', len(f)),
+        ]
+        for id_, pat, expected in CASES2:
+            kind, lit = string_ops._ParseAffixPattern(pat)
+            self.assertEqual(expected,
+                             string_ops._StripAffix(f, id_, kind, lit))
+
+        # The loop handles invalid UTF-8, so its errors are the same
+        kind, lit = string_ops._ParseAffixPattern('*/')
+        self.assertEqual(
+            -1, string_ops._StripAffix('\xff/a', Id.VOp1_Pound, kind, lit))
+        self.assertEqual(
+            1, string_ops._StripAffix('/\xff', Id.VOp1_Pound, kind, lit))
+
+    def testUtf8Cache(self):
+        cache = string_ops.Utf8Cache()
+
+        ascii_str = 'ab-' * 50
+        unicode_str = '\xce\xb1\xce\xb2-' * 50  # alpha beta
+        for s in [ascii_str, unicode_str, 'short', '']:
+            u = s.decode('utf-8')
+            self.assertEqual(len(u), cache.CountChars(s))
+
+            for begin in [0, 1, 63, 64, 65, 149, 150, 200, -1, -64, -150]:
+                if len(u) + begin < 0:
+                    continue
+                self.assertEqual(u[begin:].encode('utf-8'),
+                                 cache.Slice(s, begin, -1, False))
+                for length in [0, 1, 64, 100, 1000, -1, -100]:
+                    if length >= 0:
+                        expected = u[begin:][:length]
+                    else:
+                        end = len(u) + length
+                        if end < 0:
+                            continue  # an error, tested below
+                        start = begin if begin >= 0 else len(u) + begin
+                        expected = u[start:end]
+                    self.assertEqual(expected.encode('utf-8'),
+                                     cache.Slice(s, begin, length, True))
+
+        # Out of range negative offsets are errors, as before
+        self.assertRaises(error.Strict, cache.Slice, unicode_str, -151, -1,
+                          False)
+        self.assertRaises(error.Strict, cache.Slice, unicode_str, 0, -151,
+                          True)
+
+        # Invalid UTF-8 isn't indexed, so only the decoded part is checked
+        bad = 'a' * 40 + '\xff'
+        self.assertEqual('aa', cache.Slice(bad, 0, 2, True))
+        self.assertRaises(error.Strict, cache.CountChars, bad)
+
+        self.assertEqual(3, cache.lru.Size())
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -47,6 +47,7 @@ from _devbuild.gen.value_asdl import (
     sh_lvalue,
     sh_lvalue_t,
 )
+from core import bash_impl
 from core import error
 from core import pyos
 from core import pyutil
@@ -109,7 +110,7 @@ def DecayArray(val):
     """Resolve ${array} to ${array[0]}."""
     if val.tag() == value_e.BashArray:
         array_val = cast(value.BashArray, val)
-        s = array_val.strs[0] if len(array_val.strs) else None
+        s = bash_impl.BashArray_GetItem(array_val, 0)
     elif val.tag() == value_e.BashAssoc:
         assoc_val = cast(value.BashAssoc, val)
         s = assoc_val.d['0'] if '0' in assoc_val.d else None
@@ -122,22 +123,6 @@ def DecayArray(val):
         return value.Str(s)
 
 
-def GetArrayItem(strs, index):
-    # type: (List[str], int) -> Optional[str]
-
-    n = len(strs)
-    if index < 0:
-        index += n
-
-    if 0 <= index and index < n:
-        # TODO: strs->index() has a redundant check for (i < 0)
-        s = strs[index]
-        # note: s could be None because representation is sparse
-    else:
-        s = None
-    return s
-
-
 # Use libc to parse NAME, NAME=value, and NAME+=value.  We want submatch
 # extraction, but I haven't used that in re2c, and we would need a new kind of
 # binding.
@@ -198,6 +183,29 @@ def _BackslashEscape(s):
     return s.replace('\\', '\\\\')
 
 
+def _IsOneWord(s):
+    # type: (str) -> bool
+    """Would unquoted $x be exactly one word, with the default IFS?
+
+    It's not split on whitespace, and it doesn't look like a glob.  Empty
+    strings are handled by the caller.
+    """
+    for c in ' \t\n*?[\\':
+        if c in s:
+            return False
+    return True
+
+
+def _FastQuote(s, eval_flags):
+    # type: (str, int) -> str
+    """Escape a quoted string for a pattern, like _PartValsToString()."""
+    if eval_flags & QUOTE_FNMATCH:
+        return glob_.GlobEscape(s)
+    if eval_flags & QUOTE_ERE:
+        return glob_.ExtendedRegexEscape(s)
+    return s
+
+
 def _ValueToPartValue(val, quoted, part_loc):
     # type: (value_t, bool, word_part_t) -> part_value_t
     """Helper for VarSub evaluation.
@@ -218,7 +226,7 @@ def _ValueToPartValue(val, quoted, part_loc):
 
         elif case(value_e.BashArray):
             val = cast(value.BashArray, UP_val)
-            return part_value.Array(val.strs)
+            return part_value.Array(bash_impl.BashArray_GetValues(val))
 
         elif case(value_e.BashAssoc):
             val = cast(value.BashAssoc, UP_val)
@@ -324,37 +332,14 @@ def _PerformSlice(
         has_length,  # type: bool
         part,  # type: BracedVarSub
         arg0_val,  # type: value.Str
+        utf8_cache,  # type: string_ops.Utf8Cache
 ):
     # type: (...) -> value_t
     UP_val = val
     with tagswitch(val) as case:
         if case(value_e.Str):  # Slice UTF-8 characters in a string.
             val = cast(value.Str, UP_val)
-            s = val.s
-            n = len(s)
-
-            if begin < 0:  # Compute offset with unicode
-                byte_begin = n
-                num_iters = -begin
-                for _ in xrange(num_iters):
-                    byte_begin = string_ops.PreviousUtf8Char(s, byte_begin)
-            else:
-                byte_begin = string_ops.AdvanceUtf8Chars(s, begin, 0)
-
-            if has_length:
-                if length < 0:  # Compute offset with unicode
-                    # Confusing: this is a POSITION
-                    byte_end = n
-                    num_iters = -length
-                    for _ in xrange(num_iters):
-                        byte_end = string_ops.PreviousUtf8Char(s, byte_end)
-                else:
-                    byte_end = string_ops.AdvanceUtf8Chars(
-                        s, length, byte_begin)
-            else:
-                byte_end = len(s)
-
-            substr = s[byte_begin:byte_end]
+            substr = utf8_cache.Slice(val.s, begin, length, has_length)
             result = value.Str(substr)  # type: value_t
 
         elif case(value_e.BashArray):  # Slice array entries.
@@ -366,30 +351,29 @@ def _PerformSlice(
                     "The length index of a array slice can't be negative: %d" %
                     length, loc.WordPart(part))
 
+            n = bash_impl.BashArray_Length(val)
             # Quirk: "begin" for positional arguments ($@ and $*) counts $0.
             if arg0_val is not None:
-                orig = [arg0_val.s]
-                orig.extend(val.strs)
-            else:
-                orig = val.strs
-
-            n = len(orig)
+                n += 1
             if begin < 0:
                 i = n + begin  # ${@:-3} starts counts from the end
             else:
                 i = begin
+            limit = length if has_length else -1  # length could be 0
+
             strs = []  # type: List[str]
-            count = 0
-            while i < n:
-                if has_length and count == length:  # length could be 0
-                    break
-                s = orig[i]
-                if s is not None:  # Unset elements don't count towards the length
-                    strs.append(s)
-                    count += 1
-                i += 1
+            if i >= 0:
+                if arg0_val is not None:
+                    if i == 0 and limit != 0:
+                        strs.append(arg0_val.s)
+                        if limit > 0:
+                            limit -= 1
+                    else:
+                        i -= 1
+                # Doesn't materialize the holes of a sparse array
+                strs.extend(bash_impl.BashArray_SliceValues(val, i, limit))
 
-            result = value.BashArray(strs)
+            result = bash_impl.BashArray_FromList(strs)
 
         elif case(value_e.BashAssoc):
             e_die("Can't slice associative arrays", loc.WordPart(part))
@@ -515,6 +499,7 @@ class AbstractWordEvaluator(StringWordEvaluator):
         self.errfmt = errfmt
 
         self.globber = glob_.Globber(exec_opts)
+        self.utf8_cache = string_ops.Utf8Cache()
 
     def CheckCircularDeps(self):
         # type: () -> None
@@ -550,7 +535,7 @@ class AbstractWordEvaluator(StringWordEvaluator):
 
         if op_id in (Id.VSub_At, Id.VSub_Star):
             argv = self.mem.GetArgv()
-            val = value.BashArray(argv)  # type: value_t
+            val = bash_impl.BashArray_FromList(argv)  # type: value_t
             if op_id == Id.VSub_At:
                 # "$@" evaluates to an array, $@ should be decayed
                 vsub_state.join_array = not quoted
@@ -617,7 +602,7 @@ class AbstractWordEvaluator(StringWordEvaluator):
                     is_falsey = False
             elif case(value_e.BashArray):
                 val = cast(value.BashArray, UP_val)
-                is_falsey = len(val.strs) == 0
+                is_falsey = bash_impl.BashArray_Length(val) == 0
             elif case(value_e.BashAssoc):
                 val = cast(value.BashAssoc, UP_val)
                 is_falsey = len(val.d) == 0
@@ -715,7 +700,7 @@ class AbstractWordEvaluator(StringWordEvaluator):
 
                 # https://stackoverflow.com/questions/17368067/length-of-string-in-bash
                 try:
-                    length = string_ops.CountUtf8Chars(val.s)
+                    length = self.utf8_cache.CountChars(val.s)
                 except error.Strict as e:
                     # Add this here so we don't have to add it so far down the stack.
                     # TODO: It's better to show BOTH this CODE an the actual DATA
@@ -733,10 +718,7 @@ class AbstractWordEvaluator(StringWordEvaluator):
             elif case(value_e.BashArray):
                 val = cast(value.BashArray, UP_val)
                 # There can be empty placeholder values in the array.
-                length = 0
-                for s in val.strs:
-                    if s is not None:
-                        length += 1
+                length = bash_impl.BashArray_Count(val)
 
             elif case(value_e.BashAssoc):
                 val = cast(value.BashAssoc, UP_val)
@@ -756,20 +738,17 @@ class AbstractWordEvaluator(StringWordEvaluator):
         with tagswitch(val) as case:
             if case(value_e.BashArray):
                 val = cast(value.BashArray, UP_val)
-                # translation issue: tuple indices not supported in list comprehensions
-                #indices = [str(i) for i, s in enumerate(val.strs) if s is not None]
                 indices = []  # type: List[str]
-                for i, s in enumerate(val.strs):
-                    if s is not None:
-                        indices.append(str(i))
-                return value.BashArray(indices)
+                for i in bash_impl.BashArray_GetKeys(val):
+                    indices.append(str(i))
+                return bash_impl.BashArray_FromList(indices)
 
             elif case(value_e.BashAssoc):
                 val = cast(value.BashAssoc, UP_val)
                 assert val.d is not None  # for MyPy, so it's not Optional[]
 
                 # BUG: Keys aren't ordered according to insertion!
-                return value.BashArray(val.d.keys())
+                return bash_impl.BashArray_FromList(val.d.keys())
 
             else:
                 raise error.TypeErr(val, 'Keys op expected Str', token)
@@ -827,12 +806,11 @@ class AbstractWordEvaluator(StringWordEvaluator):
                     val = cast(value.BashArray, UP_val)
                     # ${a[@]#prefix} is VECTORIZED on arrays.  YSH should have this too.
                     strs = []  # type: List[str]
-                    for s in val.strs:
-                        if s is not None:
-                            strs.append(
-                                string_ops.DoUnarySuffixOp(
-                                    s, op.op, arg_val.s, has_extglob))
-                    new_val = value.BashArray(strs)
+                    for s in bash_impl.BashArray_GetValues(val):
+                        strs.append(
+                            string_ops.DoUnarySuffixOp(s, op.op, arg_val.s,
+                                                       has_extglob))
+                    new_val = bash_impl.BashArray_FromList(strs)
 
                 elif case(value_e.BashAssoc):
                     val = cast(value.BashAssoc, UP_val)
@@ -841,7 +819,7 @@ class AbstractWordEvaluator(StringWordEvaluator):
                         strs.append(
                             string_ops.DoUnarySuffixOp(s, op.op, arg_val.s,
                                                        has_extglob))
-                    new_val = value.BashArray(strs)
+                    new_val = bash_impl.BashArray_FromList(strs)
 
                 else:
                     raise error.TypeErr(
@@ -890,17 +868,16 @@ class AbstractWordEvaluator(StringWordEvaluator):
             elif case2(value_e.BashArray):
                 array_val = cast(value.BashArray, val)
                 strs = []  # type: List[str]
-                for s in array_val.strs:
-                    if s is not None:
-                        strs.append(replacer.Replace(s, op))
-                val = value.BashArray(strs)
+                for s in bash_impl.BashArray_GetValues(array_val):
+                    strs.append(replacer.Replace(s, op))
+                val = bash_impl.BashArray_FromList(strs)
 
             elif case2(value_e.BashAssoc):
                 assoc_val = cast(value.BashAssoc, val)
                 strs = []
                 for s in assoc_val.d.values():
                     strs.append(replacer.Replace(s, op))
-                val = value.BashArray(strs)
+                val = bash_impl.BashArray_FromList(strs)
 
             else:
                 raise error.TypeErr(
@@ -929,7 +906,8 @@ class AbstractWordEvaluator(StringWordEvaluator):
             arg0_val = None  # type: value.Str
             if var_name is None:  # $* or $@
                 arg0_val = self.mem.GetArg0()
-            val = _PerformSlice(val, begin, length, has_length, part, arg0_val)
+            val = _PerformSlice(val, begin, length, has_length, part, arg0_val,
+                                self.utf8_cache)
         except error.Strict as e:
             if self.exec_opts.strict_word_eval():
                 raise
@@ -939,7 +917,7 @@ class AbstractWordEvaluator(StringWordEvaluator):
                     if case2(value_e.Str):
                         val = value.Str('')
                     elif case2(value_e.BashArray):
-                        val = value.BashArray([])
+                        val = bash_impl.BashArray_FromList([])
                     else:
                         raise NotImplementedError()
         return val
@@ -975,7 +953,10 @@ class AbstractWordEvaluator(StringWordEvaluator):
                     array_val = cast(value.BashArray, UP_val)
 
                     # TODO: should use fastfunc.ShellEncode
-                    tmp = [qsn.maybe_shell_encode(s) for s in array_val.strs]
+                    tmp = [
+                        qsn.maybe_shell_encode(s)
+                        for s in bash_impl.BashArray_GetValues(array_val)
+                    ]
                     result = value.Str(' '.join(tmp))
                 else:
                     e_die("Can't use @Q on %s" % ui.ValType(val), op)
@@ -1021,9 +1002,8 @@ class AbstractWordEvaluator(StringWordEvaluator):
                     val = cast(value.Str, UP_val)
                     e_die("Can't index string with @", loc.WordPart(part))
                 elif case2(value_e.BashArray):
-                    val = cast(value.BashArray, UP_val)
-                    # TODO: Is this a no-op?  Just leave 'val' alone.
-                    val = value.BashArray(val.strs)
+                    # Leave 'val' alone
+                    pass
 
         elif op_id == Id.Arith_Star:
             vsub_state.join_array = True  # both ${a[*]} and "${a[*]}" decay
@@ -1035,10 +1015,9 @@ class AbstractWordEvaluator(StringWordEvaluator):
                     val = cast(value.Str, UP_val)
                     e_die("Can't index string with *", loc.WordPart(part))
                 elif case2(value_e.BashArray):
-                    val = cast(value.BashArray, UP_val)
-                    # TODO: Is this a no-op?  Just leave 'val' alone.
                     # ${a[*]} or "${a[*]}" :  vsub_state.join_array is always true
-                    val = value.BashArray(val.strs)
+                    # Leave 'val' alone
+                    pass
 
         else:
             raise AssertionError(op_id)  # unknown
@@ -1066,7 +1045,7 @@ class AbstractWordEvaluator(StringWordEvaluator):
                 index = self.arith_ev.EvalToInt(anode)
                 vtest_place.index = a_index.Int(index)
 
-                s = GetArrayItem(array_val.strs, index)
+                s = bash_impl.BashArray_GetItem(array_val, index)
 
                 if s is None:
                     val = value.Undef
@@ -1133,8 +1112,7 @@ class AbstractWordEvaluator(StringWordEvaluator):
         """Decay $* to a string."""
         assert val.tag() == value_e.BashArray, val
         sep = self.splitter.GetJoinChar()
-        tmp = [s for s in val.strs if s is not None]
-        return value.Str(sep.join(tmp))
+        return value.Str(sep.join(bash_impl.BashArray_GetValues(val)))
 
     def _EmptyStrOrError(self, val, token):
         # type: (value_t, Token) -> value_t
@@ -1154,7 +1132,7 @@ class AbstractWordEvaluator(StringWordEvaluator):
         if self.exec_opts.nounset():
             e_die('Undefined array %r' % lexer.TokenVal(token), token)
         else:
-            return value.BashArray([])
+            return bash_impl.BashArray_FromList([])
 
     def _EvalBracketOp(self, val, part, quoted, vsub_state, vtest_place):
         # type: (value_t, BracedVarSub, bool, VarSubState, VTestPlace) -> value_t
@@ -1803,6 +1781,127 @@ class AbstractWordEvaluator(StringWordEvaluator):
                 else:
                     raise AssertionError()
 
+    def _FastVarSubStr(self, part):
+        # type: (word_part_t) -> Optional[str]
+        """Return the value of $x, ${x}, $1 or ${1} if it's a string.
+
+        Returns None if the general algorithm is needed, e.g. for arrays,
+        operators like ${x:-default}, and undefined vars with nounset.
+        """
+        UP_part = part
+        tag = part.tag()
+        if tag == word_part_e.SimpleVarSub:
+            part = cast(SimpleVarSub, UP_part)
+            id_ = part.left.id
+            if id_ == Id.VSub_DollarName:
+                val = self.mem.GetValue(part.var_name)
+            elif id_ == Id.VSub_Number:
+                val = self._EvalVarNum(int(part.var_name))
+            else:
+                return None
+
+        elif tag == word_part_e.BracedVarSub:
+            part = cast(BracedVarSub, UP_part)
+            if (part.prefix_op is not None or part.bracket_op is not None or
+                    part.suffix_op is not None):
+                return None
+            id_ = part.token.id
+            if id_ == Id.VSub_Name:
+                val = self.mem.GetValue(part.var_name)
+            elif id_ == Id.VSub_Number:
+                val = self._EvalVarNum(int(part.var_name))
+            else:
+                return None
+
+        else:
+            return None
+
+        UP_val = val
+        tag = val.tag()
+        if tag == value_e.Str:
+            val = cast(value.Str, UP_val)
+            return val.s
+        if tag == value_e.Undef and not self.exec_opts.nounset():
+            return ''
+        return None
+
+    def _FastEvalWord(self, w, eval_flags, is_argv):
+        # type: (CompoundWord, int, bool) -> Optional[str]
+        """Evaluate common words without part_value and word frames.
+
+        Handles words made of literals, quoted strings, and var subs that hold
+        strings, e.g. "$x" "${dir}/suffix" --out="$x" $x.  Quoted parts are
+        escaped according to eval_flags, like _PartValsToString().
+
+        Args:
+          is_argv: The word is an argv word, so it may be split, globbed or
+                   elided.  Then we only handle words that can't be.
+
+        Returns:
+          The string value, or None if the general algorithm is needed.
+        """
+        strs = []  # type: List[str]
+        any_quoted = False
+        ifs_checked = False
+
+        for part in w.parts:
+            UP_part = part
+            tag = part.tag()
+            if tag == word_part_e.Literal:
+                part = cast(Token, UP_part)
+                # e.g. Lit_Star may be globbed
+                if is_argv and part.id != Id.Lit_Chars:
+                    return None
+                strs.append(part.tval)
+
+            elif tag == word_part_e.EscapedLiteral:
+                part = cast(word_part.EscapedLiteral, UP_part)
+                any_quoted = True
+                strs.append(_FastQuote(part.ch, eval_flags))
+
+            elif tag == word_part_e.SingleQuoted:
+                part = cast(SingleQuoted, UP_part)
+                any_quoted = True
+                s = word_compile.EvalSingleQuoted(part)
+                strs.append(_FastQuote(s, eval_flags))
+
+            elif tag == word_part_e.DoubleQuoted:
+                part = cast(DoubleQuoted, UP_part)
+                any_quoted = True
+                for p in part.parts:
+                    UP_p = p
+                    p_tag = p.tag()
+                    if p_tag == word_part_e.Literal:
+                        p = cast(Token, UP_p)
+                        s = p.tval
+                    elif p_tag == word_part_e.EscapedLiteral:
+                        p = cast(word_part.EscapedLiteral, UP_p)
+                        s = p.ch
+                    else:
+                        s = self._FastVarSubStr(p)
+                        if s is None:  # e.g. "$@" or "$(echo hi)"
+                            return None
+                    strs.append(_FastQuote(s, eval_flags))
+
+            else:
+                s = self._FastVarSubStr(part)
+                if s is None:
+                    return None
+                if is_argv:
+                    if not _IsOneWord(s):
+                        return None
+                    if not ifs_checked:
+                        if not self.splitter.IfsIsDefault():
+                            return None
+                        ifs_checked = True
+                strs.append(s)
+
+        result = ''.join(strs)
+        # Elision of unquoted $empty
+        if is_argv and len(result) == 0 and not any_quoted:
+            return None
+        return result
+
     def EvalWordToString(self, UP_w, eval_flags=0):
         # type: (word_t, int) -> value.Str
         """Given a word, return a string.
@@ -1817,8 +1916,9 @@ class AbstractWordEvaluator(StringWordEvaluator):
             if fast_str is not None:
                 return value.Str(fast_str)
 
-            # Could we additionally optimize a=$b, if we know $b isn't an array
-            # etc.?
+        fast_str = self._FastEvalWord(w, eval_flags, False)
+        if fast_str is not None:
+            return value.Str(fast_str)
 
         part_vals = []  # type: List[part_value_t]
         for p in w.parts:
@@ -1838,6 +1938,11 @@ class AbstractWordEvaluator(StringWordEvaluator):
         assert UP_w.tag() == rhs_word_e.Compound, UP_w
         w = cast(CompoundWord, UP_w)
 
+        # Patterns with ExtGlob parts take the slow path
+        fast_str = self._FastEvalWord(w, QUOTE_FNMATCH, False)
+        if fast_str is not None:
+            return value.Str(fast_str), False
+
         has_extglob = False
         part_vals = []  # type: List[part_value_t]
         for p in w.parts:
@@ -1896,7 +2001,7 @@ class AbstractWordEvaluator(StringWordEvaluator):
                 array_words = part0.words
                 words = braces.BraceExpandWords(array_words)
                 strs = self.EvalWordSequence(words)
-                return value.BashArray(strs)
+                return bash_impl.BashArray_FromList(strs)
 
             if tag == word_part_e.BashAssocLiteral:
                 part0 = cast(word_part.BashAssocLiteral, UP_part0)
@@ -2163,7 +2268,8 @@ class AbstractWordEvaluator(StringWordEvaluator):
             return self.SimpleEvalWordSequence2(words, allow_assign)
 
         # Parse time:
-        # 1. brace expansion.  TODO: Do at parse time.
+        # 1. brace expansion.  Detected at parse time, and the expansion is
+        # saved on the first run.  See braces.BraceExpandWords().
         # 2. Tilde detection.  DONE at parse time.  Only if Id.Lit_Tilde is the
         # first WordPart.
         #
@@ -2193,6 +2299,14 @@ class AbstractWordEvaluator(StringWordEvaluator):
                                                        words)
                 continue
 
+            # $e may be an assignment builtin, detected below
+            if not (allow_assign and i == 0):
+                fast_str = self._FastEvalWord(w, 0, True)
+                if fast_str is not None:
+                    strs.append(fast_str)
+                    locs.append(w)
+                    continue
+
             part_vals = []  # type: List[part_value_t]
             self._EvalWordToParts(w, part_vals, EXTGLOB_FILES)
 
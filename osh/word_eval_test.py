@@ -125,6 +125,35 @@ class WordEvalTest(unittest.TestCase):
             print(argv)
             print()
 
+    def testFastEvalWord(self):
+        node = assertParseSimpleCommand(
+            self, 'echo "$y" $y $empty pre"$x"post $1 \'*\' a$empty "$@" '
+            '${y:-z} "*"$y')
+        ev = InitEvaluator()
+        w = node.words
+
+        self.assertEqual('y yy', ev._FastEvalWord(w[1], 0, True))
+        self.assertEqual(None, ev._FastEvalWord(w[2], 0, True))  # split
+        self.assertEqual(None, ev._FastEvalWord(w[3], 0, True))  # elided
+        self.assertEqual('pre- -- ---post', ev._FastEvalWord(w[4], 0, True))
+        self.assertEqual('x', ev._FastEvalWord(w[5], 0, True))
+        self.assertEqual('*', ev._FastEvalWord(w[6], 0, True))
+        self.assertEqual('a', ev._FastEvalWord(w[7], 0, True))
+        self.assertEqual(None, ev._FastEvalWord(w[8], 0, True))
+        self.assertEqual(None, ev._FastEvalWord(w[9], 0, True))
+
+        # Not argv words, so they aren't split or elided
+        self.assertEqual('y yy', ev._FastEvalWord(w[2], 0, False))
+        self.assertEqual('', ev._FastEvalWord(w[3], 0, False))
+        self.assertEqual('\\*y yy',
+                         ev._FastEvalWord(w[10], word_eval.QUOTE_FNMATCH,
+                                          False))
+
+        argv = ev.EvalWordSequence2(w[:8], allow_assign=True)
+        self.assertEqual(
+            ['echo', 'y yy', 'y', 'yy', 'pre- -- ---post', 'x', '*', 'a'],
+            argv.argv)
+
 
 if __name__ == '__main__':
     unittest.main()
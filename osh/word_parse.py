@@ -758,7 +758,7 @@ class WordParser(WordEmitter):
 
         # Needed for syntax checks
         left_tok = self.cur_token
-        left_tok.id = left_id
+        self.arena.SetTokenId(left_tok, left_id)
 
         sq_part = self._ReadSingleQuoted(left_tok, lexer_mode)
 
@@ -770,7 +770,7 @@ class WordParser(WordEmitter):
             # HACK: magically transform the third ' in u''' to
             # Id.Left_UTSingleQuote, so that ''' is the terminator
             left_tok = self.cur_token
-            left_tok.id = triple_left_id
+            self.arena.SetTokenId(left_tok, triple_left_id)
 
             # Handles stripping leading whitespace
             sq_part = self._ReadSingleQuoted(left_tok, lexer_mode)
@@ -805,7 +805,7 @@ class WordParser(WordEmitter):
                 # HACK: magically transform the third " in """ to
                 # Id.Left_TDoubleQuote, so that """ is the terminator
                 left_dq_token = self.cur_token
-                left_dq_token.id = Id.Left_TDoubleQuote
+                self.arena.SetTokenId(left_dq_token, Id.Left_TDoubleQuote)
                 triple_out.b = True  # let caller know we got it
                 return self._ReadDoubleQuoted(left_dq_token)
 
@@ -838,7 +838,7 @@ class WordParser(WordEmitter):
                 # HACK: magically transform the third ' in ''' to
                 # Id.Left_TSingleQuote, so that ''' is the terminator
                 left_sq_token = self.cur_token
-                left_sq_token.id = triple_left_id
+                self.arena.SetTokenId(left_sq_token, triple_left_id)
 
                 triple_out.b = True  # let caller know we got it
                 return self._ReadSingleQuoted(left_sq_token, lexer_mode)
@@ -1160,7 +1160,7 @@ class WordParser(WordEmitter):
         # Hack to move } from what the Expr lexer modes gives to what CommandParser
         # wants
         if last_token.id == Id.Op_RBrace:
-            last_token.id = Id.Lit_RBrace
+            self.arena.SetTokenId(last_token, Id.Lit_RBrace)
 
         # Let the CommandParser see the Op_Semi or Op_Newline.
         self.buffered_word = last_token
@@ -1182,7 +1182,7 @@ class WordParser(WordEmitter):
         # Hack to move } from what the Expr lexer modes gives to what CommandParser
         # wants
         if last_token.id == Id.Op_RBrace:
-            last_token.id = Id.Lit_RBrace
+            self.arena.SetTokenId(last_token, Id.Lit_RBrace)
 
         for lhs in enode.lhs:
             UP_lhs = lhs
@@ -1223,7 +1223,7 @@ class WordParser(WordEmitter):
         enode, last_token = self.parse_ctx.ParseYshExpr(
             self.lexer, grammar_nt.command_expr)
         if last_token.id == Id.Op_RBrace:
-            last_token.id = Id.Lit_RBrace
+            self.arena.SetTokenId(last_token, Id.Lit_RBrace)
         self.buffered_word = last_token
         self._SetNext(lex_mode_e.ShCommand)
         return enode
@@ -1292,7 +1292,7 @@ class WordParser(WordEmitter):
 
         # Translate from lex_mode_e.{Expr => ShCommand}, for CommandParser
         assert last_token.id == Id.Op_LBrace
-        last_token.id = Id.Lit_LBrace
+        self.arena.SetTokenId(last_token, Id.Lit_LBrace)
         self.buffered_word = last_token
 
         self._SetNext(lex_mode_e.ShCommand)
@@ -1303,7 +1303,7 @@ class WordParser(WordEmitter):
 
         # Translate from lex_mode_e.{Expr => ShCommand}, for CommandParser
         assert last_token.id == Id.Op_LBrace
-        last_token.id = Id.Lit_LBrace
+        self.arena.SetTokenId(last_token, Id.Lit_LBrace)
         self.buffered_word = last_token
 
         self._SetNext(lex_mode_e.ShCommand)
@@ -1314,7 +1314,7 @@ class WordParser(WordEmitter):
             self.lexer)
 
         if last_token.id == Id.Op_LBrace:
-            last_token.id = Id.Lit_LBrace
+            self.arena.SetTokenId(last_token, Id.Lit_LBrace)
         self.buffered_word = last_token
 
         return pat, left_tok
@@ -1756,7 +1756,7 @@ class WordParser(WordEmitter):
                     cs_part = self._ReadCommandSub(Id.Left_AtParen,
                                                    d_quoted=False)
                     # RARE mutation of tok.id!
-                    cs_part.left_token.id = Id.Left_AtParen
+                    self.arena.SetTokenId(cs_part.left_token, Id.Left_AtParen)
                     part = cs_part  # for type safety
 
                     # Same check as _MaybeReadWordPart.  @(seq 3)x is illegal, just like
@@ -1933,7 +1933,7 @@ class WordParser(WordEmitter):
                 # like
                 #   json write (x)
                 bracket_word = self.cur_token
-                bracket_word.id = Id.Op_LBracket
+                self.arena.SetTokenId(bracket_word, Id.Op_LBracket)
 
                 self._SetNext(lex_mode)
                 return bracket_word
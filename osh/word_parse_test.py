@@ -128,8 +128,28 @@ single quoted'\
         self.assertEqual('hi', s)
 
     def testSaveLinesAndDiscard(self):
-        # Also takes a left, right, token
-        pass
+        expr = """\
+hi'
+single quoted'"double
+quoted
+"there
+    """
+
+        arena = test_lib.MakeArena('hi')
+        w_parser = test_lib.InitWordParser(expr, arena=arena)
+        w = w_parser.ReadWord(lex_mode_e.ShCommand)
+
+        left = w.parts[1].left  # left single quote
+        right = w.parts[2].right  # right double quote
+
+        lines = arena.SaveLinesAndDiscard(left, right)
+        self.assertEqual(
+            ["hi'\n", 'single quoted\'"double\n', 'quoted\n', '"there\n'],
+            [li.content for li in lines])
+        self.assertEqual(0, len(arena.lines_list))
+
+        # The lines were discarded, so there's nothing to save
+        self.assertEqual([], arena.SaveLinesAndDiscard(left, right))
 
 
 class LexerTest(unittest.TestCase):
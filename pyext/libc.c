@@ -13,6 +13,7 @@
 #include <limits.h>
 #include <wchar.h>
 #include <stdlib.h>
+#include <string.h>  // strcmp(), memmove()
 #include <sys/ioctl.h>
 #include <locale.h>
 #include <fnmatch.h>
@@ -160,6 +161,70 @@ func_glob(PyObject *self, PyObject *args) {
   return matches;
 }
 
+// Compiled regexes are cached, because [[ $x =~ $pat ]], eggex matches and
+// ${x//pat/replace} are often evaluated in a loop with the same pattern.
+//
+// The cache is a small array in most-recently-used order.  A linear search is
+// cheap compared to regcomp().
+
+#define REGEX_CACHE_SIZE 100
+
+typedef struct {
+  char* pattern;  // owned
+  int cflags;
+  regex_t compiled;
+} RegexCacheEntry;
+
+static RegexCacheEntry* regex_cache[REGEX_CACHE_SIZE];
+static int regex_cache_len = 0;
+
+static int regex_cache_hits = 0;
+static int regex_cache_misses = 0;
+static int regex_cache_evictions = 0;
+
+// Returns a compiled regex owned by the cache, or NULL if the pattern is
+// invalid.  In that case, the regcomp() error is written to error_desc.
+static regex_t* regex_cache_get(const char* pattern, int cflags,
+                                char* error_desc, int error_size) {
+  int i;
+  for (i = 0; i < regex_cache_len; ++i) {
+    RegexCacheEntry* e = regex_cache[i];
+    if (e->cflags == cflags && strcmp(e->pattern, pattern) == 0) {
+      // Move it to the front
+      memmove(regex_cache + 1, regex_cache, i * sizeof(RegexCacheEntry*));
+      regex_cache[0] = e;
+      regex_cache_hits++;
+      return &e->compiled;
+    }
+  }
+  regex_cache_misses++;
+
+  RegexCacheEntry* e = (RegexCacheEntry*) malloc(sizeof(RegexCacheEntry));
+  int status = regcomp(&e->compiled, pattern, cflags);
+  if (status != 0) {
+    regerror(status, &e->compiled, error_desc, error_size);
+    free(e);
+    return NULL;
+  }
+  e->pattern = strdup(pattern);
+  e->cflags = cflags;
+
+  if (regex_cache_len == REGEX_CACHE_SIZE) {
+    RegexCacheEntry* last = regex_cache[REGEX_CACHE_SIZE - 1];
+    regfree(&last->compiled);
+    free(last->pattern);
+    free(last);
+    regex_cache_len--;
+    regex_cache_evictions++;
+  }
+  memmove(regex_cache + 1, regex_cache,
+          regex_cache_len * sizeof(RegexCacheEntry*));
+  regex_cache[0] = e;
+  regex_cache_len++;
+
+  return &e->compiled;
+}
+
 static PyObject *
 func_regex_search(PyObject *self, PyObject *args) {
   const char* pattern;
@@ -173,12 +238,9 @@ func_regex_search(PyObject *self, PyObject *args) {
   }
 
   cflags |= REG_EXTENDED;
-  regex_t pat;
-  int status = regcomp(&pat, pattern, cflags);
-  if (status != 0) {
-    char error_desc[50];
-    regerror(status, &pat, error_desc, 50);
-
+  char error_desc[50];
+  regex_t* pat = regex_cache_get(pattern, cflags, error_desc, 50);
+  if (pat == NULL) {
     char error_message[80];
     snprintf(error_message, 80, "Invalid regex %s (%s)", pattern, error_desc);
 
@@ -186,16 +248,15 @@ func_regex_search(PyObject *self, PyObject *args) {
     return NULL;
   }
 
-  int num_groups = pat.re_nsub + 1;
+  int num_groups = pat->re_nsub + 1;
   PyObject *ret = PyList_New(num_groups * 2);
 
   if (ret == NULL) {
-    regfree(&pat);
     return NULL;
   }
 
   regmatch_t *pmatch = (regmatch_t*) malloc(sizeof(regmatch_t) * num_groups);
-  int match = regexec(&pat, str + pos, num_groups, pmatch, eflags);
+  int match = regexec(pat, str + pos, num_groups, pmatch, eflags);
   if (match == 0) {
     int i;
     for (i = 0; i < num_groups; i++) {
@@ -214,9 +275,9 @@ func_regex_search(PyObject *self, PyObject *args) {
   }
 
   free(pmatch);
-  regfree(&pat);
 
   if (match != 0) {
+    Py_DECREF(ret);
     Py_RETURN_NONE;
   }
 
@@ -239,16 +300,14 @@ func_regex_first_group_match(PyObject *self, PyObject *args) {
     return NULL;
   }
 
-  regex_t pat;
   regmatch_t m[NMATCH];
 
   // Could have been checked by regex_parse for [[ =~ ]], but not for glob
   // patterns like ${foo/x*/y}.
 
-  int status = regcomp(&pat, pattern, REG_EXTENDED);
-  if (status != 0) {
-    char error_string[80];
-    regerror(status, &pat, error_string, 80);
+  char error_string[80];
+  regex_t* pat = regex_cache_get(pattern, REG_EXTENDED, error_string, 80);
+  if (pat == NULL) {
     PyErr_SetString(PyExc_RuntimeError, error_string);
     return NULL;
   }
@@ -256,8 +315,7 @@ func_regex_first_group_match(PyObject *self, PyObject *args) {
   debug("first_group_match pat %s str %s pos %d", pattern, str, pos);
 
   // Match at offset 'pos'
-  int result = regexec(&pat, str + pos, NMATCH, m, 0 /*flags*/);
-  regfree(&pat);
+  int result = regexec(pat, str + pos, NMATCH, m, 0 /*flags*/);
 
   if (result != 0) {
     Py_RETURN_NONE;  // no match
@@ -269,6 +327,13 @@ func_regex_first_group_match(PyObject *self, PyObject *args) {
   return Py_BuildValue("(i,i)", pos + start, pos + end);
 }
 
+// Returns [size, hits, misses, evictions] of the regex cache.
+static PyObject *
+func_regex_cache_stats(PyObject *self, PyObject *unused) {
+  return Py_BuildValue("[i,i,i,i]", regex_cache_len, regex_cache_hits,
+                       regex_cache_misses, regex_cache_evictions);
+}
+
 // We do this in C so we can remove '%f' % 0.1 from the CPython build.  That
 // involves dtoa.c and pystrod.c, which are thousands of lines of code.
 static PyObject *
@@ -382,6 +447,9 @@ static PyMethodDef methods[] = {
   // the regex is invalid.
   {"regex_first_group_match", func_regex_first_group_match, METH_VARARGS, ""},
 
+  // Return [size, hits, misses, evictions] of the compiled regex cache.
+  {"regex_cache_stats", func_regex_cache_stats, METH_NOARGS, ""},
+
   // "Print three floating point values for the 'time' builtin.
   {"print_time", func_print_time, METH_VARARGS, ""},
 
@@ -208,6 +208,30 @@ class LibcTest(unittest.TestCase):
     self.assertRaises(
         RuntimeError, libc.regex_first_group_match, r'*', 'abcd', 0)
 
+  def testRegexCache(self):
+    size, hits, misses, evictions = libc.regex_cache_stats()
+
+    pat = '(cache)+_test_[0-9]'
+    self.assertEqual([0, 12], libc.regex_search(pat, 0, 'cache_test_1', 0)[:2])
+    self.assertEqual(None, libc.regex_search(pat, 0, 'cache_test_', 0))
+    # Different cflags is a different entry
+    self.assertEqual(None, libc.regex_search(pat, libc.REG_ICASE, 'x', 0))
+
+    stats = libc.regex_cache_stats()
+    self.assertEqual(hits + 1, stats[1])
+    self.assertEqual(misses + 2, stats[2])
+
+    # Evict everything
+    for i in xrange(200):
+      libc.regex_first_group_match('(%d)' % i, 'abc', 0)
+    stats = libc.regex_cache_stats()
+    self.assertEqual(100, stats[0])
+    self.assertEqual(True, stats[3] > evictions)
+
+    # Invalid patterns aren't cached
+    self.assertRaises(ValueError, libc.regex_search, r'*', 0, 'abcd', 0)
+    self.assertEqual(100, libc.regex_cache_stats()[0])
+
   def testRegexFirstGroupMatchError(self):
     # Helping to debug issue #291
     s = ''
@@ -49,6 +49,8 @@ O_SYNC = ...  # type: int
 O_TRUNC = ...  # type: int
 O_WRONLY = ...  # type: int
 R_OK = ...  # type: int
+SEEK_CUR = ...  # type: int
+SEEK_SET = ...  # type: int
 TMP_MAX = ...  # type: int
 WCONTINUED = ...  # type: int
 WNOHANG = ...  # type: int
@@ -119,6 +121,10 @@ def fdatasync(fd: int) -> None: ...
 def fdopen(fd: int, mode: str = ..., bufsize: int = ...) -> mylib.LineReader: ...
 def fork() -> int:
     raise OSError()
+# Oil patch
+def posix_spawn(path: str, args: List[str], env: Dict[str, str], pgroup: int,
+                sig_defaults: List[int]) -> int:
+    raise OSError()
 def forkpty() -> Tuple[int, int]:
     raise OSError()
 def fpathconf(fd: int, name: str) -> None: ...
@@ -151,7 +157,7 @@ def lchown(path: unicode, uid: int, gid: int) -> None: ...
 def link(source: unicode, link_name: str) -> None: ...
 _T = TypeVar("_T")
 def listdir(path: _T) -> List[_T]: ...
-def lseek(fd: int, pos: int, how: int) -> None: ...
+def lseek(fd: int, pos: int, how: int) -> int: ...
 def lstat(path: unicode) -> stat_result: ...
 def major(device: int) -> int: ...
 def makedev(major: int, minor: int) -> int: ...
@@ -28,6 +28,7 @@ Other notes:
 """
 from __future__ import print_function
 
+import errno
 import signal
 import subprocess
 import unittest
@@ -52,6 +53,7 @@ FUNCS = [
     "execv",
     "execve",
     "fork",
+    "posix_spawn",
     "geteuid",
     "getpid",
     "getuid",
@@ -96,6 +98,25 @@ class PosixTest(unittest.TestCase):
       func = getattr(posix_, name)
       print(func)
 
+  def testPosixSpawn(self):
+    r, w = posix_.pipe()
+    pid = posix_.posix_spawn('/bin/sh', ['sh', '-c', 'echo $FOO >&%d' % w],
+                             {'FOO': 'bar'}, 0, [signal.SIGPIPE])
+    posix_.close(w)
+    self.assertEqual('bar\n', posix_.read(r, 100))
+    posix_.close(r)
+
+    _, status = posix_.waitpid(pid, 0)
+    self.assertEqual(0, posix_.WEXITSTATUS(status))
+
+    # exec() errors are reported by posix_spawn() itself
+    try:
+      posix_.posix_spawn('/nonexistent', ['x'], {}, -1, [])
+    except OSError as e:
+      self.assertEqual(errno.ENOENT, e.errno)
+    else:
+      self.fail('Expected OSError')
+
   def testEmptyReadAndWrite(self):
     # Regression for bug where this would hang
     posix_.read(0, 0)
@@ -48,6 +48,9 @@ corresponding Unix manual entries for more information on calls.");
 #include <signal.h>
 #endif
 
+/* Oil patch: for posix_spawn() */
+#include <spawn.h>
+
 #ifdef HAVE_FCNTL_H
 #include <fcntl.h>
 #endif /* HAVE_FCNTL_H */
@@ -1264,6 +1267,193 @@ posix_execve(PyObject *self, PyObject *args)
 }
 #endif /* HAVE_EXECV */
 
+#ifdef HAVE_EXECV
+/* Oil patch: posix_spawn() for simple external commands */
+
+static char **
+make_envlist(PyObject *env, Py_ssize_t *envc_ptr)
+{
+    PyObject *keys = NULL, *vals = NULL;
+    char **envlist = NULL;
+    Py_ssize_t i, pos, envc = 0;
+
+    i = PyMapping_Size(env);
+    if (i < 0)
+        return NULL;
+    envlist = PyMem_NEW(char *, i + 1);
+    if (envlist == NULL) {
+        PyErr_NoMemory();
+        return NULL;
+    }
+    keys = PyMapping_Keys(env);
+    vals = PyMapping_Values(env);
+    if (!keys || !vals)
+        goto fail;
+    if (!PyList_Check(keys) || !PyList_Check(vals)) {
+        PyErr_SetString(PyExc_TypeError,
+                        "posix_spawn(): env.keys() or env.values() is not a list");
+        goto fail;
+    }
+
+    for (pos = 0; pos < i; pos++) {
+        char *p, *k, *v;
+        size_t len;
+        PyObject *key = PyList_GetItem(keys, pos);
+        PyObject *val = PyList_GetItem(vals, pos);
+        if (!key || !val)
+            goto fail;
+
+        if (!PyArg_Parse(key, "s;posix_spawn() arg 3 contains a non-string key",
+                         &k) ||
+            !PyArg_Parse(val, "s;posix_spawn() arg 3 contains a non-string value",
+                         &v))
+            goto fail;
+
+        len = PyString_Size(key) + PyString_Size(val) + 2;
+        p = PyMem_NEW(char, len);
+        if (p == NULL) {
+            PyErr_NoMemory();
+            goto fail;
+        }
+        PyOS_snprintf(p, len, "%s=%s", k, v);
+        envlist[envc++] = p;
+    }
+    envlist[envc] = NULL;
+
+    Py_DECREF(vals);
+    Py_DECREF(keys);
+    *envc_ptr = envc;
+    return envlist;
+
+  fail:
+    while (--envc >= 0)
+        PyMem_DEL(envlist[envc]);
+    PyMem_DEL(envlist);
+    Py_XDECREF(vals);
+    Py_XDECREF(keys);
+    return NULL;
+}
+
+PyDoc_STRVAR_remove(posix_posix_spawn__doc__,
+"posix_spawn(path, args, env, pgroup, sig_defaults) -> pid\n\n\
+Start a program in a new process without copying this one.\n\
+\n\
+    path: path of executable file\n\
+    args: list of arguments\n\
+    env: dictionary of strings mapping to strings\n\
+    pgroup: process group for the child, or -1 to keep ours\n\
+    sig_defaults: list of signals to reset to SIG_DFL");
+
+/* The libc's posix_spawn() child sets its internal signals, from 32 up to
+   SIGRTMIN, to SIG_IGN, and that survives exec.  A forked child gets SIG_DFL.
+   sigaddset() rejects these signals, so set their bits directly, to reset
+   them like fork() does. */
+static void
+add_internal_signals(sigset_t *set)
+{
+#ifdef __linux__
+    unsigned long *words = (unsigned long *)set;
+    const int bits_per_word = 8 * sizeof(unsigned long);
+    int sig;
+    for (sig = 32; sig < SIGRTMIN; sig++) {
+        int i = sig - 1;
+        words[i / bits_per_word] |= 1UL << (i % bits_per_word);
+    }
+#endif
+}
+
+static PyObject *
+posix_posix_spawn(PyObject *self, PyObject *args)
+{
+    char *path;
+    PyObject *argv, *env, *sig_defaults;
+    int pgroup;
+    char **argvlist = NULL;
+    char **envlist = NULL;
+    Py_ssize_t i, argc, envc = 0, lastarg = 0;
+    posix_spawnattr_t attr;
+    sigset_t sigdef;
+    short flags = POSIX_SPAWN_SETSIGDEF;
+    pid_t pid;
+    int err;
+    PyObject *result = NULL;
+
+    if (!PyArg_ParseTuple(args, "etO!OiO!:posix_spawn",
+                          Py_FileSystemDefaultEncoding, &path,
+                          &PyList_Type, &argv, &env, &pgroup,
+                          &PyList_Type, &sig_defaults))
+        return NULL;
+    if (!PyMapping_Check(env)) {
+        PyErr_SetString(PyExc_TypeError,
+                        "posix_spawn() arg 3 must be a mapping object");
+        goto fail_0;
+    }
+
+    sigemptyset(&sigdef);
+    for (i = 0; i < PyList_Size(sig_defaults); i++) {
+        long sig = PyInt_AsLong(PyList_GetItem(sig_defaults, i));
+        if (sig == -1 && PyErr_Occurred())
+            goto fail_0;
+        sigaddset(&sigdef, (int)sig);
+    }
+    add_internal_signals(&sigdef);
+
+    argc = PyList_Size(argv);
+    argvlist = PyMem_NEW(char *, argc+1);
+    if (argvlist == NULL) {
+        PyErr_NoMemory();
+        goto fail_0;
+    }
+    for (i = 0; i < argc; i++) {
+        if (!PyArg_Parse(PyList_GetItem(argv, i),
+                         "et;posix_spawn() arg 2 must contain only strings",
+                         Py_FileSystemDefaultEncoding,
+                         &argvlist[i]))
+        {
+            lastarg = i;
+            goto fail_1;
+        }
+    }
+    lastarg = argc;
+    argvlist[argc] = NULL;
+
+    envlist = make_envlist(env, &envc);
+    if (envlist == NULL)
+        goto fail_1;
+
+    if ((err = posix_spawnattr_init(&attr)) != 0) {
+        errno = err;
+        (void) posix_error();
+        goto fail_2;
+    }
+    if (pgroup != -1) {
+        flags |= POSIX_SPAWN_SETPGROUP;
+        posix_spawnattr_setpgroup(&attr, pgroup);
+    }
+    posix_spawnattr_setsigdefault(&attr, &sigdef);
+    posix_spawnattr_setflags(&attr, flags);
+
+    err = posix_spawn(&pid, path, NULL, &attr, argvlist, envlist);
+    posix_spawnattr_destroy(&attr);
+    if (err != 0) {
+        errno = err;
+        (void) posix_error();
+    } else {
+        result = PyInt_FromLong((long)pid);
+    }
+
+  fail_2:
+    while (--envc >= 0)
+        PyMem_DEL(envlist[envc]);
+    PyMem_DEL(envlist);
+  fail_1:
+    free_string_array(argvlist, lastarg);
+  fail_0:
+    PyMem_Free(path);
+    return result;
+}
+#endif /* HAVE_EXECV */
+
 #ifdef HAVE_FORK
 PyDoc_STRVAR_remove(posix_fork__doc__,
 "fork() -> pid\n\n\
@@ -2071,6 +2261,28 @@ posix_read(PyObject *self, PyObject *args)
 }
 
 
+PyDoc_STRVAR_remove(posix_lseek__doc__,
+"lseek(fd, pos, how) -> newpos\n\n\
+Set the current position of a file descriptor.");
+
+static PyObject *
+posix_lseek(PyObject *self, PyObject *args)
+{
+    int fd, how;
+    long pos;
+    off_t res;
+    if (!PyArg_ParseTuple(args, "ili:lseek", &fd, &pos, &how))
+        return NULL;
+    if (!_PyVerify_fd(fd))
+        return posix_error();
+    Py_BEGIN_ALLOW_THREADS
+    res = lseek(fd, (off_t)pos, how);
+    Py_END_ALLOW_THREADS
+    if (res < 0)
+        return posix_error();
+    return PyLong_FromLongLong((PY_LONG_LONG)res);
+}
+
 PyDoc_STRVAR_remove(posix_write__doc__,
 "write(fd, string) -> byteswritten\n\n\
 Write a string to a file descriptor.");
@@ -2592,6 +2804,12 @@ all_ins(PyObject *d)
 #ifdef O_RDONLY
     if (ins(d, "O_RDONLY", (long)O_RDONLY)) return -1;
 #endif
+#ifdef SEEK_CUR
+    if (ins(d, "SEEK_CUR", (long)SEEK_CUR)) return -1;
+#endif
+#ifdef SEEK_SET
+    if (ins(d, "SEEK_SET", (long)SEEK_SET)) return -1;
+#endif
 #ifdef O_WRONLY
     if (ins(d, "O_WRONLY", (long)O_WRONLY)) return -1;
 #endif
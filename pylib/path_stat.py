@@ -17,6 +17,16 @@ def exists(path):
     return True
 
 
+def lexists(path):
+    # type: (str) -> bool
+    """Test whether a path exists.  Returns True for broken symbolic links"""
+    try:
+        posix.lstat(path)
+    except posix.error:
+        return False
+    return True
+
+
 def isdir(s):
     # type: (str) -> bool
     """Return true if the pathname refers to an existing directory."""
@@ -25,3 +35,13 @@ def isdir(s):
     except posix.error:
         return False
     return stat.S_ISDIR(st.st_mode)
+
+
+def islink(s):
+    # type: (str) -> bool
+    """Return true if the pathname refers to a symbolic link."""
+    try:
+        st = posix.lstat(s)
+    except posix.error:
+        return False
+    return stat.S_ISLNK(st.st_mode)
@@ -15,10 +15,18 @@ class PathStatTest(unittest.TestCase):
     self.assertEqual(True, path_stat.exists('/'))
     self.assertEqual(False, path_stat.exists('/nonexistent__ZZZZ'))
 
+  def testPathLexists(self):
+    self.assertEqual(True, path_stat.lexists('/'))
+    self.assertEqual(False, path_stat.lexists('/nonexistent__ZZZZ'))
+
   def testIsDir(self):
     self.assertEqual(True, path_stat.exists('/'))
     self.assertEqual(False, path_stat.exists('/nonexistent__ZZZZ'))
 
+  def testIsLink(self):
+    self.assertEqual(False, path_stat.islink('/'))
+    self.assertEqual(False, path_stat.islink('/nonexistent__ZZZZ'))
+
 
 if __name__ == '__main__':
   unittest.main()
@@ -550,3 +550,19 @@ echo status=$?
 ## STDOUT:
 status=2
 ## END
+
+#### Redefining an alias is respected by later expansions
+shopt -s expand_aliases
+alias hi='echo one'
+f() { hi; }
+hi
+hi
+alias hi='echo two'
+hi
+f
+## STDOUT:
+one
+one
+two
+one
+## END
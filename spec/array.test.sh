@@ -625,3 +625,75 @@ three
 two
 two
 ## END
+
+#### Sparse array with a large index
+a=(0 1 2)
+a[1000000]=x
+a[500]=y
+echo len=${#a[@]}
+argv.py "${!a[@]}"
+argv.py "${a[@]}"
+echo ${a[1000000]} "[${a[999]}]"
+
+a+=(z)
+argv.py "${!a[@]}"
+
+## STDOUT:
+len=5
+['0', '1', '2', '500', '1000000']
+['0', '1', '2', 'y', 'x']
+x []
+['0', '1', '2', '500', '1000000', '1000001']
+## END
+
+#### Slice and unset a sparse array
+# mksh doesn't support slicing arrays
+a=(0 1 2)
+a[1000000]=x
+a[2000000]=y
+
+argv.py "${a[@]:2}"
+argv.py "${a[@]:3:1}"
+argv.py "${a[@]:1000000}"
+argv.py "${a[@]: -1}"
+
+unset 'a[1000000]'
+unset 'a[1]'
+echo len=${#a[@]}
+argv.py "${!a[@]}"
+a+=(z)
+argv.py "${!a[@]}"
+
+## STDOUT:
+['2', 'x', 'y']
+['x']
+['x', 'y']
+['y']
+len=3
+['0', '2', '2000000']
+['0', '2', '2000000', '2000001']
+## END
+## N-I mksh status: 1
+## N-I mksh stdout-json: ""
+
+#### Unset most items of an array
+a=()
+for i in {0..199}; do
+  a+=($i)
+done
+for i in {0..195}; do
+  unset "a[$i]"
+done
+echo len=${#a[@]}
+argv.py "${!a[@]}"
+argv.py "${a[@]}"
+
+a[1]=one
+argv.py "${a[@]:0:2}"
+
+## STDOUT:
+len=4
+['196', '197', '198', '199']
+['196', '197', '198', '199']
+['one', '196']
+## END
@@ -247,3 +247,98 @@ mkdir -p dir
 echo status=$?
 ## stdout: status=1
 ## OK dash/zsh/mksh stdout: status=0
+
+#### OILS_SOURCE_CACHE: file changes between source calls
+cd $TMP
+cat > main.sh <<'EOF2'
+echo 'echo one' > lib.sh
+. ./lib.sh
+. ./lib.sh
+echo 'echo two' > lib.sh
+. ./lib.sh
+EOF2
+OILS_SOURCE_CACHE=1 $SH main.sh
+## STDOUT:
+one
+one
+two
+## END
+
+#### OILS_SOURCE_CACHE: alias defined between source calls
+cd $TMP
+cat > main.sh <<'EOF2'
+shopt -s expand_aliases 2>/dev/null
+hi() { echo function; }
+echo 'hi' > lib.sh
+. ./lib.sh
+alias hi='echo alias'
+. ./lib.sh
+unalias hi
+. ./lib.sh
+EOF2
+OILS_SOURCE_CACHE=1 $SH main.sh
+## STDOUT:
+function
+alias
+function
+## END
+
+#### eval of the same string respects alias redefinition
+shopt -s expand_aliases
+hi() { echo function; }
+for i in 1 2; do eval 'hi'; done
+alias hi='echo alias'
+for i in 1 2; do eval 'hi'; done
+unalias hi
+eval 'hi'
+## STDOUT:
+function
+function
+alias
+alias
+function
+## END
+
+#### eval of the same string, with return and a syntax error
+f() {
+  eval 'echo one; return 3; echo no'
+}
+f; echo status=$?
+f; echo status=$?
+eval 'echo ('
+echo status=$?
+eval 'echo ('
+echo status=$?
+## STDOUT:
+one
+status=3
+one
+status=3
+status=2
+status=2
+## END
+## OK dash status: 2
+## OK dash STDOUT:
+one
+status=3
+one
+status=3
+## END
+
+#### OILS_SOURCE_CACHE: same relative path in another dir
+cd $TMP
+mkdir -p cache-a cache-b
+echo 'echo a' > cache-a/lib.sh
+echo 'echo b' > cache-b/lib.sh
+touch -d 2020-01-01 cache-a/lib.sh cache-b/lib.sh
+cat > main.sh <<'EOF2'
+cd cache-a
+. ./lib.sh
+cd ../cache-b
+. ./lib.sh
+EOF2
+OILS_SOURCE_CACHE=1 $SH main.sh
+## STDOUT:
+a
+b
+## END
@@ -321,6 +321,26 @@ echo abcxyz | { read -n 3; echo reply=$REPLY; }
 # zsh appears to hang with -k
 ## N-I zsh stdout-json: ""
 
+#### read from a file leaves the rest of it for the next command
+case $SH in (dash|ash) exit ;; esac
+
+printf 'one\ntwo three\nfour\nfive' > $TMP/offset.txt
+{ read a
+  read -n 3 b
+  read -d ' ' c
+  echo "a=$a b=$b c=[$c]"
+  cat
+  echo
+} < $TMP/offset.txt
+
+## STDOUT:
+a=one b=two c=[]
+three
+four
+five
+## END
+## N-I dash/ash stdout-json: ""
+
 #### Read uses $REPLY (without -n)
 echo 123 > $TMP/readreply.txt
 read < $TMP/readreply.txt
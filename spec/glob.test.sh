@@ -373,3 +373,41 @@ other
 other
 other
 ## END
+
+#### globstar **/ matches symlinks to dirs, but doesn't walk them
+shopt -s globstar
+mkdir -p $TMP/globstar/d/sub $TMP/globstar/real
+cd $TMP/globstar
+touch real/g
+ln -s real lnk
+
+echo **/
+echo **/g
+## STDOUT:
+d/ d/sub/ lnk/ real/
+real/g
+## END
+## N-I dash/mksh/ash STDOUT:
+d/ lnk/ real/
+lnk/g real/g
+## END
+
+#### globstar **/** lists each dir once, without a trailing /
+shopt -s globstar
+mkdir -p $TMP/globstar2/a/b
+cd $TMP/globstar2
+touch f a/g a/b/h
+
+echo **/**
+echo a/**
+echo */**
+## STDOUT:
+a a/b a/b/h a/g f
+a/ a/b a/b/h a/g
+a a/b a/b/h a/g
+## END
+## N-I dash/mksh/ash STDOUT:
+a/b a/g
+a/b a/g
+a/b a/g
+## END
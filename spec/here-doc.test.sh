@@ -368,3 +368,26 @@ EOF5
 5: fd5
 ## END
 
+
+#### Here doc larger than the pipe buffer on fd 3 and on a closed stdin
+line=0123456789012345678901234567890123456789
+big=
+for i in 1 2 3 4 5 6 7 8 9 10 11 12 13 14 15 16 17 18 19 20; do
+  big="$big$line$line$line$line$line$line$line$line$line$line"
+done
+echo ${#big}
+
+cat /dev/fd/3 3<<EOF | wc -c
+$big
+EOF
+
+{
+  cat <<EOF | wc -c
+$big
+EOF
+} 0<&-
+## STDOUT:
+8000
+8001
+8001
+## END
@@ -520,6 +520,24 @@ FOO
 ## END
 ## N-I dash/ash/yash stdout-json: "\n"
 
+#### $(< file) strips trailing newlines, and fails on a missing file
+
+printf 'a\nb\n\n\n' > myfile
+x=$(< myfile)
+echo "[$x]"
+
+x=$(< nonexistent)
+echo status=$? "[$x]"
+## STDOUT:
+[a
+b]
+status=1 []
+## END
+## N-I dash STDOUT:
+[]
+status=2 []
+## END
+
 #### $(< file) with more statements
 
 # note that it doesn't do this without a command sub!
@@ -59,6 +59,104 @@ pp gc-stats
 ## STDOUT:
 ## END
 
+#### pp cache-stats
+
+pat='^cache-stats-[0-9]$'
+for i in 1 2 3; do
+  [[ cache-stats-$i =~ $pat ]] && echo yes
+done
+
+pp cache-stats | grep -c '^cache_name'
+pp cache-stats | awk '$1 == "regex" { print ($3 >= 2) }'
+
+for i in 1 2 3; do
+  printf '%s\n' $i
+done
+pp cache-stats | awk '$1 == "printf" { print ($3 >= 2) }'
+
+## STDOUT:
+yes
+yes
+yes
+1
+1
+1
+2
+3
+1
+## END
+
+#### pp cache-stats counts a stale entry as a miss
+
+# Entries are only used by the same eval call
+f() { eval 'echo hi'; }
+f
+f
+alias ll='ls -l'  # code could parse differently now
+f
+
+pp cache-stats | awk '$1 == "eval" { print $3, $4 }'
+
+## STDOUT:
+hi
+hi
+hi
+1 2
+## END
+
+#### pp cache-stats: a sourced file is cached for every source call
+
+cd $TMP
+echo 'echo lib' > lib.sh
+cat > main.sh <<'EOF2'
+. ./lib.sh
+. ./lib.sh
+f() { . ./lib.sh; }
+f
+pp cache-stats | awk '$1 == "source" { print $2, $3, $4 }'
+EOF2
+OILS_SOURCE_CACHE=1 $SH main.sh
+
+## STDOUT:
+lib
+lib
+lib
+1 2 1
+## END
+
+#### pp cache-stats: an alias expansion is cached for every use
+
+shopt -s expand_aliases
+alias hi='echo hi'
+hi
+hi
+f() { hi; }
+f
+
+pp cache-stats | awk '$1 == "alias" { print $2, $3, $4 }'
+
+## STDOUT:
+hi
+hi
+hi
+1 2 1
+## END
+
+#### pp cache-stats: long eval strings aren't cached
+
+code="echo hi  # $(printf '%5000s' x)"
+f() { eval "$code"; }
+f
+f
+
+pp cache-stats | awk '$1 == "eval" { print $2, $3, $4 }'
+
+## STDOUT:
+hi
+hi
+0 0 0
+## END
+
 
 #### pp cell
 x=42
@@ -84,7 +182,7 @@ declare -a array
 array[3]=42
 pp cell array
 ## STDOUT:
-array = (Cell exported:F readonly:F nameref:F val:(value.BashArray strs:[_ _ _ 42]))
+array = (Cell exported:F readonly:F nameref:F val:(value.BashArray strs:[_ _ _ 42] max_index:3 count:1))
 ## END
 
 
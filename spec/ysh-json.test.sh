@@ -789,3 +789,83 @@ echo len=$[len(_reply)]
 (List)   [[[[[[[[[[[[[[[[[[[[[[[[[[[[[[[[[[[[[[[[[[[[[[[[[]]]]]]]]]]]]]]]]]]]]]]]]]]]]]]]]]]]]]]]]]]]]]]]]]
 len=1
 ## END
+
+#### json read --lines runs a block for each line
+
+shopt -s ysh:upgrade
+
+printf '{"k": 1}\n\n[2, "x"]\n3\n' | json read --lines {
+  pp line (_reply)
+}
+echo status=$?
+
+printf '"a"\n"b"\n' | json read --lines (&x) {
+  echo "x = $x"
+}
+
+## STDOUT:
+(Dict)   {"k":1}
+(List)   [2,"x"]
+(Int)   3
+status=0
+x = a
+x = b
+## END
+
+#### json read --lines without a block binds a List
+
+printf '1\n{"k": [true]}\n' | json read --lines (&x)
+pp line (x)
+
+json read --lines (&empty) < /dev/null
+pp line (empty)
+
+## STDOUT:
+(List)   [1,{"k":[true]}]
+(List)   []
+## END
+
+#### json read --lines errors show the line number
+
+shopt -s ysh:upgrade
+set +o errexit
+
+printf '1\n[2\n3\n' | json read --lines {
+  echo "got $_reply"
+}
+echo status=$?
+
+printf '1 2\n' | json read --lines
+echo status=$?
+
+## STDOUT:
+got 1
+status=1
+status=1
+## END
+
+#### json8 read --lines
+
+shopt -s ysh:upgrade
+
+printf '%s\n' "u'hi'" "b'\\yff'" | json8 read --lines {
+  json8 write --pretty=F (_reply)
+}
+
+## STDOUT:
+"hi"
+b'\yff'
+## END
+
+#### json read of a document bigger than the read buffer
+
+python2 -c '
+import json
+print(json.dumps({"s": "x" * 200000, "list": list(range(30000))}))
+' | json read (&d)
+
+echo $[len(d.s)] $[len(d.list)] $[d.list[-1]]
+
+## STDOUT:
+200000 30000 29999
+## END
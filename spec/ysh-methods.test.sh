@@ -177,3 +177,20 @@ write @x
 0
 ## END
 
+#### Method call site with receivers of different types
+var items = ['a b', ['a', 'b'], 'c d', ['c', 'd'], 42]
+for x in (items) {
+  try {
+    pp line (x => join(' '))
+  }
+  if (_status !== 0) {
+    echo "status $_status"
+  }
+}
+## STDOUT:
+status 3
+(Str)   "a b"
+status 3
+(Str)   "c d"
+status 3
+## END
@@ -660,3 +660,46 @@ wrong IFS=x
 shvar IFS=z
 ['x', 'x ', 'x']
 ## END
+
+#### Locals of procs and funcs, with blocks, unset, and recursion
+shopt --set ysh:upgrade
+
+var x = 'global'
+
+proc p {
+  var x = 'local'
+  cd / {
+    echo $[x]
+  }
+  unset x
+  echo $[x]
+}
+p
+
+proc runBlock(; ; ; b) {
+  var y = 'callee'
+  eval (b)
+}
+
+proc q {
+  var y = 'caller'
+  runBlock {
+    echo $[y]
+  }
+}
+q
+
+func countDown(n) {
+  if (n === 0) {
+    return ('done')
+  }
+  var s = countDown(n - 1)
+  return ("$n $s")
+}
+echo $[countDown(3)]
+## STDOUT:
+local
+global
+callee
+3 2 1 done
+## END
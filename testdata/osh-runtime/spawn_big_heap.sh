@@ -0,0 +1,21 @@
+# Like spawn_loop.sh, but with a 64 MB string in memory.  fork() copies the
+# page tables of the whole heap, so it gets slower as the heap grows.
+#
+# Usage:
+#   spawn_big_heap.sh N
+
+n=${1:-1000}
+
+s=x
+i=0
+while test $i -lt 26; do
+  s=$s$s
+  i=$((i + 1))
+done
+
+i=0
+while test $i -lt $n; do
+  /bin/true
+  i=$((i + 1))
+done
+echo "ran /bin/true $n times"
@@ -0,0 +1,13 @@
+# Run a small external command many times, like a configure script does.
+#
+# Usage:
+#   spawn_loop.sh N
+
+n=${1:-1000}
+
+i=0
+while test $i -lt $n; do
+  /bin/true
+  i=$((i + 1))
+done
+echo "ran /bin/true $n times"
@@ -112,14 +112,9 @@ class Cursor(object):
             assert 0, 'Missing span ID, got %d' % until_span_id
 
         for span_id in xrange(self.next_span_id, until_span_id):
-            span = self.arena.GetToken(span_id)
-
-            # A span for Eof may not have a line when the file is completely empty.
-            if span.line is None:
-                continue
-
-            piece = span.line.content[span.col:span.col + span.length]
-            self.f.write(piece)
+            # A span for Eof may not have a line when the file is completely
+            # empty.  Then the text is empty.
+            self.f.write(self.arena.TokenText(span_id))
 
         self.next_span_id = until_span_id
 
@@ -163,15 +158,16 @@ def PrintTokens(arena):
     # type: (alloc.Arena) -> None
     """Debugging tool to see tokens."""
 
-    if len(arena.tokens) == 1:  # Special case for line_id == -1
+    num_tokens = arena.LastSpanId()
+    if num_tokens == 1:  # Special case for line_id == -1
         print('Empty file with EOF token on invalid line:')
-        print('%s' % arena.tokens[0])
+        print('%s' % arena.GetToken(0))
         return
 
-    for i, tok in enumerate(arena.tokens):
-        piece = tok.line.content[tok.col:tok.col + tok.length]
-        print('%5d %-20s %r' % (i, Id_str(tok.id), piece))
-    print_stderr('(%d tokens)' % len(arena.tokens))
+    for i in xrange(0, num_tokens):
+        piece = arena.TokenText(i)
+        print('%5d %-20s %r' % (i, Id_str(arena.TokenId(i)), piece))
+    print_stderr('(%d tokens)' % num_tokens)
 
 
 def PrintAsOil(arena, node):
@@ -285,8 +281,7 @@ class OilPrinter(object):
 
     def _DebugSpid(self, spid):
         # type: (int) -> None
-        span = self.arena.GetToken(spid)
-        s = span.line.content[span.col:span.col + span.length]
+        s = self.arena.TokenText(spid)
         print_stderr('SPID %d = %r' % (spid, s))
 
     def End(self):
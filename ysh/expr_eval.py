@@ -154,6 +154,61 @@ def _ConvertForBinaryOp(left, right):
         return coerced_e.Neither, -1, -1, -1.0, -1.0
 
 
+def _ConstValue(tok):
+    # type: (Token) -> value_t
+    """Evaluate a literal."""
+
+    # Remove underscores from 1_000_000.  The lexer is responsible for
+    # validation.
+    c_under = tok.tval.replace('_', '')
+
+    id_ = tok.id
+    if id_ == Id.Expr_DecInt:
+        return value.Int(int(c_under))
+    if id_ == Id.Expr_BinInt:
+        return value.Int(int(c_under, 2))
+    if id_ == Id.Expr_OctInt:
+        return value.Int(int(c_under, 8))
+    if id_ == Id.Expr_HexInt:
+        return value.Int(int(c_under, 16))
+
+    if id_ == Id.Expr_Float:
+        # Note: float() in mycpp/gc_builtins.py currently uses strtod
+        return value.Float(float(c_under))
+
+    if id_ == Id.Expr_Null:
+        return value.Null
+    if id_ == Id.Expr_True:
+        return value.Bool(True)
+    if id_ == Id.Expr_False:
+        return value.Bool(False)
+
+    if id_ == Id.Expr_Name:
+        # for {name: 'bob'}
+        # Maybe also :Symbol?
+        return value.Str(tok.tval)
+
+    if id_ == Id.Char_OneChar:
+        # TODO: look up integer directly?
+        return value.Int(ord(consts.LookupCharC(tok.tval[1])))
+    if id_ == Id.Char_UBraced:
+        s = tok.tval[3:-1]  # \u{123}
+        return value.Int(int(s, 16))
+    if id_ == Id.Char_Pound:
+        # TODO: accept UTF-8 code point instead of single byte
+        byte = tok.tval[2]  # the a in #'a'
+        return value.Int(ord(byte))  # It's an integer
+
+    # NOTE: We could allow Ellipsis for a[:, ...] here, but we're not using it
+    # yet.
+    raise AssertionError(id_)
+
+
+# Values cached by const_index.  After this many, code like eval strings in a
+# loop evaluates its literals each time, rather than growing the table.
+_MAX_CONSTS = 1 << 16
+
+
 class ExprEvaluator(object):
     """Shared between arith and bool evaluators.
 
@@ -179,6 +234,11 @@ class ExprEvaluator(object):
         self.mem = mem
         self.mutable_opts = mutable_opts
         self.methods = methods
+        # Method values for call sites to cache, by type and name
+        self.method_funcs = []  # type: List[value.BuiltinFunc]
+        self.method_ids = {}  # type: Dict[int, Dict[str, int]]
+        # Values of literals and folded constants, by const_index
+        self.const_values = []  # type: List[value_t]
         self.splitter = splitter
         self.errfmt = errfmt
 
@@ -381,57 +441,55 @@ class ExprEvaluator(object):
         """ write -- @myvar """
         return val_ops.ToShellArray(val, loc.WordPart(part), prefix='Splice ')
 
+    def _CacheConst(self, val):
+        # type: (value_t) -> int
+        """Returns the const_index for val, or -1 if the table is full."""
+        n = len(self.const_values)
+        if n == _MAX_CONSTS:
+            return -1
+        self.const_values.append(val)
+        return n
+
+    def _IsCached(self, node):
+        # type: (expr_t) -> bool
+        """Was node's value cached, as a literal or folded constant?"""
+        UP_node = node
+        with tagswitch(node) as case:
+            if case(expr_e.Const):
+                node = cast(expr.Const, UP_node)
+                return node.const_index != -1
+            elif case(expr_e.Unary):
+                node = cast(expr.Unary, UP_node)
+                return node.const_index != -1
+            elif case(expr_e.Binary):
+                node = cast(expr.Binary, UP_node)
+                return node.const_index != -1
+        return False
+
     def _EvalConst(self, node):
         # type: (expr.Const) -> value_t
+        """Each literal is evaluated once."""
+        if node.const_index != -1:
+            return self.const_values[node.const_index]
 
-        # Remove underscores from 1_000_000.  The lexer is responsible for
-        # validation.  TODO: Do this at PARSE TIME / COMPILE TIME.
-        c_under = node.c.tval.replace('_', '')
-
-        id_ = node.c.id
-        if id_ == Id.Expr_DecInt:
-            return value.Int(int(c_under))
-        if id_ == Id.Expr_BinInt:
-            return value.Int(int(c_under, 2))
-        if id_ == Id.Expr_OctInt:
-            return value.Int(int(c_under, 8))
-        if id_ == Id.Expr_HexInt:
-            return value.Int(int(c_under, 16))
-
-        if id_ == Id.Expr_Float:
-            # Note: float() in mycpp/gc_builtins.py currently uses strtod
-            return value.Float(float(c_under))
-
-        if id_ == Id.Expr_Null:
-            return value.Null
-        if id_ == Id.Expr_True:
-            return value.Bool(True)
-        if id_ == Id.Expr_False:
-            return value.Bool(False)
-
-        if id_ == Id.Expr_Name:
-            # for {name: 'bob'}
-            # Maybe also :Symbol?
-            return value.Str(node.c.tval)
-
-        # These calculations could also be done at COMPILE TIME
-        if id_ == Id.Char_OneChar:
-            # TODO: look up integer directly?
-            return value.Int(ord(consts.LookupCharC(node.c.tval[1])))
-        if id_ == Id.Char_UBraced:
-            s = node.c.tval[3:-1]  # \u{123}
-            return value.Int(int(s, 16))
-        if id_ == Id.Char_Pound:
-            # TODO: accept UTF-8 code point instead of single byte
-            byte = node.c.tval[2]  # the a in #'a'
-            return value.Int(ord(byte))  # It's an integer
-
-        # NOTE: We could allow Ellipsis for a[:, ...] here, but we're not using it
-        # yet.
-        raise AssertionError(id_)
+        val = _ConstValue(node.c)
+        node.const_index = self._CacheConst(val)
+        return val
 
     def _EvalUnary(self, node):
         # type: (expr.Unary) -> value_t
+        if node.const_index != -1:
+            return self.const_values[node.const_index]
+
+        val = self._EvalUnaryOp(node)
+
+        # Fold -42 and -1.5
+        if node.op.id == Id.Arith_Minus and self._IsCached(node.child):
+            node.const_index = self._CacheConst(val)
+        return val
+
+    def _EvalUnaryOp(self, node):
+        # type: (expr.Unary) -> value_t
 
         val = self._EvalExpr(node.child)
 
@@ -593,6 +651,20 @@ class ExprEvaluator(object):
 
     def _EvalBinary(self, node):
         # type: (expr.Binary) -> value_t
+        if node.const_index != -1:
+            return self.const_values[node.const_index]
+
+        val = self._EvalBinaryOp(node)
+
+        # Fold arithmetic on constants, like 1 + 2 * 3.  Division isn't folded,
+        # so dividing by zero is an error each time.
+        if (node.op.id in (Id.Arith_Plus, Id.Arith_Minus, Id.Arith_Star) and
+                self._IsCached(node.left) and self._IsCached(node.right)):
+            node.const_index = self._CacheConst(val)
+        return val
+
+    def _EvalBinaryOp(self, node):
+        # type: (expr.Binary) -> value_t
 
         left = self._EvalExpr(node.left)
 
@@ -807,10 +879,66 @@ class ExprEvaluator(object):
             else:
                 raise AssertionError("Shouldn't have been bound")
 
+    def _LookupMethod(self, node, o):
+        # type: (Attribute, value_t) -> Optional[value.BuiltinFunc]
+        """Returns the builtin method for o->name, or None.
+
+        The result is cached on the Attribute node, keyed on the type of the
+        receiver.
+        """
+        tag = o.tag()
+        if node.method_tag == tag:
+            return self.method_funcs[node.method_index]
+
+        name = node.attr.tval
+        type_methods = self.methods.get(tag)
+        vm_callable = (type_methods.get(name)
+                       if type_methods is not None else None)
+        if vm_callable is None:
+            return None
+
+        # Each method value is made once
+        ids = self.method_ids.get(tag)
+        if ids is None:
+            ids = {}
+            self.method_ids[tag] = ids
+        i = ids.get(name, -1)
+        if i == -1:
+            i = len(self.method_funcs)
+            self.method_funcs.append(value.BuiltinFunc(vm_callable))
+            ids[name] = i
+
+        node.method_tag = tag
+        node.method_index = i
+        return self.method_funcs[i]
+
     def _EvalFuncCall(self, node):
         # type: (expr.FuncCall) -> value_t
 
-        func = self._EvalExpr(node.func)
+        UP_func_node = node.func
+        if UP_func_node.tag() == expr_e.Attribute:
+            func_node = cast(Attribute, UP_func_node)
+            if func_node.op.id in (Id.Expr_RArrow, Id.Expr_RDArrow):
+                o = self._EvalExpr(func_node.obj)
+
+                # Fast path for mylist->append(x) and s => upper(): call the
+                # method without making a BoundFunc
+                method = self._LookupMethod(func_node, o)
+                if method:
+                    pos_args, named_args = func_proc._EvalArgList(self,
+                                                                  node.args,
+                                                                  me=o)
+                    rd = typed_args.Reader(pos_args,
+                                           named_args,
+                                           node.args,
+                                           is_bound=True)
+                    return self._CallFunc(method, rd)
+
+                func = self._BindArrow(func_node, o)
+            else:
+                func = self._EvalAttribute(func_node)
+        else:
+            func = self._EvalExpr(node.func)
         UP_func = func
 
         # The () operator has a 2x2 matrix of
@@ -916,6 +1044,45 @@ class ExprEvaluator(object):
         raise error.TypeErr(obj, 'Subscript expected Str, List, or Dict',
                             loc.Missing)
 
+    def _BindArrow(self, node, o):
+        # type: (Attribute, value_t) -> value_t
+        """Returns the BoundFunc for o->name or o => name."""
+
+        # Right now => is a synonym for ->
+        # Later we may enforce that => is pure, and -> is for mutation and
+        # I/O.
+        name = node.attr.tval
+        # Look up builtin methods
+        method = self._LookupMethod(node, o)
+        if method:
+            return value.BoundFunc(o, method)
+
+        # If the operator is ->, fail because we don't have any
+        # user-defined methods
+        if node.op.id == Id.Expr_RArrow:
+            raise error.TypeErrVerbose(
+                'Method %r does not exist on type %s' % (name, ui.ValType(o)),
+                node.attr)
+
+        # Operator is =>, so try function chaining.
+
+        # Instead of str(f()) => upper()
+        #         or str(f()).upper() as in Pythohn
+        #
+        # It's more natural to write
+        #     f() => str() => upper()
+
+        # Could improve error message: may give "Undefined variable"
+        val = self._LookupVar(name, node.attr)
+
+        with tagswitch(val) as case:
+            if case(value_e.Func, value_e.BuiltinFunc):
+                return value.BoundFunc(o, val)
+            else:
+                raise error.TypeErr(val,
+                                    'Fat arrow => expects method or function',
+                                    node.attr)
+
     def _EvalAttribute(self, node):
         # type: (Attribute) -> value_t
 
@@ -923,44 +1090,8 @@ class ExprEvaluator(object):
         UP_o = o
 
         with switch(node.op.id) as case:
-            # Right now => is a synonym for ->
-            # Later we may enforce that => is pure, and -> is for mutation and
-            # I/O.
             if case(Id.Expr_RArrow, Id.Expr_RDArrow):
-                name = node.attr.tval
-                # Look up builtin methods
-                type_methods = self.methods.get(o.tag())
-                vm_callable = (type_methods.get(name)
-                               if type_methods is not None else None)
-                if vm_callable:
-                    func_val = value.BuiltinFunc(vm_callable)
-                    return value.BoundFunc(o, func_val)
-
-                # If the operator is ->, fail because we don't have any
-                # user-defined methods
-                if node.op.id == Id.Expr_RArrow:
-                    raise error.TypeErrVerbose(
-                        'Method %r does not exist on type %s' %
-                        (name, ui.ValType(o)), node.attr)
-
-                # Operator is =>, so try function chaining.
-
-                # Instead of str(f()) => upper()
-                #         or str(f()).upper() as in Pythohn
-                #
-                # It's more natural to write
-                #     f() => str() => upper()
-
-                # Could improve error message: may give "Undefined variable"
-                val = self._LookupVar(name, node.attr)
-
-                with tagswitch(val) as case2:
-                    if case2(value_e.Func, value_e.BuiltinFunc):
-                        return value.BoundFunc(o, val)
-                    else:
-                        raise error.TypeErr(
-                            val, 'Fat arrow => expects method or function',
-                            node.attr)
+                return self._BindArrow(node, o)
 
             elif case(Id.Expr_Dot):  # d.key is like d['key']
                 name = node.attr.tval
@@ -998,7 +1129,14 @@ class ExprEvaluator(object):
 
             elif case(expr_e.Var):
                 node = cast(expr.Var, UP_node)
-                return self._LookupVar(node.name.tval, node.name)
+                name = node.name.tval
+                if node.slot == -1:  # first evaluation
+                    node.slot = self.mem.ResolveSlot(name)
+                if node.slot >= 0:  # a proc or func local
+                    cell = self.mem.GetSlotCell(name, node.slot)
+                    if cell and cell.val.tag() != value_e.Undef:
+                        return cell.val
+                return self._LookupVar(name, node.name)
 
             elif case(expr_e.Place):
                 node = cast(expr.Place, UP_node)
@@ -4,7 +4,8 @@ from __future__ import print_function
 
 import unittest
 
-from _devbuild.gen.syntax_asdl import source
+from _devbuild.gen.syntax_asdl import source, expr_e, loc
+from _devbuild.gen.value_asdl import value
 
 from asdl import format as fmt
 from core import alloc
@@ -13,6 +14,7 @@ from core import pyutil
 from core import test_lib
 from mycpp.mylib import log
 from frontend import reader
+from ysh import expr_eval
 
 
 class ExprParseTest(unittest.TestCase):
@@ -63,6 +65,36 @@ class ExprParseTest(unittest.TestCase):
         node = self._ParseYshExpression('[x for x in y]')
         #node = self._ParseYshExpression('{foo: bar}')
 
+    def testConstantFolding(self):
+        # The tree keeps every token
+        node = self._ParseOsh('var x = -1')
+        self.assertEqual(expr_e.Unary, node.rhs.tag())
+        self.assertEqual(expr_e.Const, node.rhs.child.tag())
+        self.assertEqual('1', node.rhs.child.c.tval)
+        self.assertEqual(-1, node.rhs.const_index)
+
+        cmd_ev = test_lib.InitCommandEvaluator(parse_ctx=self.parse_ctx)
+        expr_ev = cmd_ev.expr_ev
+
+        # The evaluator caches the values of literals and constants
+        node = self._ParseOsh('var x = 1_000 + 2 * 3')
+        val = expr_ev.EvalExpr(node.rhs, loc.Missing)
+        self.assertEqual(1006, val.i)
+        self.assertNotEqual(-1, node.rhs.const_index)
+        self.assertIs(val, expr_ev.EvalExpr(node.rhs, loc.Missing))
+
+        # Division isn't folded
+        node = self._ParseOsh('var x = 7 // 2')
+        self.assertEqual(3, expr_ev.EvalExpr(node.rhs, loc.Missing).i)
+        self.assertEqual(-1, node.rhs.const_index)
+        self.assertNotEqual(-1, node.rhs.left.const_index)
+
+        # When the table is full, literals are evaluated each time
+        expr_ev.const_values = [value.Null] * expr_eval._MAX_CONSTS
+        node = self._ParseOsh('var x = 42')
+        self.assertEqual(42, expr_ev.EvalExpr(node.rhs, loc.Missing).i)
+        self.assertEqual(-1, node.rhs.const_index)
+
     def testShellArrays(self):
         node = self._ParseOsh('var x = %(a b);')
         node = self._ParseOsh(r"var x = %('c' $'string\n');")
@@ -189,7 +189,7 @@ class Transformer(object):
             right = self.Expr(p_node.GetChild(i + 1))
 
             # create a new left node
-            left = expr.Binary(op.tok, left, right)
+            left = expr.Binary(op.tok, left, right, -1)
             i += 2
 
         return left
@@ -227,7 +227,8 @@ class Transformer(object):
 
         if op_tok.id in (Id.Expr_Dot, Id.Expr_RArrow, Id.Expr_RDArrow):
             attr = p_trailer.GetChild(1).tok  # will be Id.Expr_Name
-            return Attribute(base, op_tok, attr, expr_context_e.Store)
+            return Attribute(base, op_tok, attr, expr_context_e.Store, -1,
+                             -1)
 
         raise AssertionError(Id_str(op_tok.id))
 
@@ -255,7 +256,7 @@ class Transformer(object):
         id_ = tok0.id
 
         if id_ == Id.Expr_Name:
-            key = expr.Const(tok0)
+            key = expr.Const(tok0, -1)
             if p_node.NumChildren() >= 3:
                 value = self.Expr(p_node.GetChild(2))
             else:
@@ -585,7 +586,7 @@ class Transformer(object):
                     return self.Expr(pnode.GetChild(0))
 
                 op_tok = pnode.GetChild(0).tok  # not
-                return expr.Unary(op_tok, self.Expr(pnode.GetChild(1)))
+                return expr.Unary(op_tok, self.Expr(pnode.GetChild(1)), -1)
 
             elif typ == grammar_nt.comparison:
                 if pnode.NumChildren() == 1:
@@ -640,7 +641,7 @@ class Transformer(object):
                 e = pnode.GetChild(1)
 
                 assert isinstance(op.tok, Token)
-                return expr.Unary(op.tok, self.Expr(e))
+                return expr.Unary(op.tok, self.Expr(e), -1)
 
             elif typ == grammar_nt.power:
                 # power: atom trailer* ['**' factor]
@@ -660,7 +661,7 @@ class Transformer(object):
                     op_tok = pnode.GetChild(i).tok
                     assert op_tok.id == Id.Arith_DStar, op_tok
                     factor = self.Expr(pnode.GetChild(i + 1))
-                    node = expr.Binary(op_tok, node, factor)
+                    node = expr.Binary(op_tok, node, factor, -1)
 
                 return node
 
@@ -721,15 +722,15 @@ class Transformer(object):
             id_ = tok.id
 
             if id_ == Id.Expr_Name:
-                return expr.Var(tok)
+                return expr.Var(tok, -1)
 
             if id_ in (Id.Expr_DecInt, Id.Expr_BinInt, Id.Expr_OctInt,
                        Id.Expr_HexInt, Id.Expr_Float):
-                return expr.Const(tok)
+                return expr.Const(tok, -1)
 
             if id_ in (Id.Expr_Null, Id.Expr_True, Id.Expr_False,
                        Id.Char_OneChar, Id.Char_UBraced, Id.Char_Pound):
-                return expr.Const(tok)
+                return expr.Const(tok, -1)
 
             raise NotImplementedError(Id_str(id_))
 
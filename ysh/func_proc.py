@@ -7,10 +7,11 @@ from __future__ import print_function
 from _devbuild.gen.id_kind_asdl import Id
 from _devbuild.gen.runtime_asdl import cmd_value
 from _devbuild.gen.syntax_asdl import (proc_sig, proc_sig_e, Param, ParamGroup,
-                                       NamedArg, Func, loc, ArgList, expr,
-                                       expr_e, expr_t)
+                                       NamedArg, Func, Proc, loc, ArgList,
+                                       expr, expr_e, expr_t, command, command_e,
+                                       command_t, BraceGroup)
 from _devbuild.gen.value_asdl import (value, value_e, value_t, ProcDefaults,
-                                      LeftName)
+                                      LeftName, FrameLayout)
 
 from core import error
 from core import state
@@ -18,11 +19,11 @@ from core import vm
 from frontend import lexer
 from frontend import typed_args
 from mycpp import mylib
-from mycpp.mylib import log, NewDict
+from mycpp.mylib import log, NewDict, tagswitch
 
 from typing import List, Tuple, Dict, Optional, cast, TYPE_CHECKING
 if TYPE_CHECKING:
-    from _devbuild.gen.syntax_asdl import command, loc_t
+    from _devbuild.gen.syntax_asdl import loc_t
     from osh import cmd_eval
     from ysh import expr_eval
 
@@ -139,6 +140,130 @@ def EvalProcDefaults(expr_ev, sig):
     return ProcDefaults(word_defaults, pos_defaults, named_defaults)
 
 
+def _AddLocal(name, names):
+    # type: (str, List[str]) -> None
+    if name not in names:
+        names.append(name)
+
+
+def _AddParamGroup(group, names):
+    # type: (Optional[ParamGroup], List[str]) -> None
+    if group is None:
+        return
+    for p in group.params:
+        _AddLocal(p.name, names)
+    if group.rest_of:
+        _AddLocal(group.rest_of.name, names)
+
+
+def _AddDeclaredLocals(node, names):
+    # type: (command_t, List[str]) -> None
+    """Add names declared with var, const, and for loops.
+
+    Blocks and nested procs and funcs aren't searched, because they may run in
+    another frame.  Their variables are still found with a full lookup.
+    """
+    UP_node = node
+    with tagswitch(node) as case:
+        if case(command_e.VarDecl):
+            node = cast(command.VarDecl, UP_node)
+            for name_type in node.lhs:
+                _AddLocal(lexer.TokenVal(name_type.name), names)
+
+        elif case(command_e.ForEach):
+            node = cast(command.ForEach, UP_node)
+            for name in node.iter_names:
+                _AddLocal(name, names)
+            _AddDeclaredLocals(node.body, names)
+
+        elif case(command_e.ForExpr):
+            node = cast(command.ForExpr, UP_node)
+            if node.body:
+                _AddDeclaredLocals(node.body, names)
+
+        elif case(command_e.WhileUntil):
+            node = cast(command.WhileUntil, UP_node)
+            _AddDeclaredLocals(node.body, names)
+
+        elif case(command_e.If):
+            node = cast(command.If, UP_node)
+            for arm in node.arms:
+                for child in arm.action:
+                    _AddDeclaredLocals(child, names)
+            for child in node.else_action:
+                _AddDeclaredLocals(child, names)
+
+        elif case(command_e.Case):
+            node = cast(command.Case, UP_node)
+            for case_arm in node.arms:
+                for child in case_arm.action:
+                    _AddDeclaredLocals(child, names)
+
+        elif case(command_e.BraceGroup):
+            node = cast(BraceGroup, UP_node)
+            for child in node.children:
+                _AddDeclaredLocals(child, names)
+
+        elif case(command_e.CommandList):
+            node = cast(command.CommandList, UP_node)
+            for child in node.children:
+                _AddDeclaredLocals(child, names)
+
+        elif case(command_e.DoGroup):
+            node = cast(command.DoGroup, UP_node)
+            for child in node.children:
+                _AddDeclaredLocals(child, names)
+
+        elif case(command_e.AndOr):
+            node = cast(command.AndOr, UP_node)
+            for child in node.children:
+                _AddDeclaredLocals(child, names)
+
+        elif case(command_e.Sentence):
+            node = cast(command.Sentence, UP_node)
+            _AddDeclaredLocals(node.child, names)
+
+
+def _MakeLayout(names):
+    # type: (List[str]) -> FrameLayout
+    index = NewDict()  # type: Dict[str, int]
+    for i, name in enumerate(names):
+        index[name] = i
+    return FrameLayout(names, index)
+
+
+def ResolveProcLocals(node):
+    # type: (Proc) -> FrameLayout
+    """Assign frame slots to the params and locals of a proc, at time of
+    DEFINITION.
+
+    Params come first, in the order they're bound.
+    """
+    names = []  # type: List[str]
+
+    UP_sig = node.sig
+    if UP_sig.tag() == proc_sig_e.Closed:
+        sig = cast(proc_sig.Closed, UP_sig)
+        _AddParamGroup(sig.word, names)
+        _AddParamGroup(sig.positional, names)
+        if sig.block_param:
+            _AddLocal(sig.block_param.name, names)
+        _AddParamGroup(sig.named, names)
+
+    _AddDeclaredLocals(node.body, names)
+    return _MakeLayout(names)
+
+
+def ResolveFuncLocals(node):
+    # type: (Func) -> FrameLayout
+    """Assign frame slots to the params and locals of a func."""
+    names = []  # type: List[str]
+    _AddParamGroup(node.positional, names)
+    _AddParamGroup(node.named, names)
+    _AddDeclaredLocals(node.body, names)
+    return _MakeLayout(names)
+
+
 def _EvalPosArgs(expr_ev, exprs, pos_args):
     # type: (expr_eval.ExprEvaluator, List[expr_t], List[value_t]) -> None
     """Shared between func and proc: evaluate positional args."""
@@ -15,7 +15,7 @@ def _Name(s):
     # Doesn't work
     #return lexer.DummyToken(Id.Expr_Name, s)
     src = source.Stdin('')
-    source_line = SourceLine(1, s, src)
+    source_line = SourceLine(1, s, src, -1)
     return Token(Id.Expr_Name, 0, len(s), runtime.NO_SPID, source_line, None)
 
 
@@ -7,6 +7,7 @@ from __future__ import print_function
 from _devbuild.gen.syntax_asdl import loc, loc_t, command_t
 from _devbuild.gen.value_asdl import (value, value_e, value_t, eggex_ops,
                                       eggex_ops_t, regex_match, RegexMatch)
+from core import bash_impl
 from core import error
 from core import ui
 from mycpp.mylib import tagswitch
@@ -156,7 +157,7 @@ def ToShellArray(val, blame_loc, prefix=''):
         # - ysh-options tests parse_at too
         elif case2(value_e.BashArray):
             val = cast(value.BashArray, UP_val)
-            strs = val.strs
+            strs = bash_impl.BashArray_GetValues(val)
 
         else:
             raise error.TypeErr(val, "%sexpected List" % prefix, blame_loc)
@@ -295,7 +296,7 @@ def ToBool(val):
         # OLD TYPES
         elif case(value_e.BashArray):
             val = cast(value.BashArray, UP_val)
-            return len(val.strs) != 0
+            return bash_impl.BashArray_Length(val) != 0
 
         elif case(value_e.BashAssoc):
             val = cast(value.BashAssoc, UP_val)
@@ -363,14 +364,7 @@ def ExactlyEqual(left, right, blame_loc):
         elif case(value_e.BashArray):
             left = cast(value.BashArray, UP_left)
             right = cast(value.BashArray, UP_right)
-            if len(left.strs) != len(right.strs):
-                return False
-
-            for i in xrange(0, len(left.strs)):
-                if left.strs[i] != right.strs[i]:
-                    return False
-
-            return True
+            return bash_impl.BashArray_Equals(left, right)
 
         elif case(value_e.List):
             left = cast(value.List, UP_left)